@@ -0,0 +1,67 @@
+"""Compares the parse throughput of the generic parser with the parser generated by the `"codegen"` backend,
+and the time it takes to compile each of them.
+
+Run from the root folder of the project after installing the package:
+
+`python benchmarks/codegen.py [argument list count]`
+"""
+
+import sys
+import time
+
+from option_parser import Option, OptionParser
+
+
+def is_non_negative(number):
+    return number >= 0
+
+
+def create_parser(backend):
+    parser = OptionParser(throw_on_error=True, backend=backend)
+    options = []
+    for index in range(50):
+        option = Option(f"option{index}")
+        option.set_parameter_settings(parameter_type=int, parameter_count=2, validator=is_non_negative)
+        options.append(option)
+    name = Option("n", "name")
+    name.set_parameter_settings(required=True)
+    parser.add_options(Option("v", "verbose"), Option("q", "quiet"), name, *options)
+    return parser
+
+
+def generate_argvs(count):
+    return [
+        ["-v", "-n", f"name{index}", f"--option{index % 50}={index},{index + 1}", "-q", "input.txt", "output.txt"]
+        for index in range(count)
+    ]
+
+
+def measure_compile(backend):
+    parser = create_parser(backend)
+    start = time.perf_counter()
+    parser.compile()
+    return time.perf_counter() - start
+
+
+def measure_parse(backend, argvs):
+    parser = create_parser(backend)
+    parser.compile()
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for argv in argvs:
+            parser.parse(argv)
+        best = min(best, time.perf_counter() - start)
+    return len(argvs) / best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    argvs = generate_argvs(count)
+
+    for backend in ("generic", "codegen"):
+        print(f"{backend:>8}: compile {measure_compile(backend) * 1000:8.3f} ms, parse {measure_parse(backend, argvs):12.0f} argument lists/s")
+
+
+if __name__ == "__main__":
+    main()
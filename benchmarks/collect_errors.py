@@ -0,0 +1,86 @@
+"""Compares finding every error of a long command line by parsing it repeatedly (fixing the first reported error each time)
+with a single parse of a parser created with `collect_errors=True`, and the cost of the latter on valid command lines.
+
+Run from the root folder of the project after installing the package:
+
+`python benchmarks/collect_errors.py [error count]`
+"""
+
+import sys
+import time
+
+from option_parser import Option, OptionParser
+from option_parser.exceptions import InvalidArgumentsException, OptionParserException
+
+OPTION_COUNT = 1000
+
+
+def create_parser(collect_errors):
+    parser = OptionParser(throw_on_error=True, collect_errors=collect_errors)
+    options = []
+    for index in range(OPTION_COUNT):
+        option = Option(f"option{index}")
+        option.set_parameter_settings(parameter_type=int)
+        options.append(option)
+    parser.add_options_from(options)
+    parser.compile()
+    return parser
+
+
+def create_argv(error_count):
+    argv = [f"--option{index}={index}" for index in range(OPTION_COUNT)]
+    # spread the errors over the command line
+    for error_index in range(error_count):
+        argv[error_index * (OPTION_COUNT // error_count)] = f"--option{error_index}=x"
+    return argv
+
+
+def measure(function, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return ((time.perf_counter() - start) / repeat, result)
+
+
+def find_errors_one_by_one(parser, argv):
+    argv = list(argv)
+    errors = 0
+    while(True):
+        try:
+            parser.parse(argv)
+            return errors
+        except OptionParserException as error:
+            errors += 1
+            # the "user" fixes the first error, the one which was reported
+            bad_flag = str(error).partition(":")[0]
+            argv = [f"--{bad_flag}=0" if argument.startswith(f"--{bad_flag}=") else argument for argument in argv]
+
+
+def find_errors_at_once(parser, argv):
+    try:
+        parser.parse(argv)
+        return 0
+    except InvalidArgumentsException as error:
+        return len(error.get_errors())
+
+
+def main():
+    error_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    (failing_parser, collecting_parser) = (create_parser(False), create_parser(True))
+    argv = create_argv(error_count)
+
+    (elapsed, found) = measure(lambda: find_errors_one_by_one(failing_parser, argv), 3)
+    print(f"{found} errors, one per parse:  {elapsed * 1000:8.2f} ms")
+    (elapsed, found) = measure(lambda: find_errors_at_once(collecting_parser, argv))
+    print(f"{found} errors, single parse:   {elapsed * 1000:8.2f} ms")
+
+    valid_argv = create_argv(1)
+    valid_argv[0] = "--option0=0"
+    (elapsed, _) = measure(lambda: failing_parser.parse(valid_argv))
+    print(f"valid arguments, default:    {elapsed * 1000:8.2f} ms")
+    (elapsed, _) = measure(lambda: collecting_parser.parse(valid_argv))
+    print(f"valid arguments, collecting: {elapsed * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Measures the latency of shell completions for a program with many options: completing a flag from the flags embedded
+in the bash completion script (if bash is installed), completing an option parameter by starting the program in completion mode,
+and looking up the candidates in the completion index of a parser which is already created.
+
+Run from the root folder of the project after installing the package:
+
+`python benchmarks/completion.py [option count]`
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from option_parser import Option, OptionParser
+
+PROGRAM_SOURCE = '''
+import enum
+import sys
+from option_parser import Option, OptionParser
+
+class Level(enum.Enum):
+    DEBUG = "debug"
+    INFO = "info"
+    WARNING = "warning"
+
+parser = OptionParser("Generated program")
+level = Option("l", "level")
+level.set_parameter_settings(parameter_type=Level)
+parser.add_options(level)
+parser.add_options_from(Option(f"option-{index}") for index in range(int(sys.argv.pop(1))))
+parser.parse()
+'''
+
+
+def create_parser(option_count):
+    parser = OptionParser("Generated program")
+    parser.add_options_from(Option(f"option-{index}") for index in range(option_count))
+    return parser
+
+
+def measure_bash(script_path, repetitions=100):
+    # the completion function is called repeatedly within a single bash process
+    command = (f"source {script_path}; COMP_LINE='program --option-12'; COMP_POINT=${{#COMP_LINE}}; "
+               f"start=$EPOCHREALTIME; for ((i = 0; i < {repetitions}; i++)); do _option_parser_complete_program; done; "
+               f"echo $start $EPOCHREALTIME")
+    (start, end) = subprocess.run(["bash", "-c", command], capture_output=True, text=True, check=True).stdout.split()
+    return (float(end) - float(start)) / repetitions
+
+
+def measure_program(program_path, option_count, repetitions=10):
+    environment = dict(os.environ, OPTION_PARSER_COMPLETE="bash")
+    best = float("inf")
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, program_path, str(option_count), "-l", "w"], env=environment, capture_output=True, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    option_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    parser = create_parser(option_count)
+
+    with tempfile.TemporaryDirectory() as directory:
+        script_path = os.path.join(directory, "program.bash")
+        with open(script_path, "w") as script_file:
+            script_file.write(parser.get_completion_script("bash", "program"))
+        program_path = os.path.join(directory, "program.py")
+        with open(program_path, "w") as program_file:
+            program_file.write(PROGRAM_SOURCE)
+
+        if(shutil.which("bash") is not None):
+            print(f"flag completed by the bash script:         {measure_bash(script_path) * 1000:8.3f} ms")
+        print(f"parameter completed by starting Python:    {measure_program(program_path, option_count) * 1000:8.3f} ms")
+
+    parser.get_completions(["--option-1"])
+    start = time.perf_counter()
+    for _ in range(1000):
+        parser.get_completions(["--option-12"])
+    print(f"lookup in the completion index:            {(time.perf_counter() - start):8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
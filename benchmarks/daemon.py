@@ -0,0 +1,89 @@
+"""Compares the latency of parsing a command line for a program with many options when starting Python and creating the parser
+every time (cold start), when using the command-line client or the client shim of a running daemon, and when sending requests
+to the daemon from a running Python process.
+
+Run from the root folder of the project after installing the package:
+
+`python benchmarks/daemon.py [option count]`
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from option_parser import daemon
+
+DEFINITION_SOURCE = '''
+import sys
+from option_parser import Option, OptionParser
+
+def create_parser():
+    parser = OptionParser("Generated program")
+    options = []
+    for index in range({option_count}):
+        option = Option(f"option-{index}")
+        option.set_description(f"Option number {index}")
+        option.set_parameter_settings(parameter_type=int, metavar="N")
+        options.append(option)
+    parser.add_options_from(options)
+    return parser
+
+if __name__ == "__main__":
+    processed_options = create_parser().parse()
+'''
+
+ARGUMENTS = ["--option-1=1", "--option-20=2", "file"]
+
+
+def best_time(function, repetitions):
+    best = float("inf")
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    option_count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    with tempfile.TemporaryDirectory() as directory:
+        definition_path = os.path.join(directory, "definition.py")
+        with open(definition_path, "w") as definition_file:
+            definition_file.write(DEFINITION_SOURCE.replace("{option_count}", str(option_count)))
+        definition = f"{definition_path}:create_parser"
+        socket_path = os.path.join(directory, "daemon.sock")
+        environment = dict(os.environ, OPTION_PARSER_SOCKET=socket_path)
+
+        cold = best_time(lambda: subprocess.run([sys.executable, definition_path, *ARGUMENTS], check=True), 5)
+        print(f"cold start:                 {cold * 1000:8.2f} ms")
+
+        server = subprocess.Popen([sys.executable, "-m", "option_parser.daemon", "serve", socket_path])
+        try:
+            while(not os.path.exists(socket_path)):
+                time.sleep(0.01)
+            # the first request creates the parser
+            daemon.request("parse", definition, ARGUMENTS, socket_path=socket_path)
+
+            client_command = [sys.executable, "-m", "option_parser.daemon", "parse", definition, *ARGUMENTS]
+            client = best_time(lambda: subprocess.run(client_command, env=environment, stdout=subprocess.DEVNULL, check=True), 5)
+            print(f"daemon, command-line client: {client * 1000:7.2f} ms")
+
+            shim_path = os.path.join(directory, "client")
+            with open(shim_path, "w") as shim_file:
+                shim_file.write(daemon.get_client_shim(socket_path))
+            shim_command = [sys.executable, "-S", shim_path, "parse", definition, *ARGUMENTS]
+            shim = best_time(lambda: subprocess.run(shim_command, stdout=subprocess.DEVNULL, check=True), 5)
+            print(f"daemon, client shim:        {shim * 1000:8.2f} ms")
+
+            in_process = best_time(lambda: daemon.request("parse", definition, ARGUMENTS, socket_path=socket_path), 100)
+            print(f"daemon, request():          {in_process * 1000:8.2f} ms")
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Measures how `OptionParser.parse_parallel()` scales with the number of worker processes,
+compared to single-process `OptionParser.parse_many()`.
+
+Run from the root folder of the project after installing the package:
+
+`python benchmarks/parallel.py [command line count]`
+"""
+
+import os
+import sys
+import time
+
+from option_parser import Option, OptionParser
+
+
+def is_non_negative(number):
+    return number >= 0
+
+
+def create_parser():
+    parser = OptionParser(throw_on_error=False)
+    options = []
+    for index in range(50):
+        option = Option(f"option{index}")
+        option.set_parameter_settings(parameter_type=int, parameter_count=2, validator=is_non_negative)
+        options.append(option)
+    parser.add_options(Option("v", "verbose"), *options)
+    return parser
+
+
+def generate_argvs(count):
+    for index in range(count):
+        yield ["-v", f"--option{index % 50}={index},{index + 1}", f"--option{(index + 7) % 50}=1,2", "input.txt", "output.txt"]
+
+
+def measure(function, count):
+    start = time.perf_counter()
+    for _ in function(generate_argvs(count)):
+        pass
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    parser = create_parser()
+
+    baseline = measure(parser.parse_many, count)
+    print(f"{'workers':>8} {'lines/s':>12} {'speedup':>8}")
+    print(f"{'inline':>8} {baseline:>12.0f} {1:>7.2f}x")
+
+    worker_count = 1
+    while(worker_count <= (os.cpu_count() or 1)):
+        throughput = measure(lambda argvs: parser.parse_parallel(argvs, max_workers=worker_count, chunk_size=5000), count)
+        print(f"{worker_count:>8} {throughput:>12.0f} {throughput / baseline:>7.2f}x")
+        worker_count *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Parses a synthetic process table, i.e. the `/proc/<pid>/cmdline` contents of many processes, comparing `OptionParser.parse_bytes()`
+with decoding every argument and calling `OptionParser.parse_many()`.
+
+Most generated command lines consist of a few options followed by many file names, some of which are not valid UTF-8.
+Run from the root folder of the project after installing the package:
+
+`python benchmarks/process_table.py [process count]`
+"""
+
+import os
+import sys
+import time
+
+from option_parser import Option, OptionParser
+
+
+def create_parser():
+    parser = OptionParser(throw_on_error=False)
+    config = Option("c", "config")
+    config.set_parameter_settings(metavar="PATH")
+    jobs = Option("j", "jobs")
+    jobs.set_parameter_settings(parameter_type=int, metavar="N")
+    parser.add_options(Option("v", "verbose"), Option("q", "quiet"), config, jobs)
+    return parser
+
+
+def generate_process_table(process_count):
+    table = []
+    for pid in range(process_count):
+        arguments = [b"/usr/bin/worker", b"-v", b"--config=/etc/worker.conf", b"-j", str(pid % 16).encode()]
+        if(pid % 3 == 0):
+            arguments.append(b"--")
+        arguments.extend(b"/srv/data/file-%d-%d\xff.dat" % (pid, index) for index in range(pid % 200))
+        table.append(b"\0".join(arguments) + b"\0")
+    return table
+
+
+def parse_decoded(parser, table):
+    argvs = ([os.fsdecode(arg) for arg in cmdline.split(b"\0")[1:-1]] for cmdline in table)
+    return sum(1 for _ in parser.parse_many(argvs))
+
+
+def parse_bytes(parser, table):
+    return sum(1 for cmdline in table if parser.parse_bytes(cmdline, skip_program_name=True) is not None)
+
+
+def main():
+    process_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    table = generate_process_table(process_count)
+    parser = create_parser()
+    parser.compile()
+
+    for (name, function) in (("decode + parse_many", parse_decoded), ("parse_bytes", parse_bytes)):
+        best = float("inf")
+        for _ in range(5):
+            start = time.perf_counter()
+            function(parser, table)
+            best = min(best, time.perf_counter() - start)
+        print(f"{name:>20}: {process_count / best:10.0f} command lines/s")
+
+
+if __name__ == "__main__":
+    main()
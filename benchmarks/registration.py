@@ -0,0 +1,46 @@
+"""Measures how the time needed to register generated options grows with their count, registering them all at once
+with `OptionParser.add_options_from()` and in batches of ten with `OptionParser.add_options()`.
+
+Run from the root folder of the project after installing the package:
+
+`python benchmarks/registration.py [largest option count]`
+"""
+
+import sys
+import time
+
+from option_parser import Option, OptionParser
+
+
+def create_options(option_count):
+    return [Option(f"generated-option-{index}") for index in range(option_count)]
+
+
+def register_at_once(options):
+    parser = OptionParser()
+    parser.add_options_from(iter(options))
+    return parser
+
+
+def register_in_batches(options):
+    parser = OptionParser()
+    for index in range(0, len(options), 10):
+        parser.add_options(*options[index:index + 10])
+    return parser
+
+
+def main():
+    largest_option_count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+
+    option_counts = [count for count in (1000, 5000, 10_000, 50_000, 100_000) if count < largest_option_count] + [largest_option_count]
+    for option_count in option_counts:
+        options = create_options(option_count)
+        for (name, function) in (("add_options_from", register_at_once), ("add_options x10", register_in_batches)):
+            start = time.perf_counter()
+            function(options)
+            elapsed = time.perf_counter() - start
+            print(f"{option_count:>8} options, {name:>16}: {elapsed * 1000:8.2f} ms ({elapsed / option_count * 1e6:5.2f} us per option)")
+
+
+if __name__ == "__main__":
+    main()
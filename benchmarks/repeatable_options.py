@@ -0,0 +1,54 @@
+"""Parses compiler-wrapper command lines with growing numbers of repeated `-I` and `-D` options with the `"append"` action,
+showing that the time per occurrence stays constant.
+
+Run from the root folder of the project after installing the package:
+
+`python benchmarks/repeatable_options.py [largest occurrence count]`
+"""
+
+import sys
+import time
+
+from option_parser import Option, OptionParser
+
+
+def create_parser(backend):
+    parser = OptionParser(throw_on_error=True, backend=backend)
+    include = Option("I")
+    include.set_parameter_settings(metavar="DIR")
+    include.set_action("append")
+    define = Option("D")
+    define.set_parameter_settings(metavar="NAME")
+    define.set_action("append")
+    output = Option("o")
+    output.set_parameter_settings(metavar="FILE")
+    parser.add_options(include, define, output)
+    return (parser, include, define)
+
+
+def create_argv(occurrence_count):
+    argv = []
+    for index in range(occurrence_count // 2):
+        argv.extend(["-I", f"/usr/include/package{index}", "-D", f"FEATURE_{index}=1"])
+    return argv + ["-o", "main.o", "main.c"]
+
+
+def main():
+    largest_occurrence_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    for backend in ("generic", "codegen"):
+        (parser, include, define) = create_parser(backend)
+        parser.compile()
+        occurrence_count = 1000
+        while(occurrence_count <= largest_occurrence_count):
+            argv = create_argv(occurrence_count)
+            start = time.perf_counter()
+            processed_options = parser.parse(argv)
+            collected = len(processed_options.get_all(include)) + len(processed_options.get_all(define))
+            elapsed = time.perf_counter() - start
+            print(f"{backend:>8} {occurrence_count:>8} occurrences: {elapsed * 1000:8.2f} ms ({elapsed / collected * 1e6:5.2f} us per occurrence)")
+            occurrence_count *= 10
+
+
+if __name__ == "__main__":
+    main()
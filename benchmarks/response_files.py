@@ -0,0 +1,63 @@
+"""Measures the parse throughput of response files of growing size, and the peak memory used by reading them
+(the parse result itself grows with the argument count, so the expansion is measured separately).
+
+Run from the root folder of the project after installing the package:
+
+`python benchmarks/response_files.py [largest argument count]`
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from option_parser import Option, OptionParser
+from option_parser._response_files import _expand_response_files
+
+
+def create_parser(file_format):
+    parser = OptionParser(throw_on_error=True, response_files=file_format)
+    parser.add_options(Option("v", "verbose"), Option("q", "quiet"))
+    return parser
+
+
+def write_response_file(path, argument_count, separator):
+    with open(path, "wb") as response_file:
+        block = separator.join([b"-v", b"--quiet"] * 5000) + separator
+        for _ in range(argument_count // 10000):
+            response_file.write(block)
+
+
+def main():
+    largest_argument_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+
+    with tempfile.TemporaryDirectory() as directory:
+        for (file_format, separator) in (("lines", b"\n"), ("null", b"\0"), ("shell", b" ")):
+            argument_count = 10000
+            while(argument_count <= largest_argument_count):
+                if(file_format == "shell" and argument_count > 1_000_000):
+                    # shlex reads one character at a time, larger files take minutes
+                    break
+                path = os.path.join(directory, f"{file_format}-{argument_count}.txt")
+                write_response_file(path, argument_count, separator)
+                parser = create_parser(file_format)
+
+                start = time.perf_counter()
+                parser.parse([f"@{path}"])
+                elapsed = time.perf_counter() - start
+
+                tracemalloc.start()
+                for _ in _expand_response_files([f"@{path}"], file_format):
+                    pass
+                peak_memory = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+
+                print(f"{file_format:>6} {argument_count:>11} arguments ({os.path.getsize(path) / 2**20:7.1f} MiB): "
+                      f"{argument_count / elapsed:12.0f} arguments/s, peak memory while reading {peak_memory / 2**10:7.1f} KiB")
+                os.remove(path)
+                argument_count *= 10
+
+
+if __name__ == "__main__":
+    main()
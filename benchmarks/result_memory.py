@@ -0,0 +1,40 @@
+"""Measures the memory retained by parse results, for programs which keep many of them (e.g. analytics over stored command lines).
+
+Run from the root folder of the project after installing the package:
+
+`python benchmarks/result_memory.py [result count]`
+"""
+
+import sys
+import tracemalloc
+
+from option_parser import Option, OptionParser
+
+
+def create_parser():
+    parser = OptionParser(throw_on_error=True)
+    options = []
+    for index in range(30):
+        option = Option(f"option{index}")
+        option.set_parameter_settings(parameter_type=int)
+        options.append(option)
+    parser.add_options(Option("v", "verbose"), *options)
+    return parser
+
+
+def main():
+    result_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    parser = create_parser()
+    argvs = [["-v", f"--option{index % 30}={index}", f"--option{(index + 7) % 30}=1", "input.txt"] for index in range(result_count)]
+    parser.compile()
+
+    tracemalloc.start()
+    results = list(parser.parse_many(argvs))
+    retained_memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(f"{len(results)} results retain {retained_memory / 2**20:.1f} MiB, {retained_memory / len(results):.0f} bytes per result")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Compares the time and the additional memory needed to parse `tool -v -- <many file paths>`
+with and without `stream_plain_args`.
+
+Run from the root folder of the project after installing the package:
+
+`python benchmarks/streaming_plain_args.py [path count]`
+"""
+
+import sys
+import time
+import tracemalloc
+
+from option_parser import Option, OptionParser
+
+
+def create_parser(stream_plain_args):
+    parser = OptionParser(throw_on_error=True, stream_plain_args=stream_plain_args)
+    parser.add_options(Option("v", "verbose"))
+    return parser
+
+
+def main():
+    path_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    argv = ["-v", "--"] + [f"/data/files/{index:08}.dat" for index in range(path_count)]
+
+    for stream_plain_args in (False, True):
+        parser = create_parser(stream_plain_args)
+        parser.compile()
+
+        start = time.perf_counter()
+        processed_options = parser.parse(argv)
+        argument_count = sum(1 for _ in processed_options.iter_plain_args())
+        elapsed = time.perf_counter() - start
+
+        tracemalloc.start()
+        processed_options = parser.parse(argv)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        print(f"stream_plain_args={stream_plain_args!s:5}: {argument_count} plain arguments parsed and iterated in {elapsed * 1000:8.2f} ms, "
+              f"peak memory during parse {peak_memory / 2**10:10.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
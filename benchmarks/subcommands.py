@@ -0,0 +1,55 @@
+"""Measures the time needed to create a parser for a program with many subcommands, each with many options, and parse
+a command line selecting one of them, compared with creating all the subcommand parsers up front.
+
+Run from the root folder of the project after installing the package:
+
+`python benchmarks/subcommands.py [subcommand count] [options per subcommand]`
+"""
+
+import sys
+import time
+
+from option_parser import Option, OptionParser
+
+
+def create_subcommand_factory(name, option_count):
+    def create_subcommand_parser():
+        parser = OptionParser(f"The {name} subcommand")
+        options = []
+        for index in range(option_count):
+            option = Option(f"{name}-option-{index}")
+            option.set_description(f"Option number {index} of {name}")
+            option.set_parameter_settings(parameter_type=int, metavar="N")
+            options.append(option)
+        parser.add_options_from(options)
+        return parser
+    return create_subcommand_parser
+
+
+def create_parser(subcommand_count, option_count, eager):
+    parser = OptionParser("Tool with many subcommands")
+    parser.add_options(Option("v", "verbose"))
+    for index in range(subcommand_count):
+        name = f"command{index}"
+        parser.add_subcommand(name, create_subcommand_factory(name, option_count), f"Runs {name}")
+        if(eager):
+            parser.get_subcommand_parser(name).compile()
+    return parser
+
+
+def main():
+    subcommand_count = int(sys.argv[1]) if len(sys.argv) > 1 else 80
+    option_count = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    argv = ["-v", "command7", "--command7-option-3=5"]
+
+    for (name, eager) in (("all parsers created", True), ("lazy subcommands", False)):
+        best = float("inf")
+        for _ in range(5):
+            start = time.perf_counter()
+            create_parser(subcommand_count, option_count, eager).parse(argv)
+            best = min(best, time.perf_counter() - start)
+        print(f"{name:>20}: {best * 1000:8.2f} ms to start and parse")
+
+
+if __name__ == "__main__":
+    main()
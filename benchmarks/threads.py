@@ -0,0 +1,57 @@
+"""Parses a batch of command lines with one parser shared by a growing number of threads, using `parse_isolated()`,
+and reports the throughput for each thread count.
+
+With the GIL, the throughput stays roughly constant as threads are added. On a free-threaded build of CPython (3.13 or later, e.g. `python3.13t`),
+parses run in parallel and the throughput grows with the number of threads, up to the number of available CPUs.
+
+Run from the root folder of the project after installing the package:
+
+`python benchmarks/threads.py [command line count] [largest thread count]`
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from option_parser import Option, OptionParser
+
+
+def create_parser():
+    parser = OptionParser(throw_on_error=True, backend="codegen")
+    options = []
+    for index in range(50):
+        option = Option(f"option{index}")
+        option.set_parameter_settings(parameter_type=int)
+        options.append(option)
+    parser.add_options(Option("v", "verbose"), *options)
+    parser.compile()
+    return parser
+
+
+def main():
+    argv_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    largest_thread_count = int(sys.argv[2]) if len(sys.argv) > 2 else 2 * (os.cpu_count() or 1)
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if is_gil_enabled else 'disabled'}, {os.cpu_count()} CPUs")
+
+    parser = create_parser()
+    argvs = [["-v", f"--option{index % 50}={index}", f"--option{(index + 7) % 50}=1", "input.txt"] for index in range(argv_count)]
+
+    def parse_slice(thread_index, thread_count):
+        for argv in argvs[thread_index::thread_count]:
+            parser.parse_isolated(argv)
+
+    thread_count = 1
+    while(thread_count <= largest_thread_count):
+        with ThreadPoolExecutor(thread_count) as executor:
+            start = time.perf_counter()
+            for future in [executor.submit(parse_slice, thread_index, thread_count) for thread_index in range(thread_count)]:
+                future.result()
+            elapsed = time.perf_counter() - start
+        print(f"{thread_count:>3} threads: {argv_count / elapsed:>10,.0f} parses/s")
+        thread_count *= 2
+
+
+if __name__ == "__main__":
+    main()
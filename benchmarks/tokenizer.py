@@ -0,0 +1,60 @@
+"""Compares the single-pass tokenizer with the regex based token classification it replaced.
+
+Run from the root folder of the project after installing the package:
+
+`python benchmarks/tokenizer.py`
+"""
+
+import re
+import timeit
+
+from option_parser._tokenizer import _tokenize
+
+
+def regex_classify(args):
+    # token classification as performed by _Parser before the tokenizer was introduced
+    expanded_args = []
+    for arg in args:
+        if(re.search("^-[A-Za-z]+$", arg)):
+            for flag in arg[1:]:
+                expanded_args.append(f"-{flag}")
+        else:
+            expanded_args.append(arg)
+
+    result = []
+    for token in expanded_args:
+        if(bool(re.search("^(-[A-Za-z])|(--[^ ]+)$", token))):
+            if(bool(re.search("^--[^ ]+$", token))):
+                flag = token.split('=')[0]
+                parameters = token.split('=')[1].split(',') if len(token.split('=')) >= 2 else []
+                result.append((flag, parameters))
+            else:
+                result.append((token, None))
+        elif(token == "--"):
+            result.append((token, None))
+        else:
+            result.append((token, None))
+    return result
+
+
+def tokenizer_classify(args):
+    return list(_tokenize(args))
+
+
+def generate_argv(length):
+    pattern = ["-v", "--output=file.txt", "-abc", "plain", "--level=1,2,3", "-o", "value", "--verbose"]
+    return [pattern[i % len(pattern)] for i in range(length)]
+
+
+def main():
+    print(f"{'tokens':>8} {'regex [ms]':>12} {'tokenizer [ms]':>15} {'speedup':>8}")
+    for length in (10, 1000, 100000):
+        argv = generate_argv(length)
+        repeat = max(1, 100000 // length)
+        regex_time = min(timeit.repeat(lambda: regex_classify(argv), number=repeat, repeat=5)) / repeat
+        tokenizer_time = min(timeit.repeat(lambda: tokenizer_classify(argv), number=repeat, repeat=5)) / repeat
+        print(f"{length:>8} {regex_time * 1000:>12.4f} {tokenizer_time * 1000:>15.4f} {regex_time / tokenizer_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
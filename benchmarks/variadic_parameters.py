@@ -0,0 +1,50 @@
+"""Parses `--inputs` options with a variable parameter count (`"+"`) followed by growing numbers of values,
+showing that both the time and the peak memory per value stay constant.
+
+Run from the root folder of the project after installing the package:
+
+`python benchmarks/variadic_parameters.py [largest value count]`
+"""
+
+import sys
+import time
+import tracemalloc
+
+from option_parser import Option, OptionParser
+
+
+def create_parser(backend):
+    parser = OptionParser(throw_on_error=True, backend=backend)
+    inputs = Option("i", "inputs")
+    inputs.set_parameter_settings(metavar="FILE", parameter_count="+", required=True)
+    parser.add_options(Option("v", "verbose"), inputs)
+    return (parser, inputs)
+
+
+def main():
+    largest_value_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    for backend in ("generic", "codegen"):
+        (parser, inputs) = create_parser(backend)
+        parser.compile()
+        # the first parse also finishes setting up the parser
+        parser.parse(["-i", "input.txt"])
+        value_count = 1000
+        while(value_count <= largest_value_count):
+            argv = ["-v", "-i", *(f"input{index}.txt" for index in range(value_count))]
+            start = time.perf_counter()
+            processed_options = parser.parse(argv)
+            elapsed = time.perf_counter() - start
+            assert len(processed_options.get_option_parameter(inputs)) == value_count
+
+            tracemalloc.start()
+            parser.parse(argv)
+            peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"{backend:>8} {value_count:>8} values: {elapsed * 1000:8.2f} ms ({elapsed / value_count * 1e9:5.0f} ns per value), "
+                  f"peak {peak_memory / 2**20:6.2f} MiB ({peak_memory / value_count:4.0f} bytes per value)")
+            value_count *= 10
+
+
+if __name__ == "__main__":
+    main()
@@ -66,9 +66,11 @@ Options:
 
 # Usage
 ## Creating parser
-Creating a parser is done simply by initializing an `option_parser.OptionParser` object. `option_parser.OptionParser` constructor takes two optional parameters:
+Creating a parser is done simply by initializing an `option_parser.OptionParser` object. `option_parser.OptionParser` constructor takes the following optional parameters:
 `description` - program description to be displayed in the help page
 `throw_on_error` - boolean flag to specify error handling behavior during parsing. If `False` (which it is by default), then the program will print error info, print help page, and exit. Otherwise it will raise exceptions.
+`lazy_parameters` - boolean flag to defer parameter conversion and validation until the parameters are first retrieved. Useful when parameter types are expensive
+to construct and only a few of them are used. `option_parser.processed_options.ProcessedOptions`'s `validate_all()` method validates all of them at once.
 
 ```python
 parser = OptionParser(description='This program will greet you using your name.')
@@ -85,6 +87,19 @@ name_option = Option("n", "name")
 name_option.set_description("Sets your name")
 ```
 
+An option supplied more than once keeps the parameters of its last occurrence by default. Options such as `-I DIR` or `-v` which are meant
+to be repeated can be configured with `option_parser.option.Option`'s `set_action()` to keep the parameters of every occurrence (`"append"`)
+or only the number of occurrences (`"count"`), which are then retrieved with `option_parser.processed_options.ProcessedOptions`'s `get_all()` and `get_count()`:
+
+```python
+include_option = Option("I", "include")
+include_option.set_parameter_settings(metavar="DIR")
+include_option.set_action("append")
+
+verbose_option = Option("v", "verbose")
+verbose_option.set_action("count")
+```
+
 ## Configuring option parameters
 `option_parser.option.Option` can be configured to accept from 0 to N parameters. Parameters can be mandatory and non-mandatory, they can be cast to a certain type, and so on.
 Parameter configuration is done using `option_parser.option.Option`'s `set_parameter_settings()` method. For example:
@@ -108,6 +123,19 @@ vector_option.set_parameter_settings(
 The above code creates a `-v`, `--vector` option which has 2 mandatory int parameters. It also has a validator which verifies that the supplied parameters are greater than or equal to 0.
 The `metavar` argument provides (in this case) a list of parameter placeholders to display in the program's help page. For single parameters, only a single string should be supplied.
 
+If `parameter_type` or `validator` are expensive (e.g. they access the filesystem) and the same values are parsed repeatedly, the `cache_size` argument enables
+a per-option LRU cache of converted and validated values. Its statistics are available through `option_parser.option.Option`'s `get_parameter_cache_info()`.
+
+`parameter_count` can also be variable: `"*"` (any number of parameters), `"+"` (at least one) or a `(minimum, maximum)` tuple, with `None` as `maximum` for no limit.
+Such an option takes every argument following it up to the next option, `--` or its maximum, and its parameters are always returned as a list:
+
+```python
+inputs_option = Option("i", "inputs")
+inputs_option.set_parameter_settings(metavar="FILE", parameter_count="+", required=True)
+```
+
+`program.py --inputs=a.txt,b.txt` and `program.py -i a.txt b.txt` then both supply `["a.txt", "b.txt"]`.
+
 ## Adding options
 Options are then added to the parser by calling the `option_parser.OptionParser`'s `add_options(option1, option2, ...)` method.
 
@@ -127,6 +155,41 @@ formal_option.set_description('Use formal greeting')
 parser.add_options(name_option, formal_option)
 ```
 
+Options can be added by several calls, flags have to be unique across all of them. Programs generating large numbers of options (e.g. from
+a schema) can pass any iterable, such as a generator, to `add_options_from()`. Registration takes time proportional to the number of options added:
+
+```python
+parser.add_options_from(create_option(field) for field in schema.fields)
+```
+
+## Subcommands
+Programs with subcommands (e.g. `tool -v build --release`) add each of them with `add_subcommand()`, giving a function which creates
+the subcommand's own `option_parser.OptionParser`. The function is only called when the subcommand is selected on the command-line, and it can be
+given as a `"module:function"` string, so that its module is only imported then as well. Starting the program therefore only costs
+the construction of the options of the subcommand which is used.
+
+```python
+def create_build_parser():
+    parser = OptionParser("Build the project")
+    parser.add_options(Option("r", "release"))
+    return parser
+
+parser.add_subcommand("build", create_build_parser, "Build the project")
+parser.add_subcommand("test", "tool.commands.test:create_parser", "Run the tests")
+```
+
+The first plain argument which is not a parameter of an option selects the subcommand, all the arguments following it are parsed
+by the subcommand's parser. `option_parser.processed_options.ProcessedOptions`'s `get_subcommand()` returns the name of the selected subcommand,
+and `get_subcommand_options()` the result of the subcommand's parser. The options of a subcommand can be retrieved from its parser,
+which `get_subcommand_parser()` returns:
+
+```python
+processed_options = parser.parse()
+if(processed_options.get_subcommand() == "build"):
+    release = parser.get_subcommand_parser("build").get_option("release")
+    build(processed_options.get_subcommand_options().is_set(release))
+```
+
 ## Parsing
 Finally, the parsing can begin. The following code will read sys.argv and process the received command-line arguments into a `option_parser.processed_options.ProcessedOptions` object.
 
@@ -134,6 +197,71 @@ Finally, the parsing can begin. The following code will read sys.argv and proces
 processed_options = parser.parse()
 ```
 
+An explicit argument list (without the program name) can be parsed instead of `sys.argv`, and many argument lists can be parsed in a batch
+with `parse_many()`, which yields one result per argument list and never prints or exits:
+
+```python
+processed_options = parser.parse(["-n", "John", "--formal"])
+
+for result in parser.parse_many(stored_command_lines):
+    ...
+```
+
+Command lines stored as NUL-separated bytes, such as `/proc/<pid>/cmdline` on Linux, can be parsed without decoding them first with
+`parse_bytes()`. It behaves like `parse_many()` for a single argument list, decodes only the flags and option parameters during parsing,
+and keeps bytes which are not valid in the file system encoding as surrogate escapes, like `os.fsdecode()`:
+
+```python
+with open(f"/proc/{pid}/cmdline", "rb") as cmdline:
+    result = parser.parse_bytes(cmdline.read(), skip_program_name=True)
+```
+
+Very large batches can be spread over several processes with `parse_parallel()`, which yields the results in the same order as `parse_many()`.
+Parameter types and validators have to be picklable in that case.
+
+The registered options are compiled into a parse plan on the first call to `parse()`, and the plan is reused by all subsequent parses
+until more options are added or one of its options is reconfigured (options of other parsers do not affect it). The plan can also be built
+ahead of time by calling `option_parser.OptionParser`'s `compile()` method.
+
+Programs which parse many argument lists with a fixed set of options can create the parser with `backend="codegen"`. The plan then also
+contains a parse function generated as Python source specialized for the registered options (their flags, parameter counts, types and
+validators), which is faster than the generic implementation but takes longer to compile. The generated source can be inspected with
+`get_generated_source()`. Both backends produce the same results and errors.
+
+## Response files
+Argument lists too long for the operating system can be passed in response files. If the parser is created with the `response_files` argument,
+every `@path` argument is replaced by the arguments read from the file at `path`, before options are detected. The files are read lazily,
+so even very large files are read with a small, constant amount of memory. The value of `response_files` selects the file format:
+
+* `"lines"` - one argument per line, empty lines are skipped
+* `"null"` - arguments terminated by NUL characters, as written by e.g. `find -print0`
+* `"shell"` - whitespace separated arguments, which can be quoted and escaped like in a POSIX shell
+
+```python
+parser = OptionParser(response_files="lines")
+processed_options = parser.parse(["-v", "@sources.txt"])
+```
+
+Response files may contain `@path` arguments themselves, a file including itself (directly or indirectly) is reported as an error.
+Arguments following `--` are never expanded. Note that an option parameter starting with `@` is expanded as well.
+
+## Caching parser definitions
+Programs defining many options can avoid constructing and registering them on every start by moving the parser setup into a function
+and passing it to `option_parser.OptionParser`'s `from_cache()`. The parser is then stored on disk (with its help page already rendered)
+the first time, and loaded from there on later starts. Entries are rebuilt automatically when the function, this library or Python changes,
+or when the file is corrupted. Options of a loaded parser are retrieved by their key with `get_option()`:
+
+```python
+def create_parser():
+    parser = OptionParser("My program")
+    parser.add_options(Option("n", "name"), Option("f", "formal"))
+    return parser
+
+parser = OptionParser.from_cache(create_parser, key=PROGRAM_VERSION)
+processed_options = parser.parse()
+formal = processed_options.is_set(parser.get_option("formal"))
+```
+
 ## Retrieving processed options and parameters
 After processed_options is created, methods can be called on it to verify options' presence, whether parameters were supplied to those options and the parameters themselves.
 Additionally, plain arguments can be retrieved as well.
@@ -146,6 +274,42 @@ else:
     print(f"Yo, {name}!")
 ```
 
+Plain arguments are returned by `get_plain_args()` as a list, or can be iterated over with `iter_plain_args()`. Programs receiving very long
+lists of plain arguments (e.g. `tool -v -- <thousands of file paths>`) can create the parser with `stream_plain_args=True`. The plain arguments
+following the last option and `--` are then not copied, `iter_plain_args()` reads them directly from the parsed argument list (`sys.argv` by default):
+
+```python
+parser = OptionParser(stream_plain_args=True)
+...
+for path in parser.parse().iter_plain_args():
+    process(path)
+```
+
+## Shell completion
+Programs calling `parse()` without arguments support tab completion in bash, zsh and fish. The completion script for a shell is
+printed by running the program with the `OPTION_PARSER_COMPLETE` environment variable set to `bash_source`, `zsh_source` or `fish_source`,
+and can be loaded e.g. from `~/.bashrc`:
+
+```
+eval "$(OPTION_PARSER_COMPLETE=bash_source my_program)"
+```
+
+The script contains the flags and subcommand names of the parser, and completes flags without starting the program. Other arguments
+(option parameters, arguments of subcommands) are completed by running the program with `OPTION_PARSER_COMPLETE` set to the name of the shell,
+in which case `parse()` prints the candidates and exits. Parameters are completed with the values of their `parameter_type`
+if it is an `enum.Enum` with string values, and with file names otherwise. The script can also be generated with `get_completion_script()`,
+and the candidates for a list of arguments are returned by `get_completions()`.
+
+## Parser daemon
+Starting Python and creating a large parser can take longer than the work of programs which only need the parsed options, completions
+or help page, such as shell wrapper scripts. The `option_parser.daemon` module provides a daemon keeping parsers in memory, which answers
+such requests over a Unix domain socket, and recreates a parser whenever the file defining it changes:
+
+```
+python -m option_parser.daemon serve &
+python -m option_parser.daemon parse path/to/cli.py:create_parser --verbose file
+```
+
 ## Error handling
 option_parser supports both automatic and manual error handling. Error handling configuration is supplied to `option_parser.OptionParser`'s constructor as the `throw_on_error` argument:
 
@@ -161,6 +325,42 @@ will print error details, the help page, and then exit. If `throw_on_error` is `
 
 Those exceptions are then left to the library user to handle.
 
+Both stop parsing at the first error. A parser created with `collect_errors=True` reports all of them at once instead, by a single
+`option_parser.exceptions.InvalidArgumentsException` whose `get_errors()` returns every error together with the position of the argument which caused it,
+so that a long command line can be fixed in one go:
+
+```
+Error: 3 errors:
+argument 1: --colour: unrecognized
+argument 4: s: parameter x has invalid type.
+Mandatory option o not supplied.
+```
+
+## Thread safety
+A parser can be shared by any number of threads once its options are configured: `option_parser.OptionParser`'s `parse_isolated()` parses
+an argument list without reading `sys.argv`, printing or exiting, and parsing does not modify any state shared between parses
+(the parser is compiled once, on first use, even if several threads parse at once). Parses run in parallel on free-threaded builds of CPython.
+
+```python
+with ThreadPoolExecutor() as executor:
+    results = list(executor.map(parser.parse_isolated, command_lines))
+```
+
+Options and parsers must not be reconfigured (`add_options()`, `set_parameter_settings()`, etc.) while other threads are parsing with them.
+Parses which are already running are not affected, the parsers using a reconfigured option are recompiled on their next parse.
+`option_parser.processed_options.ProcessedOptions` instances can be read by several threads. With `lazy_parameters=True`, conversions run in parallel
+and every thread gets the same converted parameters, but threads first retrieving the same option at the same time may each call its `parameter_type`
+and validator. A parse hook registered with `set_parse_hook()` is called by the thread which parsed, so it has to be thread-safe itself.
+
+## Profiling
+A callback registered with `option_parser.OptionParser`'s `set_parse_hook()` receives an `option_parser.parse_statistics.ParseStatistics` instance
+after every parse, reporting the time spent in each parsing phase (argument classification, option lookup, parameter conversion, validation, etc.)
+and counts of the processed tokens, options and parameters. No statistics are collected while no hook is registered.
+
+```python
+parser.set_parse_hook(lambda statistics: print(statistics.get_phase_times()))
+```
+
 # Supported option key formats
 option_parser supports the following option key formats:
 
@@ -178,7 +378,24 @@ Parameters are then passed as follows:
 * Short key - `-o a b c`, meaning a space must be between option key and the first parameter, and then spaces between each parameter
 * Long key - `--option=param1,param2,param3`, meaning an equals sign must precede the first parameter, and then commas between each parameter
 
+If the parser is created with `allow_abbreviations=True`, long keys may be shortened to any prefix which is not shared with a key of another option,
+e.g. `--verb` for `--verbose` or `--he` for `--help`.
+
 """
 
-from .option_parser import OptionParser
-from .option import Option
\ No newline at end of file
+__version__ = "1.0"
+
+__all__ = ["OptionParser", "Option"]
+
+# Submodules are imported on first attribute access (PEP 562), so that importing the package alone costs next to nothing.
+def __getattr__(name):
+    if(name == "OptionParser"):
+        from .option_parser import OptionParser
+        return OptionParser
+    if(name == "Option"):
+        from .option import Option
+        return Option
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
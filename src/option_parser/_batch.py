@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Iterable, Iterator, List, Optional, Tuple, Type
+
+import os
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from .exceptions import InvalidOptionException, InvalidParameterException, InvalidArgumentsException
+from .option import Option
+from ._parsed_option import _ParsedOption
+from ._parser import _Parser
+
+# Per worker process state, set up once by _initialize_worker.
+_worker_parser = None
+
+def _initialize_worker(parser_class: Type[_Parser], options: Iterable[Option], lazy_parameters: bool, allow_abbreviations: bool, response_files: Optional[str], collect_errors: bool):
+    global _worker_parser
+    _worker_parser = parser_class(options, lazy_parameters=lazy_parameters, allow_abbreviations=allow_abbreviations, response_files=response_files, collect_errors=collect_errors)
+
+def _parse_chunk(argvs: List[Iterable[str]]) -> List[Tuple[bool, Any]]:
+    # Options are sent back as their ids, which are indexes into the parser's option tuple, so that the results
+    # can be bound to the caller's own Option objects. With lazy parameters, the raw parameters are sent back unconverted.
+    results = []
+    for argv in argvs:
+        try:
+            (parsed_options, plain_arguments) = _worker_parser.parse(argv)
+            compact_options = [(_worker_parser._option_ids[parsed_option._option], parsed_option._parameters, parsed_option._converted) for parsed_option in parsed_options]
+            results.append((True, (compact_options, plain_arguments)))
+        except (InvalidOptionException, InvalidParameterException, InvalidArgumentsException) as error:
+            results.append((False, error))
+    return results
+
+def _parse_in_processes(parser: _Parser, argvs: Iterable[Iterable[str]], max_workers: Optional[int], chunk_size: int) -> Iterator[Tuple[bool, Any]]:
+    """Parses the argument lists in a process pool, yielding `(success, result)` pairs in input order.
+    Successful results are `(parsed_options, plain_arguments)` tuples, failed ones are the raised exceptions."""
+    options = parser._options
+    argv_iterator = iter(argvs)
+
+    worker_count = max_workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=worker_count, initializer=_initialize_worker, initargs=(type(parser), options, parser._lazy_parameters, parser._allow_abbreviations, parser._response_files, parser._collect_errors)) as executor:
+        # Only a bounded number of chunks is in flight, so the input is consumed as the results are consumed.
+        max_pending_chunks = 2 * worker_count
+        pending_chunks = deque()
+
+        while(True):
+            while(len(pending_chunks) < max_pending_chunks):
+                chunk = list(islice(argv_iterator, chunk_size))
+                if(not chunk):
+                    break
+                pending_chunks.append(executor.submit(_parse_chunk, chunk))
+
+            if(not pending_chunks):
+                return
+
+            for (success, result) in pending_chunks.popleft().result():
+                if(success):
+                    (compact_options, plain_arguments) = result
+                    parsed_options = [_ParsedOption(options[index], parameters, converted) for (index, parameters, converted) in compact_options]
+                    yield (True, (parsed_options, plain_arguments))
+                else:
+                    yield (False, result)
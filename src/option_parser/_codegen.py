@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Dict, Iterable, List, Optional, Tuple
+    from .parse_statistics import ParseStatistics
+
+from .exceptions import InvalidOptionException, InvalidParameterException
+from .option import Option
+from ._parsed_option import _ParsedOption
+from ._parser import _Parser
+from ._tokenizer import _tokenize, LONG_FLAG, PLAIN_ARG_DELIMITER, PLAIN_ARGUMENT
+
+# Parameter conversions with at most this many parameters are unrolled, larger ones use a loop.
+_MAX_UNROLLED_PARAMETERS = 8
+
+_PARSE_FUNCTION_SOURCE = '''
+def parse(received_args):
+    parsed_options = []
+    plain_arguments = []
+    # the last short option is only finished once it is known whether it is the last detected option
+    pending = None
+    pending_parameters = None
+    # number of plain arguments preceding "--", the unused parameters of the last option are inserted there
+    delimiter_position = None
+
+    iterator = iter(received_args)
+    for token in iterator:
+        entry = _EXACT_TOKENS.get(token)
+        if(entry is not None):
+            if(pending is not None):
+                parsed_options.append(pending[1](pending_parameters))
+                pending = None
+            if(entry[0]):
+                parsed_options.append(entry[1](_NO_PARAMETERS))
+            else:
+                pending = entry
+                pending_parameters = []
+            continue
+
+        if(token[:1] != "-"):
+            if(pending is not None):
+                pending_parameters.append(token)
+            else:
+                plain_arguments.append(token)
+            continue
+
+        for (kind, text, value) in _tokenize((token,)):
+            if(kind == _PLAIN_ARGUMENT):
+                if(pending is not None):
+                    pending_parameters.append(text)
+                else:
+                    plain_arguments.append(text)
+                continue
+
+            if(pending is not None and kind != _PLAIN_ARG_DELIMITER):
+                parsed_options.append(pending[1](pending_parameters))
+                pending = None
+
+            if(kind == _PLAIN_ARG_DELIMITER):
+                delimiter_position = len(plain_arguments)
+                plain_arguments.extend(iterator)
+            elif(kind == _LONG_FLAG):
+                entry = _find_long(text)
+                parsed_options.append(entry[1](value.split(",") if value is not None else _NO_PARAMETERS))
+            else:
+                entry = _NAMES.get(text)
+                if(entry is None):
+                    raise InvalidOptionException(f"-{text}: unrecognized")
+                pending = entry
+                pending_parameters = []
+
+    if(pending is not None):
+        (parsed_option, trailing_arguments) = pending[2](pending_parameters)
+        parsed_options.append(parsed_option)
+        if(delimiter_position is None):
+            plain_arguments += trailing_arguments
+        else:
+            plain_arguments[delimiter_position:delimiter_position] = trailing_arguments
+{required_check}
+    return (parsed_options, plain_arguments)
+
+def _find_long(name):
+    entry = _NAMES.get(name)
+    if(entry is None and _find_abbreviated is not None):
+        option = _find_abbreviated(name)
+        if(option is not None):
+            entry = _OPTION_ENTRIES[option]
+    if(entry is None):
+        raise InvalidOptionException(f"--{name}: unrecognized")
+    return entry
+'''
+
+_REQUIRED_CHECK_SOURCE = '''
+    supplied_options = {parsed_option._option for parsed_option in parsed_options}
+    for required_option in _REQUIRED_OPTIONS:
+        if(required_option not in supplied_options):
+            raise InvalidOptionException(f"Mandatory option {required_option._option_flags[0]} not supplied.")
+'''
+
+class _GeneratedParser(_Parser):
+    def __init__(self, options: Iterable[Option], lazy_parameters: bool = False, allow_abbreviations: bool = False, response_files: Optional[str] = None, collect_errors: bool = False):
+        """Compiled parse plan whose parse function is generated as Python source specialized for the given options:
+        exact flag tokens are dispatched through a single dictionary lookup, and every option gets its own parameter
+        handling function with the parameter count, type and validator inlined.
+
+        The generated source is available through `get_source()`. Parses collecting statistics, and parses with `lazy_parameters`
+        or `collect_errors`, use the generic `_Parser` implementation."""
+        super().__init__(options, lazy_parameters, allow_abbreviations, response_files, collect_errors)
+
+        namespace = {
+            "InvalidOptionException": InvalidOptionException,
+            "InvalidParameterException": InvalidParameterException,
+            "_ParsedOption": _ParsedOption,
+            "_tokenize": _tokenize,
+            "_LONG_FLAG": LONG_FLAG,
+            "_PLAIN_ARGUMENT": PLAIN_ARGUMENT,
+            "_PLAIN_ARG_DELIMITER": PLAIN_ARG_DELIMITER,
+            "_NO_PARAMETERS": (),
+            "_REQUIRED_OPTIONS": self._required_options,
+            "_find_abbreviated": self._long_flag_trie.find if self._long_flag_trie is not None else None,
+        }
+        source_parts = []
+        option_indexes = {}
+        for option in self._flag_to_option_map.values():
+            if(option not in option_indexes):
+                option_indexes[option] = len(option_indexes)
+                source_parts.append(self.__generate_option_functions(option, option_indexes[option], namespace))
+
+        source_parts.append(_PARSE_FUNCTION_SOURCE.replace("{required_check}", _REQUIRED_CHECK_SOURCE if self._required_options else ""))
+        self._source = "".join(source_parts)
+        exec(compile(self._source, f"<option_parser generated parser {id(self):#x}>", "exec"), namespace)
+
+        # entries are (is_long_flag, finish, finish_last): finish parses the parameters of an option followed by another option,
+        # finish_last the parameters of the last option, returning the parameters which are plain arguments in addition
+        option_entries = {option: (namespace[f"_finish_{index}"], namespace[f"_finish_last_{index}"]) for (option, index) in option_indexes.items()}
+        exact_tokens = {}
+        names = {}
+        for (flag, option) in self._flag_to_option_map.items():
+            (finish, finish_last) = option_entries[option]
+            names[flag] = (False, finish, finish_last)
+            if("=" not in flag):
+                exact_tokens[f"--{flag}"] = (True, finish, finish_last)
+            if(len(flag) == 1):
+                exact_tokens[f"-{flag}"] = (False, finish, finish_last)
+        namespace["_EXACT_TOKENS"] = exact_tokens
+        namespace["_NAMES"] = names
+        namespace["_OPTION_ENTRIES"] = {option: (False, finish, finish_last) for (option, (finish, finish_last)) in option_entries.items()}
+        self._generated_parse = namespace["parse"]
+
+    def get_source(self) -> str:
+        return self._source
+
+    def parse(self, received_args: Iterable[str], statistics: Optional[ParseStatistics] = None) -> Tuple[List[_ParsedOption], List[str]]:
+        if(statistics is not None or self._lazy_parameters or self._collect_errors):
+            return super().parse(received_args, statistics)
+        if(self._response_files is not None):
+            received_args = self._expand_response_files(received_args)
+        return self._generated_parse(received_args)
+
+    def __generate_option_functions(self, option: Option, index: int, namespace: Dict[str, Any]) -> str:
+        (accepts_parameter, parameter_count, _, parameter_required) = self._parameter_specs[option]
+        namespace[f"_option_{index}"] = option
+        namespace[f"_FLAG_{index}"] = option._option_flags[0]
+        if(accepts_parameter and option._parameter.is_variadic()):
+            return self.__generate_variadic_option_functions(option, index, namespace)
+
+        lines = [
+            f"def _finish_{index}(parameters):",
+            f"    # {', '.join(option._option_flags)!r}",
+            f"    if(not parameters):",
+        ]
+        if(parameter_required):
+            lines.append(f"        raise InvalidParameterException(f\"{{_FLAG_{index}}} expects {parameter_count} parameter(s), none received.\")")
+        else:
+            lines.append(f"        return _ParsedOption(_option_{index}, [])")
+        lines.extend([
+            f"    if(len(parameters) != {parameter_count}):",
+            f"        raise InvalidParameterException(f\"Option {{_FLAG_{index}}} received {{len(parameters)}} parameters, expected {parameter_count}.\")",
+        ])
+        if(accepts_parameter and parameter_count > 0):
+            lines.extend(self.__generate_conversion(option, index, parameter_count, namespace))
+
+        lines.extend([
+            "",
+            f"def _finish_last_{index}(parameters):",
+            f"    expected_parameter_count = {parameter_count}",
+        ])
+        if(accepts_parameter and not parameter_required):
+            lines.append(f"    if(len(parameters) < {parameter_count}):")
+            lines.append(f"        expected_parameter_count = 0")
+        lines.append(f"    return (_finish_{index}(parameters[:expected_parameter_count]), parameters[expected_parameter_count:])")
+
+        return "\n".join(lines) + "\n\n"
+
+    def __generate_variadic_option_functions(self, option: Option, index: int, namespace: Dict[str, Any]) -> str:
+        (_, minimum_count, maximum_count, parameter_required) = self._parameter_specs[option]
+        description = option._parameter.describe_parameter_count()
+
+        lines = [
+            f"def _finish_{index}(parameters):",
+            f"    # {', '.join(option._option_flags)!r}",
+            f"    if(not parameters):",
+        ]
+        if(parameter_required and minimum_count > 0):
+            lines.append(f"        raise InvalidParameterException(f\"{{_FLAG_{index}}} expects {description} parameter(s), none received.\")")
+        else:
+            lines.append(f"        return _ParsedOption(_option_{index}, [])")
+        conditions = []
+        if(minimum_count > 1):
+            conditions.append(f"len(parameters) < {minimum_count}")
+        if(maximum_count is not None):
+            conditions.append(f"len(parameters) > {maximum_count}")
+        if(conditions):
+            lines.extend([
+                f"    if({' or '.join(conditions)}):",
+                f"        raise InvalidParameterException(f\"Option {{_FLAG_{index}}} received {{len(parameters)}} parameters, expected {description}.\")",
+            ])
+        lines.extend(self.__generate_conversion(option, index, None, namespace))
+
+        # the last option takes every parameter up to its maximum, without copying them when it takes all of them
+        lines.extend(["", f"def _finish_last_{index}(parameters):"])
+        if(maximum_count is not None):
+            lines.append(f"    if(len(parameters) > {maximum_count}):")
+            lines.append(f"        return (_finish_{index}(parameters[:{maximum_count}]), parameters[{maximum_count}:])")
+        if(not parameter_required and minimum_count > 1):
+            lines.append(f"    if(len(parameters) < {minimum_count}):")
+            lines.append(f"        return (_finish_{index}(_NO_PARAMETERS), parameters)")
+        lines.append(f"    return (_finish_{index}(parameters), _NO_PARAMETERS)")
+
+        return "\n".join(lines) + "\n\n"
+
+    def __generate_conversion(self, option: Option, index: int, parameter_count: Optional[int], namespace: Dict[str, Any]) -> List[str]:
+        # a parameter_count of None (variable counts) always converts the parameters in a loop, into a list
+        settings = option._parameter
+        if(settings.get_cache_size() > 0):
+            # the cached converter already combines conversion and validation
+            namespace[f"_convert_{index}"] = option._parameter_converter
+            if(parameter_count == 1):
+                return [f"    return _ParsedOption(_option_{index}, _convert_{index}(parameters[0]))"]
+            return [f"    return _ParsedOption(_option_{index}, [_convert_{index}(parameter) for parameter in parameters])"]
+
+        namespace[f"_type_{index}"] = settings.get_type()
+        namespace[f"_validator_{index}"] = settings.get_validator()
+
+        def convert(parameter: str, value: str, indent: str) -> List[str]:
+            if(settings.get_type() is str):
+                lines = [f"{indent}{value} = {parameter}"]
+            else:
+                lines = [
+                    f"{indent}try:",
+                    f"{indent}    {value} = _type_{index}({parameter})",
+                    f"{indent}except ValueError:",
+                    f"{indent}    raise InvalidParameterException(f\"{{_FLAG_{index}}}: parameter {{{parameter}}} has invalid type.\")",
+                ]
+            if(settings.get_validator() is not None):
+                lines.extend([
+                    f"{indent}if(not _validator_{index}({value})):",
+                    f"{indent}    raise InvalidParameterException(f\"{{_FLAG_{index}}}: parameter {{{parameter}}} is not valid.\")",
+                ])
+            return lines
+
+        if(parameter_count == 1):
+            return convert("parameters[0]", "value", "    ") + [f"    return _ParsedOption(_option_{index}, value)"]
+        if(parameter_count is not None and parameter_count <= _MAX_UNROLLED_PARAMETERS):
+            lines = []
+            for position in range(parameter_count):
+                lines.extend(convert(f"parameters[{position}]", f"value_{position}", "    "))
+            values = ", ".join(f"value_{position}" for position in range(parameter_count))
+            return lines + [f"    return _ParsedOption(_option_{index}, [{values}])"]
+        return ["    values = []", "    for parameter in parameters:"] + convert("parameter", "value", "        ") + [
+            "        values.append(value)",
+            f"    return _ParsedOption(_option_{index}, values)",
+        ]
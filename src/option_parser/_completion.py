@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Container, Iterable, List, Optional, Sequence, Tuple
+    from .option import Option
+    from ._parser import _Parser
+
+from bisect import bisect_left
+from ._tokenizer import _tokenize, SHORT_FLAG, PLAIN_ARG_DELIMITER
+
+SHELLS = ("bash", "zsh", "fish")
+
+# The scripts complete the flags of the top-level parser from the embedded lists, without starting the program.
+# Everything else (parameters, subcommand arguments) is completed by running the program with OPTION_PARSER_COMPLETE set,
+# which prints the candidates for the arguments it receives, one per line.
+_BASH_SCRIPT = '''# bash completion for {program}, generated by option_parser
+# every flag is quoted once more, as compgen expands the word list
+_option_parser_flag_words_{identifier}={flag_words}
+_option_parser_subcommands_{identifier}=({subcommands})
+
+_option_parser_complete_{identifier}() {
+    local flags="$_option_parser_flag_words_{identifier}"
+    local line="${COMP_LINE:0:COMP_POINT}"
+    local -a words
+    read -ra words <<< "$line"
+    [[ "$line" == *[[:space:]] ]] && words+=("")
+    local cur="${words[${#words[@]}-1]}"
+    local word subcommand
+    COMPREPLY=()
+
+    for word in "${words[@]:1:${#words[@]}-2}"; do
+        for subcommand in "--" "${_option_parser_subcommands_{identifier}[@]}"; do
+            [[ "$word" == "$subcommand" ]] && flags=""
+        done
+    done
+    if [[ -n "$flags" && "$cur" == -* && "$cur" != *=* ]]; then
+        COMPREPLY=($(compgen -W "$flags" -- "$cur"))
+        return
+    fi
+
+    local IFS=$'\\n'
+    COMPREPLY=($(OPTION_PARSER_COMPLETE=bash "${words[0]}" "${words[@]:1}" 2>/dev/null))
+    # "=" separates words in bash, only the part following it is replaced
+    [[ "$cur" == *=* ]] && COMPREPLY=("${COMPREPLY[@]#"${cur%=*}="}")
+}
+complete -o default -F _option_parser_complete_{identifier} {program}
+'''
+
+_ZSH_SCRIPT = '''#compdef {program}
+# zsh completion for {program}, generated by option_parser
+_option_parser_complete_{identifier}() {
+    local -a flags=({flags})
+    local -a subcommands=({subcommands})
+    local cur="${words[CURRENT]}"
+    local word
+
+    for word in "${(@)words[2,CURRENT-1]}"; do
+        if [[ "$word" == "--" || ${subcommands[(Ie)$word]} -gt 0 ]]; then
+            flags=()
+        fi
+    done
+    if [[ ${#flags} -gt 0 && "$cur" == -* && "$cur" != *=* ]]; then
+        compadd -a flags
+        return
+    fi
+
+    local -a candidates=(${(f)"$(OPTION_PARSER_COMPLETE=zsh "${words[1]}" "${(@)words[2,CURRENT]}" 2>/dev/null)"})
+    if [[ ${#candidates} -gt 0 ]]; then
+        compadd -Q -a candidates
+    else
+        _files
+    fi
+}
+compdef _option_parser_complete_{identifier} {program}
+'''
+
+_FISH_SCRIPT = '''# fish completion for {program}, generated by option_parser
+function __option_parser_complete_{identifier}
+    set -l flags {flags}
+    set -l subcommands {subcommands}
+    set -l words (commandline -opc)
+    set -l cur (commandline -ct)
+    set -l program $words[1]
+    set -e words[1]
+
+    for word in $words
+        if test "$word" = "--"; or contains -- "$word" $subcommands
+            set flags
+        end
+    end
+    if test (count $flags) -gt 0; and string match -q -- "-*" "$cur"; and not string match -q -- "*=*" "$cur"
+        printf "%s\\n" $flags
+        return
+    end
+
+    env OPTION_PARSER_COMPLETE=fish $program $words "$cur" 2>/dev/null
+end
+complete -c {program} -a "(__option_parser_complete_{identifier})"
+'''
+
+class _CompletionIndex:
+    __slots__ = ("_flags", "_values")
+
+    def __init__(self, parser: _Parser):
+        """Sorted completion candidates of a compiled parse plan: the prefixed flags of all options, and the values accepted by options
+        whose parameter type is an enumeration of strings (e.g. an `enum.Enum` subclass)."""
+        self._flags = tuple(sorted(("-" if len(flag) == 1 else "--") + flag for flag in parser._flag_to_option_map))
+        self._values = {}
+        for option in parser._options:
+            if(option._parameter is not None):
+                members = getattr(option._parameter.get_type(), "__members__", None)
+                if(members is not None):
+                    self._values[option] = tuple(sorted(member.value for member in members.values() if isinstance(member.value, str)))
+
+    def get_flags(self) -> Tuple[str, ...]:
+        return self._flags
+
+    def complete_flag(self, prefix: str) -> List[str]:
+        start = bisect_left(self._flags, prefix)
+        end = start
+        while(end < len(self._flags) and self._flags[end].startswith(prefix)):
+            end += 1
+        return list(self._flags[start:end])
+
+    def complete_value(self, option: Option, prefix: str) -> List[str]:
+        return [value for value in self._values.get(option, ()) if value.startswith(prefix)]
+
+def _complete(parser: _Parser, index: _CompletionIndex, previous: Sequence[str], current: str, subcommand_names: Container[str]) -> List[str]:
+    """Returns the candidates for the `current` argument following the `previous` ones, which do not select a subcommand."""
+    if("--" in previous):
+        return []
+
+    if(current[:2] == "--" and "=" in current):
+        (flag, _, value) = current[2:].partition("=")
+        option = parser._flag_to_option_map.get(flag)
+        if(option is None):
+            return []
+        # parameters of long flags are separated by commas, only the last one is completed
+        (head, separator, prefix) = value.rpartition(",")
+        return [f"--{flag}={head}{separator}{candidate}" for candidate in index.complete_value(option, prefix)]
+
+    if(current[:1] == "-"):
+        return index.complete_flag(current)
+
+    option = _find_parameter_option(parser, previous)
+    if(option is not None):
+        return index.complete_value(option, current)
+    return sorted(name for name in subcommand_names if name.startswith(current))
+
+def _find_parameter_option(parser: _Parser, previous: Sequence[str]) -> Optional[Option]:
+    # the option taking the argument following `previous` as a parameter, if any
+    for position in range(len(previous) - 1, -1, -1):
+        arg = previous[position]
+        if(arg[:1] != "-"):
+            continue
+        for (kind, name, _) in _tokenize((arg,)):
+            pass
+        if(kind == PLAIN_ARG_DELIMITER):
+            return None
+        if(kind != SHORT_FLAG):
+            continue
+        option = parser._flag_to_option_map.get(name)
+        if(option is None):
+            return None
+        (accepts_parameter, _, maximum_count, _) = parser._parameter_specs[option]
+        if(accepts_parameter and (maximum_count is None or len(previous) - 1 - position < maximum_count)):
+            return option
+        return None
+    return None
+
+def _generate_script(shell: str, program_name: str, flags: Iterable[str], subcommand_names: Iterable[str]) -> str:
+    import re
+
+    if(shell == "fish"):
+        quote = _quote_fish
+    else:
+        from shlex import quote
+
+    quoted_flags = " ".join(quote(flag) for flag in flags)
+    return ({"bash": _BASH_SCRIPT, "zsh": _ZSH_SCRIPT, "fish": _FISH_SCRIPT}[shell]
+        .replace("{program}", quote(program_name))
+        .replace("{identifier}", re.sub(r"\W", "_", program_name, flags=re.ASCII))
+        .replace("{flags}", quoted_flags)
+        .replace("{flag_words}", quote(quoted_flags))
+        .replace("{subcommands}", " ".join(quote(name) for name in subcommand_names)))
+
+def _quote_fish(text: str) -> str:
+    return "'" + text.replace("\\", "\\\\").replace("'", "\\'") + "'"
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Dict, List, Optional, Tuple
+    from .option_parser import OptionParser
+    from .processed_options import ProcessedOptions
+
+import marshal
+import os
+import socket
+import socketserver
+import stat
+
+from .daemon import _ACTIONS, get_default_socket_path
+
+def _handle_request(message: Dict[str, Any], registry: Optional[_DefinitionRegistry] = None) -> Dict[str, Any]:
+    from .exceptions import OptionParserException, InvalidConfigurationException, InvalidArgumentsException
+
+    try:
+        if(not isinstance(message, dict) or message.get("action") not in _ACTIONS or not isinstance(message.get("definition"), str)):
+            raise InvalidConfigurationException("Invalid request.")
+        arguments = message.get("arguments") or []
+        if(not isinstance(arguments, list) or not all(isinstance(argument, str) for argument in arguments)):
+            raise InvalidConfigurationException("Invalid request arguments.")
+
+        (version, parser) = (registry or _DefinitionRegistry()).get_parser(message["definition"])
+        action = message["action"]
+        if(action == "parse"):
+            result = _parse(parser, arguments)
+        elif(action == "complete"):
+            result = parser.get_completions(arguments)
+        else:
+            result = parser.get_help(message.get("width"))
+        if(message.get("text")):
+            result = _render_text(action, result)
+        return {"result": result, "version": version}
+    except OptionParserException as error:
+        response = {"error": str(error), "type": type(error).__name__}
+        if(isinstance(error, InvalidArgumentsException)):
+            response["errors"] = [(position, type(collected_error).__name__, str(collected_error)) for (position, collected_error) in error.get_errors()]
+        return response
+
+def _render_text(action: str, result: Any) -> str:
+    # output of the command-line client
+    if(action == "parse"):
+        import json
+
+        return json.dumps(result) + "\n"
+    if(action == "complete"):
+        return "".join(f"{candidate}\n" for candidate in result)
+    return result + "\n"
+
+def _parse(parser: OptionParser, arguments: List[str]) -> Dict[str, Any]:
+    # parse_many() never prints or exits, regardless of throw_on_error
+    result = next(parser.parse_many([arguments]))
+    if(isinstance(result, Exception)):
+        raise result
+    return _describe_result(parser, result)
+
+def _describe_result(parser: OptionParser, processed_options: ProcessedOptions) -> Dict[str, Any]:
+    processed_options.validate_all()
+    options = {}
+    # option ids are the positions of the options in the compiled plan, so only the supplied options are visited
+    registered_options = parser._compiled_parser._options
+    supplied = processed_options._supplied
+    while(supplied):
+        option = registered_options[(supplied & -supplied).bit_length() - 1]
+        supplied &= supplied - 1
+        received_value = option._action != "store" or processed_options.has_parameter(option)
+        options[option._option_flags[0]] = _to_json_value(processed_options.get_option_parameter(option)) if received_value else None
+
+    subcommand = None
+    subcommand_name = processed_options.get_subcommand()
+    if(subcommand_name is not None):
+        subcommand = _describe_result(parser.get_subcommand_parser(subcommand_name), processed_options.get_subcommand_options())
+        subcommand["name"] = subcommand_name
+
+    return {"options": options, "plain_arguments": list(processed_options.iter_plain_args()), "subcommand": subcommand}
+
+def _to_json_value(value: Any) -> Any:
+    if(value is None or isinstance(value, (str, int, float, bool))):
+        return value
+    if(isinstance(value, (list, tuple))):
+        return [_to_json_value(item) for item in value]
+    return str(value)
+
+class _DefinitionRegistry:
+    def __init__(self):
+        """Parsers created from definitions, each with the state of the file it was created from, so that it is recreated when the file changes."""
+        # definition -> (file state, version, parser)
+        self._entries = {}
+
+    def get_parser(self, definition: str) -> Tuple[int, OptionParser]:
+        """Returns the version of the definition (incremented whenever the parser is recreated) and its parser."""
+        from .exceptions import InvalidConfigurationException
+
+        (location, separator, function_name) = definition.rpartition(":")
+        if(not separator or not location or not function_name):
+            raise InvalidConfigurationException(f"Invalid parser definition: '{definition}', expected 'file.py:function' or 'module:function'.")
+
+        is_file = location.endswith(".py") or os.sep in location
+        path = location if is_file else self.__find_module_file(location)
+        try:
+            stat = os.stat(path)
+            file_state = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        except OSError as error:
+            raise InvalidConfigurationException(f"Cannot load parser definition '{definition}': {error}") from error
+
+        entry = self._entries.get(definition)
+        if(entry is not None and entry[0] == file_state):
+            return (entry[1], entry[2])
+
+        parser = self.__create_parser(definition, location, function_name, is_file, entry is not None)
+        version = entry[1] + 1 if entry is not None else 1
+        self._entries[definition] = (file_state, version, parser)
+        return (version, parser)
+
+    def __find_module_file(self, module_name: str) -> str:
+        from importlib.util import find_spec
+        from .exceptions import InvalidConfigurationException
+
+        try:
+            spec = find_spec(module_name)
+        except (ImportError, ValueError) as error:
+            raise InvalidConfigurationException(f"Cannot find parser definition module '{module_name}': {error}") from error
+        if(spec is None or spec.origin is None or not os.path.isfile(spec.origin)):
+            raise InvalidConfigurationException(f"Cannot find parser definition module '{module_name}'.")
+        return spec.origin
+
+    def __create_parser(self, definition: str, location: str, function_name: str, is_file: bool, reload: bool) -> OptionParser:
+        import importlib
+        from .exceptions import InvalidConfigurationException
+        from .option_parser import OptionParser
+
+        try:
+            if(is_file):
+                from importlib.util import module_from_spec, spec_from_file_location
+
+                # loaded under a private name, so that definitions never replace imported modules
+                spec = spec_from_file_location(f"_option_parser_definition_{abs(hash(os.path.abspath(location)))}", location)
+                module = module_from_spec(spec)
+                spec.loader.exec_module(module)
+            else:
+                module = importlib.import_module(location)
+                if(reload):
+                    module = importlib.reload(module)
+            parser = getattr(module, function_name)()
+        except Exception as error:
+            raise InvalidConfigurationException(f"Cannot load parser definition '{definition}': {error!r}") from error
+
+        if(not isinstance(parser, OptionParser)):
+            raise InvalidConfigurationException(f"Parser definition '{definition}' did not return an OptionParser.")
+        parser.compile()
+        return parser
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    # a client which stops sending does not block the daemon for long
+    timeout = 10
+
+    def handle(self):
+        try:
+            # one request per connection, the client shuts down its side after sending it
+            data = self.rfile.read()
+            if(not data):
+                # e.g. another daemon checking whether this one is running
+                return
+            response = _handle_request(self.__decode(data), self.server._registry)
+            self.wfile.write(marshal.dumps(response))
+        except OSError:
+            # the client has gone away
+            pass
+
+    def __decode(self, data: bytes) -> Any:
+        try:
+            return marshal.loads(data)
+        except (EOFError, ValueError, TypeError):
+            return None
+
+class ParserDaemon(socketserver.UnixStreamServer):
+    def __init__(self, socket_path: Optional[str] = None):
+        """Unix domain socket server answering the requests sent by `request()`, one at a time.
+        Use `serve_forever()` to run it, and `shutdown()` (from another thread) to stop it. The socket file is removed when the server is closed.
+
+        ## Parameters
+        * `socket_path` - path of the socket to listen on, defaults to `get_default_socket_path()`.
+          A socket file left behind by a daemon which is no longer running is replaced.
+
+        ## Raises
+        * `OSError` - if another daemon is already listening on the socket, the path exists and is not a socket owned by the current user,
+          or the socket cannot be created.
+        """
+        self._socket_path = socket_path or get_default_socket_path()
+        self._registry = _DefinitionRegistry()
+        # the socket file is only removed by the daemon which created it
+        self._bound = False
+        self.__remove_stale_socket()
+        previous_umask = os.umask(0o077)
+        try:
+            super().__init__(self._socket_path, _RequestHandler)
+        finally:
+            os.umask(previous_umask)
+
+    def get_socket_path(self) -> str:
+        return self._socket_path
+
+    def server_bind(self):
+        super().server_bind()
+        self._bound = True
+
+    def server_close(self):
+        super().server_close()
+        if(self._bound):
+            try:
+                os.remove(self._socket_path)
+            except OSError:
+                pass
+
+    def __remove_stale_socket(self):
+        try:
+            status = os.lstat(self._socket_path)
+        except FileNotFoundError:
+            return
+        # never remove anything but a socket of this user, e.g. a file named by a mistyped path
+        if(not stat.S_ISSOCK(status.st_mode) or status.st_uid != os.getuid()):
+            raise OSError(f"{self._socket_path} exists and is not a socket owned by this user.")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            try:
+                connection.connect(self._socket_path)
+            except ConnectionRefusedError:
+                os.remove(self._socket_path)
+                return
+        raise OSError(f"A daemon is already listening on {self._socket_path}.")
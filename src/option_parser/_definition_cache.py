@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Optional, Tuple
+
+# marshal is built into the interpreter, so unlike pickle it costs nothing to import on a cache hit.
+# Parameter types and validators are stored as references to module-level attributes.
+import marshal
+import os
+import sys
+
+from . import __version__
+from .option import Option
+from .option_parser import OptionParser
+from ._parameter_settings import _ParameterSettings
+
+# Bumped whenever the layout of the stored definitions changes.
+_CACHE_FORMAT = 6
+_CACHE_FILE_SUFFIX = ".optcache"
+
+def _get_default_cache_dir() -> str:
+    cache_dir = os.environ.get("OPTION_PARSER_CACHE_DIR")
+    if(cache_dir):
+        return cache_dir
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "option_parser")
+
+def _load_or_build(factory: Callable[[], OptionParser], cache_dir: Optional[str], key: str) -> OptionParser:
+    """Returns the parser stored for `factory` in `cache_dir`, or calls `factory` and stores its parser if there is no usable entry."""
+    code = getattr(factory, "__code__", None)
+    if(code is None):
+        return factory()
+
+    # marshal format 2 does not depend on reference counts, unlike the newer ones, so the same code is always serialized the same way
+    fingerprint = (_CACHE_FORMAT, __version__, sys.implementation.cache_tag, factory.__module__, factory.__qualname__, marshal.dumps(code, 2), key)
+    cache_path = os.path.join(cache_dir or _get_default_cache_dir(), _get_cache_file_name(factory, fingerprint))
+
+    parser = _load(cache_path, fingerprint)
+    if(parser is None):
+        parser = factory()
+        _store(cache_path, fingerprint, parser)
+    return parser
+
+def _get_cache_file_name(factory: Callable[[], OptionParser], fingerprint: Tuple) -> str:
+    from zlib import crc32
+
+    name = "".join(character if character.isalnum() or character in "._-" else "_" for character in f"{factory.__module__}.{factory.__qualname__}")
+    return f"{name}-{crc32(marshal.dumps(fingerprint)):08x}{_CACHE_FILE_SUFFIX}"
+
+def _load(cache_path: str, fingerprint: Tuple) -> Optional[OptionParser]:
+    try:
+        with open(cache_path, "rb") as cache_file:
+            (stored_fingerprint, definition) = marshal.loads(cache_file.read())
+        if(stored_fingerprint != fingerprint):
+            return None
+        return _restore_parser(definition)
+    except Exception:
+        # a missing, truncated or otherwise unusable entry is rebuilt, whatever the reason
+        return None
+
+def _store(cache_path: str, fingerprint: Tuple, parser: OptionParser):
+    definition = _dump_parser(parser)
+    if(definition is None):
+        return
+
+    temporary_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(temporary_path, "wb") as cache_file:
+            cache_file.write(marshal.dumps((fingerprint, definition)))
+        # concurrent processes either see the previous entry or the complete new one
+        os.replace(temporary_path, cache_path)
+    except (OSError, ValueError):
+        # ValueError: a value in the definition is not supported by marshal
+        try:
+            os.remove(temporary_path)
+        except OSError:
+            pass
+
+def _dump_parser(parser: OptionParser) -> Optional[Tuple]:
+    """Converts the parser into marshal-compatible data, or returns `None` if the parser cannot be restored from such data."""
+    if(parser._parse_hook is not None):
+        return None
+
+    # pre-render the default help page, so that loaded parsers do not have to
+    parser.get_help()
+
+    options = []
+    for option in parser._options:
+        parameter = None
+        if(option._parameter is not None):
+            settings = option._parameter
+            type_reference = _get_reference(settings.get_type())
+            validator_reference = _get_reference(settings.get_validator()) if settings.get_validator() is not None else None
+            if(type_reference is None or (settings.get_validator() is not None and validator_reference is None)):
+                return None
+            parameter = (type_reference, settings.is_required(), settings.get_metavar(), settings.get_parameter_count(), validator_reference, settings.get_cache_size())
+
+        help_fragment = parser._help_fragments.get((option, None))
+        help_text = help_fragment[1] if help_fragment is not None and help_fragment[0] == option._revision else None
+        options.append((list(option._option_flags), option._description, option._required, parameter, option._action, option._revision, help_text))
+
+    # subcommand parsers are not stored, they are created by their factories when they are selected
+    subcommands = []
+    for subcommand in parser._subcommands.values():
+        factory = subcommand.get_factory()
+        if(not isinstance(factory, str)):
+            reference = _get_reference(factory)
+            if(reference is None):
+                return None
+            factory = ":".join(reference)
+        subcommands.append((subcommand.get_name(), factory, subcommand.get_description()))
+
+    return (parser._program_description, parser._throw_on_error, parser._lazy_parameters, parser._allow_abbreviations, parser._backend, parser._response_files, parser._stream_plain_args, parser._collect_errors, options, subcommands)
+
+def _restore_parser(definition: Tuple) -> OptionParser:
+    (program_description, throw_on_error, lazy_parameters, allow_abbreviations, backend, response_files, stream_plain_args, collect_errors, stored_options, subcommands) = definition
+    parser = OptionParser(program_description, throw_on_error, lazy_parameters, allow_abbreviations, backend, response_files, stream_plain_args, collect_errors)
+
+    for (flags, description, required, parameter, action, revision, help_text) in stored_options:
+        settings = None
+        if(parameter is not None):
+            (type_reference, parameter_required, metavar, parameter_count, validator_reference, cache_size) = parameter
+            validator = _resolve_reference(validator_reference) if validator_reference is not None else None
+            settings = _ParameterSettings(_resolve_reference(type_reference), parameter_required, metavar, parameter_count, validator, cache_size)
+
+        # the definition was validated when it was stored, so the options are restored without going through Option's setters
+        option = Option.__new__(Option)
+        option.__setstate__({
+            "_description": description,
+            "_required": required,
+            "_parameter": settings,
+            "_parameter_converter": None,
+            "_option_flags": flags,
+            "_revision": revision,
+            "_action": action,
+        })
+        parser._options.append(option)
+        option._add_parser(parser)
+        for flag in flags:
+            parser._flag_index[flag] = option
+        if(help_text is not None):
+            parser._help_fragments[(option, None)] = (revision, help_text)
+
+    # the help option is always the last one
+    parser._help_option = parser._options[-1] if parser._options else None
+    for (name, factory, description) in subcommands:
+        parser.add_subcommand(name, factory, description)
+    return parser
+
+def _get_reference(value: Any) -> Optional[Tuple[str, str]]:
+    """Returns the `(module, qualified name)` by which `value` can be imported again, or `None` if there is none (e.g. lambdas)."""
+    module = getattr(value, "__module__", None)
+    qualified_name = getattr(value, "__qualname__", None)
+    if(not isinstance(module, str) or not isinstance(qualified_name, str)):
+        return None
+    try:
+        if(_resolve_reference((module, qualified_name)) is not value):
+            return None
+    except (ImportError, AttributeError):
+        return None
+    return (module, qualified_name)
+
+def _resolve_reference(reference: Tuple[str, str]) -> Any:
+    (module, qualified_name) = reference
+    if(module not in sys.modules):
+        __import__(module)
+    value = sys.modules[module]
+    for name in qualified_name.split("."):
+        value = getattr(value, name)
+    return value
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Iterable, List, Optional, Tuple
+
+from .option import Option
+from .exceptions import InvalidOptionException
+
+class _TrieNode:
+    __slots__ = ("children", "option", "ambiguous", "exact_option")
+
+    def __init__(self):
+        self.children = {}
+        # the only option reachable from this node, unless ambiguous
+        self.option = None
+        self.ambiguous = False
+        # the option whose flag ends exactly at this node
+        self.exact_option = None
+
+class _FlagTrie:
+    def __init__(self, flags: Iterable[Tuple[str, Option]]):
+        """Prefix tree over long flags, resolving exact flags and unambiguous flag prefixes in `O(len(flag))`.
+        A prefix is unambiguous if all the flags starting with it belong to the same option."""
+        self._root = _TrieNode()
+
+        for (flag, option) in flags:
+            node = self._root
+            for character in flag:
+                node = node.children.setdefault(character, _TrieNode())
+                if(node.option is None):
+                    node.option = option
+                elif(node.option is not option):
+                    node.ambiguous = True
+            node.exact_option = option
+
+    def find(self, prefix: str) -> Optional[Option]:
+        """Returns the option whose flag is `prefix`, or the only option with a flag starting with `prefix`.
+
+        ## Raises
+        * `option_parser.exceptions.InvalidOptionException` - if flags of several options start with `prefix`.
+        """
+        node = self._root
+        for character in prefix:
+            node = node.children.get(character)
+            if(node is None):
+                return None
+
+        if(node.exact_option is not None):
+            return node.exact_option
+        if(node.ambiguous):
+            candidates = ", ".join(f"--{prefix}{suffix}" for suffix in sorted(self.__collect_suffixes(node)))
+            raise InvalidOptionException(f"--{prefix}: ambiguous, could be {candidates}")
+        return node.option
+
+    def __collect_suffixes(self, node: _TrieNode) -> List[str]:
+        suffixes = []
+        pending_nodes = [(node, "")]
+        while(pending_nodes):
+            (current_node, suffix) = pending_nodes.pop()
+            if(current_node.exact_option is not None):
+                suffixes.append(suffix)
+            for (character, child) in current_node.children.items():
+                pending_nodes.append((child, suffix + character))
+        return suffixes
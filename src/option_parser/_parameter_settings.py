@@ -1,12 +1,24 @@
-from typing import Any, Callable, Iterable, Union
+from __future__ import annotations
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Iterable, Optional, Tuple, Union
+
+    ParameterCount = Union[int, str, Tuple[int, Optional[int]]]
+
+from .exceptions import InvalidConfigurationException
 
 class _ParameterSettings:
-    def __init__(self, parameter_type: type, required: bool, metavar: Union[str, Iterable[str]], parameter_count: int, validator: Callable[[Any], bool]):
+    __slots__ = ("_type", "_required", "_metavar", "_parameter_count", "_validator", "_cache_size", "_minimum_count", "_maximum_count")
+
+    def __init__(self, parameter_type: type, required: bool, metavar: Union[str, Iterable[str]], parameter_count: ParameterCount, validator: Callable[[Any], bool], cache_size: int = 0):
         self._type = parameter_type
         self._required = required
         self._metavar = metavar
         self._parameter_count = parameter_count
         self._validator = validator
+        self._cache_size = cache_size
+        (self._minimum_count, self._maximum_count) = _get_parameter_count_range(parameter_count)
 
     def get_type(self) -> type:
         return self._type
@@ -17,8 +29,41 @@ class _ParameterSettings:
     def get_metavar(self) -> Union[str, Iterable[str]]:
         return self._metavar
     
-    def get_parameter_count(self) -> int:
+    def get_parameter_count(self) -> ParameterCount:
         return self._parameter_count
 
+    def get_parameter_count_range(self) -> Tuple[int, Optional[int]]:
+        return (self._minimum_count, self._maximum_count)
+
+    def is_variadic(self) -> bool:
+        return not isinstance(self._parameter_count, int)
+
+    def describe_parameter_count(self) -> str:
+        if(self._minimum_count == self._maximum_count):
+            return str(self._minimum_count)
+        if(self._maximum_count is None):
+            return f"at least {self._minimum_count}"
+        if(self._minimum_count == 0):
+            return f"at most {self._maximum_count}"
+        return f"between {self._minimum_count} and {self._maximum_count}"
+
     def get_validator(self) -> Callable[[str], bool]:
-        return self._validator
\ No newline at end of file
+        return self._validator
+
+    def get_cache_size(self) -> int:
+        return self._cache_size
+
+def _get_parameter_count_range(parameter_count: ParameterCount) -> Tuple[int, Optional[int]]:
+    # (minimum, maximum) number of parameters, the maximum is None if unbounded
+    if(isinstance(parameter_count, int) and not isinstance(parameter_count, bool) and parameter_count >= 0):
+        return (parameter_count, parameter_count)
+    if(parameter_count == "*"):
+        return (0, None)
+    if(parameter_count == "+"):
+        return (1, None)
+    if(isinstance(parameter_count, (tuple, list)) and len(parameter_count) == 2):
+        (minimum, maximum) = parameter_count
+        if(isinstance(minimum, int) and not isinstance(minimum, bool) and minimum >= 0
+           and (maximum is None or (isinstance(maximum, int) and not isinstance(maximum, bool) and maximum >= max(minimum, 1)))):
+            return (minimum, maximum)
+    raise InvalidConfigurationException(f"Invalid parameter count: {parameter_count!r}.")
@@ -1,13 +1,23 @@
-from typing import Iterable
+from __future__ import annotations
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any
+
 from .option import Option
 
 class _ParsedOption:
-    def __init__(self, option: Option, option_parameters: Iterable[str]):
+    __slots__ = ("_option", "_parameters", "_converted")
+
+    def __init__(self, option: Option, option_parameters: Any, converted: bool = True):
+        """Holds the parameters received by an option. If `converted` is `False`, `option_parameters` are the raw strings,
+        which `option_parser.processed_options.ProcessedOptions` converts and validates on first access."""
         self._option = option
         self._parameters = option_parameters
+        self._converted = converted
     
     def get_original_option(self) -> Option:
         return self._option
 
-    def get_parameters(self) -> Iterable[str]:
-        return self._parameters
\ No newline at end of file
+    def get_parameters(self) -> Any:
+        return self._parameters
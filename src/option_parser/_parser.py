@@ -1,141 +1,459 @@
-import re
-from typing import Iterable, Tuple, Union
+from __future__ import annotations
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Callable, Container, Iterable, Optional, Sequence, Tuple, Union
+    from .parse_statistics import ParseStatistics
+    from ._tokenizer import Token
+    from ._plain_arguments import _PlainArguments
+    from ._completion import _CompletionIndex
+
+from time import perf_counter
 from .option import Option
 from ._parsed_option import _ParsedOption
-from .exceptions import InvalidOptionException
+from .exceptions import InvalidOptionException, InvalidParameterException
+from ._tokenizer import _tokenize, SHORT_FLAG, LONG_FLAG, PLAIN_ARG_DELIMITER, PLAIN_ARGUMENT
+
+# same as types.MappingProxyType, without importing the types module
+MappingProxyType = type(type.__dict__)
 
 class _Parser:
-    def __init__(self, options: Iterable[Option]):
-        self._flag_to_option_map = {}
-        self._required_options = []
+    def __init__(self, options: Iterable[Option], lazy_parameters: bool = False, allow_abbreviations: bool = False, response_files: Optional[str] = None, collect_errors: bool = False):
+        """Compiled parse plan. The flag table, the required option set and the parameter specifications
+        are computed once here and never modified afterwards, so one instance can serve any number of parses.
+        If `lazy_parameters` is set, parameter counts are checked during parsing but conversion and validation
+        are deferred until the parameters are first accessed.
+        If `allow_abbreviations` is set, long flags can be abbreviated to any unambiguous prefix, resolved using a prefix tree built here.
+        If `response_files` is set to one of the response file formats, `@path` arguments are expanded before tokenization.
+        If `collect_errors` is set, parsing does not stop at the first error, it raises an `InvalidArgumentsException` with all of them instead."""
+        flag_to_option_map = {}
+        required_options = []
+        parameter_specs = {}
+        option_ids = {}
 
         for option in options:
+            # dense ids, used by ProcessedOptions to store the results compactly
+            option_ids.setdefault(option, len(option_ids))
             for flag in option._option_flags:
-                self._flag_to_option_map[flag] = option
+                flag_to_option_map[flag] = option
             if(option._required):
-                self._required_options.append(option)
-    
-    def parse(self, received_args: Iterable[str]) -> Tuple[Iterable[_ParsedOption], Iterable[str]]:
-        (detected_options, plain_arguments) = self.__process_received_tokens(received_args)
+                required_options.append(option)
+            accepts_parameter = option._accepts_parameter()
+            # (accepts_parameter, minimum_count, maximum_count, parameter_required), maximum_count is None for variable counts without limit
+            parameter_specs[option] = (
+                accepts_parameter,
+                *option._get_parameter_count_range(),
+                accepts_parameter and option._is_parameter_required()
+            )
+
+        self._options = tuple(options)
+        self._flag_to_option_map = MappingProxyType(flag_to_option_map)
+        self._required_options = tuple(required_options)
+        self._parameter_specs = MappingProxyType(parameter_specs)
+        self._option_ids = MappingProxyType(option_ids)
+        self._lazy_parameters = lazy_parameters
+        self._allow_abbreviations = allow_abbreviations
+        self._long_flag_trie = None
+        if(allow_abbreviations):
+            from ._flag_trie import _FlagTrie
+            self._long_flag_trie = _FlagTrie((flag, option) for (flag, option) in flag_to_option_map.items() if len(flag) > 1)
+        self._response_files = response_files
+        self._collect_errors = collect_errors
+        self._help_texts = {}
+        self._completion_index = None
+
+    def get_help_text(self, width: Optional[int]) -> Optional[str]:
+        return self._help_texts.get(width)
+
+    def set_help_text(self, width: Optional[int], help_text: str):
+        self._help_texts[width] = help_text
+
+    def get_completion_index(self) -> _CompletionIndex:
+        if(self._completion_index is None):
+            from ._completion import _CompletionIndex
+
+            self._completion_index = _CompletionIndex(self)
+        return self._completion_index
+
+    def parse(self, received_args: Iterable[str], statistics: Optional[ParseStatistics] = None) -> Tuple[Iterable[_ParsedOption], Iterable[str]]:
+        if(self._response_files is not None):
+            received_args = self._expand_response_files(received_args)
+        if(self._collect_errors):
+            return self.__parse_collecting_errors(received_args, statistics)
+        if(statistics is not None):
+            return self.__parse_with_statistics(received_args, statistics)
+
+        (detected_options, plain_arguments, delimiter_position) = self.__process_received_tokens(_tokenize(received_args))
 
         parsed_options = []
         if(len(detected_options) > 0):
-            (parsed_options, plain_arguments) = self.__parse_detected_options(detected_options, plain_arguments)
+            (parsed_options, plain_arguments) = self.__parse_detected_options(detected_options, plain_arguments, delimiter_position)
 
-        parsed_option_to_original_option_map = [parsed_option.get_original_option() for parsed_option in parsed_options]
-        for required_option in self._required_options:
-            if(required_option not in parsed_option_to_original_option_map):
-                raise InvalidOptionException(f"Mandatory option {required_option._option_flags[0]} not supplied.")
+        self.__check_required_options(parsed_options)
 
         return(parsed_options, plain_arguments)
 
-    def __process_received_tokens(self, received_args: Iterable[str]) -> Tuple[Tuple[str, Iterable[str]], Iterable[str]]:
-        current_option_flag = ""
+    def parse_streaming(self, received_args: Sequence[str], start: int = 0, statistics: Optional[ParseStatistics] = None) -> Tuple[Iterable[_ParsedOption], _PlainArguments]:
+        """Same as `parse()` applied to `received_args[start:]`, but the plain arguments following the last option's parameters
+        and the ones following `--` are returned as spans of `received_args` instead of being copied."""
+        from ._plain_arguments import _PlainArguments
+
+        if(self._response_files is not None):
+            # expanded arguments do not exist in received_args
+            (parsed_options, plain_arguments) = self.parse(received_args[start:], statistics)
+            return (parsed_options, _PlainArguments(plain_arguments, ()))
+
+        try:
+            delimiter_index = received_args.index("--", start)
+        except ValueError:
+            delimiter_index = len(received_args)
+
+        options_end = self.__find_options_end(received_args, start, delimiter_index)
+        (parsed_options, plain_arguments) = self.parse(received_args[start:options_end], statistics)
+        spans = ((received_args, options_end, delimiter_index), (received_args, delimiter_index + 1, len(received_args)))
+        return (parsed_options, _PlainArguments(plain_arguments, spans))
+
+    def parse_bytes(self, buffer: Union[bytes, bytearray, memoryview], start: int = 0, statistics: Optional[ParseStatistics] = None) -> Tuple[Iterable[_ParsedOption], _PlainArguments]:
+        """Same as `parse_streaming()` for the arguments in a buffer of NUL-terminated (or NUL-separated) arguments, starting with argument number `start`.
+        Arguments are decoded like `os.fsdecode()` does, i.e. bytes invalid in the file system encoding are kept as surrogate escapes.
+        Only the arguments which are parsed as options and their parameters are decoded during parsing, the plain arguments following
+        them are decoded when they are iterated over."""
+        from os import fsdecode
+        from ._plain_arguments import _PlainArguments
+
+        received_args = bytes(buffer).split(b"\0")
+        if(received_args[-1] == b""):
+            # the terminator of the last argument, or an empty buffer
+            received_args.pop()
+
+        if(self._response_files is not None):
+            (parsed_options, plain_arguments) = self.parse([fsdecode(arg) for arg in received_args[start:]], statistics)
+            return (parsed_options, _PlainArguments(plain_arguments, ()))
+
+        try:
+            delimiter_index = received_args.index(b"--", start)
+        except ValueError:
+            delimiter_index = len(received_args)
+
+        options_end = self.__find_options_end(received_args, start, delimiter_index, fsdecode)
+        (parsed_options, plain_arguments) = self.parse([fsdecode(arg) for arg in received_args[start:options_end]], statistics)
+        spans = ((received_args, options_end, delimiter_index), (received_args, delimiter_index + 1, len(received_args)))
+        return (parsed_options, _PlainArguments(plain_arguments, spans, fsdecode))
+
+    def __find_options_end(self, received_args: Sequence[Union[str, bytes]], start: int, delimiter_index: int, decode: Optional[Callable[[bytes], str]] = None) -> int:
+        # Returns the index following the last flag before delimiter_index and the parameters it may take.
+        # All the arguments from there to the delimiter are plain arguments, so only the ones before have to be parsed.
+        # Raw bytes arguments are decoded by `decode`, only if they start with a dash.
+        dash = "-" if decode is None else b"-"
+        for index in range(delimiter_index - 1, start - 1, -1):
+            arg = received_args[index]
+            if(arg[:1] != dash):
+                continue
+            for (kind, name, _) in _tokenize((arg if decode is None else decode(arg),)):
+                pass
+            if(kind == PLAIN_ARGUMENT):
+                continue
+
+            options_end = index + 1
+            option = self._flag_to_option_map.get(name) if kind == SHORT_FLAG else None
+            if(option is not None):
+                (accepts_parameter, _, maximum_count, _) = self._parameter_specs[option]
+                if(accepts_parameter):
+                    options_end = delimiter_index if maximum_count is None else min(options_end + maximum_count, delimiter_index)
+            return options_end
+        return start
+
+    def find_first_plain_argument(self, received_args: Sequence[str], start: int = 0, preferred: Container[str] = ()) -> Optional[int]:
+        """Returns the index of the first argument of `received_args[start:]` which is a plain argument and not a parameter of an option,
+        or `None` if there is no such argument before `--`. An argument in `preferred` is never taken as a parameter which may be omitted.
+        `@path` arguments are skipped if response files are enabled."""
+        pending_parameters = 0
+        # parameters which cannot be omitted, an argument in `preferred` is taken as a parameter only while there are some left
+        required_parameters = 0
+        for index in range(start, len(received_args)):
+            arg = received_args[index]
+            if(arg[:1] == "-"):
+                for (kind, name, _) in _tokenize((arg,)):
+                    pass
+            else:
+                kind = PLAIN_ARGUMENT
+
+            if(kind == PLAIN_ARGUMENT):
+                if(self._response_files is not None and arg[:1] == "@"):
+                    continue
+                if(pending_parameters > 0 and not (required_parameters <= 0 and arg in preferred)):
+                    pending_parameters -= 1
+                    required_parameters -= 1
+                    continue
+                return index
+            if(kind == PLAIN_ARG_DELIMITER):
+                return None
+
+            pending_parameters = 0
+            option = self._flag_to_option_map.get(name) if kind == SHORT_FLAG else None
+            if(option is not None):
+                (accepts_parameter, minimum_count, maximum_count, parameter_required) = self._parameter_specs[option]
+                if(accepts_parameter):
+                    pending_parameters = len(received_args) if maximum_count is None else maximum_count
+                    required_parameters = minimum_count if parameter_required else 0
+        return None
+
+    def _expand_response_files(self, received_args: Iterable[str]) -> Iterable[str]:
+        from ._response_files import _expand_response_files
+
+        return _expand_response_files(received_args, self._response_files)
+
+    def __parse_with_statistics(self, received_args: Iterable[str], statistics: ParseStatistics) -> Tuple[Iterable[_ParsedOption], Iterable[str]]:
+        # same as parse(), but the tokens are materialized first, so that each phase can be timed separately
+        start = perf_counter()
+        tokens = list(_tokenize(received_args))
+        grouping_start = perf_counter()
+        statistics._add_time("tokenize", grouping_start - start)
+        statistics._increment("tokens", len(tokens))
+
+        (detected_options, plain_arguments, delimiter_position) = self.__process_received_tokens(tokens)
+        statistics._add_time("grouping", perf_counter() - grouping_start)
+
+        parsed_options = []
+        if(len(detected_options) > 0):
+            (parsed_options, plain_arguments) = self.__parse_detected_options(detected_options, plain_arguments, delimiter_position, statistics)
+
+        required_check_start = perf_counter()
+        self.__check_required_options(parsed_options)
+        statistics._add_time("required_check", perf_counter() - required_check_start)
+
+        return(parsed_options, plain_arguments)
+
+    def __check_required_options(self, parsed_options: Iterable[_ParsedOption]):
+        if(self._required_options):
+            supplied_options = {parsed_option.get_original_option() for parsed_option in parsed_options}
+            for required_option in self._required_options:
+                if(required_option not in supplied_options):
+                    raise InvalidOptionException(f"Mandatory option {required_option._option_flags[0]} not supplied.")
+
+    def __process_received_tokens(self, tokens: Iterable[Token]) -> Tuple[Iterable[Tuple[int, str, Iterable[str]]], Iterable[str], int]:
+        current_option = None
         current_option_parameters = []
         detected_options = []
         plain_arguments = []
-        plain_delimiter_detected = False
+        # number of plain arguments preceding "--", the unused parameters of the last option are inserted there
+        delimiter_position = None
 
-        expanded_args = self.__expand_multiflags(received_args)
+        for (kind, text, value) in tokens:
+            if(kind == PLAIN_ARGUMENT):
+                if(current_option):
+                    current_option_parameters.append(text)
+                else:
+                    plain_arguments.append(text)
+                continue
 
-        for token in expanded_args:
-            if(plain_delimiter_detected):
-                plain_arguments.append(token)
+            if(current_option):
+                detected_options.append((current_option[0], current_option[1], current_option_parameters))
+                current_option = None
+                current_option_parameters = []
+
+            if(kind == SHORT_FLAG):
+                current_option = (kind, text)
+            elif(kind == LONG_FLAG):
+                detected_options.append((kind, text, value.split(",") if value is not None else []))
             else:
-                if(self.__is_option_flag(token)):
-                    if(current_option_flag):
-                        detected_options.append((current_option_flag, current_option_parameters))
-                    if(self.__is_long_option_flag(token)):
-                        current_option_flag = token.split('=')[0]
-                        current_option_parameters = token.split('=')[1].split(',') if len(token.split('=')) >= 2 else []
-                        detected_options.append((current_option_flag, current_option_parameters))
-                        current_option_flag = ""
-                        current_option_parameters = []
-                    else:
-                        current_option_flag = token
-                        current_option_parameters = []
-                elif(self.__is_plain_arg_delimiter(token)):
-                    plain_delimiter_detected = True
-                    if(current_option_flag):
-                        detected_options.append((current_option_flag, current_option_parameters))
-                        current_option_flag = ""
-                        current_option_parameters = []
-                elif(current_option_flag):
-                    current_option_parameters.append(token)
-                else:
-                    plain_arguments.append(token)
-        
-        if(current_option_flag):
-            detected_options.append((current_option_flag, current_option_parameters))
+                delimiter_position = len(plain_arguments)
 
-        return (detected_options, plain_arguments)
+        if(current_option):
+            detected_options.append((current_option[0], current_option[1], current_option_parameters))
 
-    def __parse_detected_options(self,detected_options: Iterable[Tuple[str, Iterable[str]]], current_plain_arguments: Iterable[str]) -> Tuple[Iterable[_ParsedOption], Iterable[str]]:
+        return (detected_options, plain_arguments, len(plain_arguments) if delimiter_position is None else delimiter_position)
+
+    def __parse_detected_options(self, detected_options: Iterable[Tuple[int, str, Iterable[str]]], current_plain_arguments: Iterable[str], delimiter_position: int, statistics: Optional[ParseStatistics] = None) -> Tuple[Iterable[_ParsedOption], Iterable[str]]:
         parsed_options = []
 
-        for (flag, parameters) in detected_options[:-1]:
-            parsed_options.append(self.__parse_option(flag, parameters))
+        for (kind, name, parameters) in detected_options[:-1]:
+            parsed_options.append(self.__parse_option(kind, name, parameters, statistics))
         
-        (flag, parameters) = detected_options[-1]
-        (last_parsed_option, new_plain_arguments) = self.__parse_last_option(flag, parameters)
+        (kind, name, parameters) = detected_options[-1]
+        (last_parsed_option, new_plain_arguments) = self.__parse_last_option(kind, name, parameters, statistics)
         parsed_options.append(last_parsed_option)
-        plain_arguments = current_plain_arguments + new_plain_arguments
+        plain_arguments = current_plain_arguments[:delimiter_position] + new_plain_arguments + current_plain_arguments[delimiter_position:]
         
         return (parsed_options, plain_arguments)
 
-    def __expand_multiflags(self, args: Iterable[str]) -> Iterable[str]:
-        result = []
-        for arg in args:
-            if(self.__is_multiflag(arg)):
-                for flag in arg[1:]:
-                    result.append(f"-{flag}")
-            else:
-                result.append(arg)
-        return result
+    def __format_flag(self, kind: int, name: str) -> str:
+        return f"--{name}" if kind == LONG_FLAG else f"-{name}"
 
-    def __is_option_flag(self, token: str) -> bool:
-        return bool(re.search("^(-[A-Za-z])|(--[^ ]+)$", token))
+    def __get_option_from_flag(self, kind: int, name: str, statistics: Optional[ParseStatistics] = None) -> Union[Option, None]:
+        if(statistics is not None):
+            start = perf_counter()
 
-    def __is_multiflag(self, token: str) -> bool:
-        return bool(re.search("^-[A-Za-z]+$", token))
+        option = self._flag_to_option_map.get(name)
+        if(option is None and kind == LONG_FLAG and self._long_flag_trie is not None):
+            option = self._long_flag_trie.find(name)
 
-    def __is_long_option_flag(self, token: str) -> bool:
-        return bool(re.search("^--[^ ]+$", token))
+        if(statistics is not None):
+            statistics._add_time("lookup", perf_counter() - start)
+            if(option is not None):
+                statistics._increment("options_matched")
+        return option
 
-    def __is_plain_arg_delimiter(self, token: str) -> bool:
-        return token == "--"
-
-    def __get_option_from_flag(self, flag: str) -> Union[Option, None]:
-        flag_without_prefix = flag[2:] if flag.startswith("--") else flag[1:]
-        if(flag_without_prefix in self._flag_to_option_map):
-            return self._flag_to_option_map[flag_without_prefix]
-        else:
-            return None
-
-    def __parse_option(self, flag: str, parameters: Iterable[str]) -> _ParsedOption:
-        option = self.__get_option_from_flag(flag)
+    def __parse_option(self, kind: int, name: str, parameters: Iterable[str], statistics: Optional[ParseStatistics] = None) -> _ParsedOption:
+        option = self.__get_option_from_flag(kind, name, statistics)
         if(option):
-            parsed_parameters = option._parse_parameters(parameters)
-            return _ParsedOption(option, parsed_parameters)
+            return self.__create_parsed_option(option, parameters, statistics)
         else:
-            raise InvalidOptionException(f"{flag}: unrecognized")
+            raise InvalidOptionException(f"{self.__format_flag(kind, name)}: unrecognized")
+
+    def __create_parsed_option(self, option: Option, parameters: Iterable[str], statistics: Optional[ParseStatistics] = None) -> _ParsedOption:
+        if(self._lazy_parameters):
+            option._check_parameters(parameters)
+            return _ParsedOption(option, parameters, converted=False)
+        if(statistics is not None):
+            option._check_parameters(parameters)
+            return _ParsedOption(option, option._convert_parameters_with_statistics(parameters, statistics))
+        return _ParsedOption(option, option._parse_parameters(parameters))
 
-    def __parse_last_option(self, flag:str, parameters: Iterable[str]) -> _ParsedOption:
-        option = self.__get_option_from_flag(flag)
+    def __parse_last_option(self, kind: int, name: str, parameters: Iterable[str], statistics: Optional[ParseStatistics] = None) -> Tuple[_ParsedOption, Iterable[str]]:
+        option = self.__get_option_from_flag(kind, name, statistics)
         if(option):
-            if(self.__is_long_option_flag(flag)):
-                parsed_parameters = option._parse_parameters(parameters)
-                parsed_option = _ParsedOption(option, parsed_parameters)
+            if(kind == LONG_FLAG):
+                parsed_option = self.__create_parsed_option(option, parameters, statistics)
                 return (parsed_option, [])
             else:
-                expected_parameter_count = option._get_parameter_count()
-                if(option._accepts_parameter() and not option._is_parameter_required() and len(parameters) < expected_parameter_count):
-                    expected_parameter_count = 0
-                option_parameters = parameters[:min(len(parameters), expected_parameter_count)]
-                parsed_parameters = option._parse_parameters(option_parameters)
-                parsed_option = _ParsedOption(option, parsed_parameters)
-                if(len(parameters) >= expected_parameter_count):
-                    plain_arguments = parameters[expected_parameter_count:]
-                return (parsed_option, plain_arguments)     
+                expected_parameter_count = self.__get_last_option_parameter_count(option, parameters)
+                if(expected_parameter_count == len(parameters)):
+                    # the parameters are used as they are, not copied
+                    return (self.__create_parsed_option(option, parameters, statistics), [])
+                parsed_option = self.__create_parsed_option(option, parameters[:expected_parameter_count], statistics)
+                return (parsed_option, parameters[expected_parameter_count:])
         else:
-            raise InvalidOptionException(f"{flag}: unrecognized")
+            raise InvalidOptionException(f"{self.__format_flag(kind, name)}: unrecognized")
+
+    def __get_last_option_parameter_count(self, option: Option, parameters: Sequence[str]) -> int:
+        # number of the arguments following the last short option which are its parameters, the rest are plain arguments
+        (accepts_parameter, minimum_count, maximum_count, parameter_required) = self._parameter_specs[option]
+        # options with a variable count take every parameter up to their maximum
+        expected_parameter_count = len(parameters) if maximum_count is None else min(len(parameters), maximum_count)
+        if(accepts_parameter and not parameter_required and expected_parameter_count < minimum_count):
+            expected_parameter_count = 0
+        return expected_parameter_count
+
+    def __parse_collecting_errors(self, received_args: Iterable[str], statistics: Optional[ParseStatistics] = None) -> Tuple[Iterable[_ParsedOption], Iterable[str]]:
+        # Same grouping as __process_received_tokens() in a single pass over the arguments, but the position of every argument is kept,
+        # and errors are collected instead of raised. Every detected option is an
+        # [option, position of the flag, parameters, positions of the parameters] entry.
+        from .exceptions import InvalidArgumentsException
+
+        errors = []
+        detected_options = []
+        plain_arguments = []
+        delimiter_position = None
+        current_option = None
+        # kept after "--", which ends current_option, as the unused parameters of the last option are plain arguments
+        last_short_option = None
+        if(statistics is not None):
+            # tokenizing and lookups are timed as they happen, grouping gets the rest of the pass
+            grouping_start = perf_counter()
+            excluded_time = statistics.get_phase_time("tokenize") + statistics.get_phase_time("lookup")
+
+        arguments = enumerate(received_args)
+        for (position, arg) in arguments:
+            tokens = _tokenize((arg,)) if arg[:1] == "-" else ((PLAIN_ARGUMENT, arg, None),)
+            if(statistics is not None):
+                tokenize_start = perf_counter()
+                tokens = list(tokens)
+                statistics._add_time("tokenize", perf_counter() - tokenize_start)
+                statistics._increment("tokens", len(tokens))
+            for (kind, text, value) in tokens:
+                if(kind == PLAIN_ARGUMENT):
+                    if(current_option is not None):
+                        current_option[2].append(text)
+                        current_option[3].append(position)
+                    else:
+                        plain_arguments.append(text)
+                    continue
+
+                current_option = None
+                if(kind == PLAIN_ARG_DELIMITER):
+                    delimiter_position = len(plain_arguments)
+                    plain_arguments.extend(plain_argument for (_, plain_argument) in arguments)
+                    if(statistics is not None):
+                        statistics._increment("tokens", len(plain_arguments) - delimiter_position)
+                    break
+
+                # any later flag, even an unrecognized one, ends the last option
+                last_short_option = None
+
+                try:
+                    option = self.__get_option_from_flag(kind, text, statistics)
+                except InvalidOptionException as error:
+                    # ambiguous abbreviation
+                    errors.append((position, error))
+                    continue
+                if(option is None):
+                    errors.append((position, InvalidOptionException(f"{self.__format_flag(kind, text)}: unrecognized")))
+                    if(kind == SHORT_FLAG):
+                        # the arguments following an unrecognized flag are ignored, they are most likely its parameters
+                        current_option = [None, position, [], []]
+                elif(kind == LONG_FLAG):
+                    parameters = value.split(",") if value is not None else []
+                    detected_options.append([option, position, parameters, [position] * len(parameters)])
+                else:
+                    current_option = [option, position, [], []]
+                    last_short_option = current_option
+                    detected_options.append(current_option)
+
+        if(len(detected_options) > 0 and detected_options[-1] is last_short_option):
+            (option, _, parameters, parameter_positions) = last_short_option
+            expected_parameter_count = self.__get_last_option_parameter_count(option, parameters)
+            if(expected_parameter_count < len(parameters)):
+                if(delimiter_position is None):
+                    delimiter_position = len(plain_arguments)
+                plain_arguments[delimiter_position:delimiter_position] = parameters[expected_parameter_count:]
+                del parameters[expected_parameter_count:]
+                del parameter_positions[expected_parameter_count:]
+        if(statistics is not None):
+            excluded_time = statistics.get_phase_time("tokenize") + statistics.get_phase_time("lookup") - excluded_time
+            statistics._add_time("grouping", perf_counter() - grouping_start - excluded_time)
+
+        parsed_options = []
+        # conversion is skipped for every further occurrence of an option whose parameters could not be converted, as it would most likely fail again
+        failed_options = set()
+        for (option, position, parameters, parameter_positions) in detected_options:
+            try:
+                option._check_parameters(parameters)
+            except InvalidParameterException as error:
+                errors.append((position, error))
+                continue
+            if(option in failed_options):
+                continue
+            if(self._lazy_parameters):
+                parsed_options.append(_ParsedOption(option, parameters, converted=False))
+                continue
+
+            converted_parameters = []
+            for (parameter, parameter_position) in zip(parameters, parameter_positions):
+                try:
+                    if(statistics is None):
+                        converted_parameters.append(option._parameter_converter(parameter))
+                    else:
+                        converted_parameters.append(option._convert_parameter_with_statistics(parameter, statistics))
+                except InvalidParameterException as error:
+                    errors.append((parameter_position, error))
+                    failed_options.add(option)
+                    break
+            else:
+                parsed_options.append(_ParsedOption(option, option._combine_parameters(converted_parameters)))
+
+        if(self._required_options):
+            if(statistics is not None):
+                required_check_start = perf_counter()
+            # options supplied with invalid parameters are not reported as missing
+            supplied_options = {detected_option[0] for detected_option in detected_options}
+            for required_option in self._required_options:
+                if(required_option not in supplied_options):
+                    errors.append((None, InvalidOptionException(f"Mandatory option {required_option._option_flags[0]} not supplied.")))
+            if(statistics is not None):
+                statistics._add_time("required_check", perf_counter() - required_check_start)
+
+        if(errors):
+            errors.sort(key=lambda error: (error[0] is None, error[0] or 0))
+            raise InvalidArgumentsException(errors)
+        return (parsed_options, plain_arguments)
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from itertools import chain, islice
+
+class _PlainArguments:
+    __slots__ = ("_arguments", "_spans", "_decode")
+
+    def __init__(self, arguments: List[str], spans: Iterable[Tuple[Sequence[Any], int, int]], decode: Optional[Callable[[Any], str]] = None):
+        """Plain arguments made of `arguments` followed by the `(sequence, start, stop)` spans, which are ranges of the received
+        argument list. The spans are not copied, so they reflect later modifications of that list.
+        If `decode` is supplied, it is applied to the arguments of the spans (e.g. raw `bytes`) when they are iterated over."""
+        self._arguments = arguments
+        self._spans = tuple(span for span in spans if span[1] < span[2])
+        self._decode = decode
+
+    def __iter__(self) -> Iterator[str]:
+        if(not self._spans):
+            return iter(self._arguments)
+        span_iterators = [islice(sequence, start, stop) for (sequence, start, stop) in self._spans]
+        if(self._decode is not None):
+            span_iterators = [map(self._decode, span_iterator) for span_iterator in span_iterators]
+        return chain(self._arguments, *span_iterators)
+
+    def __len__(self) -> int:
+        return len(self._arguments) + sum(stop - start for (_, start, stop) in self._spans)
+
+    def to_list(self) -> List[str]:
+        return list(self)
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Iterable, Iterator
+
+import os
+import sys
+
+from .exceptions import InvalidOptionException
+
+# Size of the blocks read from response files which cannot be memory-mapped (e.g. pipes).
+_READ_BLOCK_SIZE = 1 << 20
+
+def _expand_response_files(args: Iterable[str], file_format: str) -> Iterator[str]:
+    """Yields the received arguments, with every `@path` argument replaced by the arguments read from the file at `path`.
+    Files are read lazily, one argument at a time, so their size does not affect memory usage.
+    Arguments following `--` are not expanded."""
+    return _ResponseFileExpander(file_format).expand(args)
+
+class _ResponseFileExpander:
+    def __init__(self, file_format: str):
+        self._file_format = file_format
+        # real paths of the files being read, outermost first
+        self._open_files = []
+        self._after_delimiter = False
+
+    def expand(self, args: Iterable[str]) -> Iterator[str]:
+        for arg in args:
+            if(self._after_delimiter or len(arg) < 2 or arg[0] != "@"):
+                if(arg == "--"):
+                    self._after_delimiter = True
+                yield arg
+                continue
+
+            path = arg[1:]
+            real_path = os.path.realpath(path)
+            if(real_path in self._open_files):
+                raise InvalidOptionException(f"{arg}: response file includes itself")
+
+            self._open_files.append(real_path)
+            yield from self.expand(_read_arguments(path, self._file_format))
+            self._open_files.pop()
+
+def _read_arguments(path: str, file_format: str) -> Iterator[str]:
+    try:
+        response_file = open(path, "rb")
+    except OSError as error:
+        raise InvalidOptionException(f"@{path}: cannot read response file ({error.strerror})")
+
+    with response_file:
+        if(file_format == "shell"):
+            yield from _split_shell_arguments(path, response_file)
+            return
+
+        separator = b"\0" if file_format == "null" else b"\n"
+        for record in _split_records(response_file, separator):
+            if(file_format == "lines"):
+                record = record[:-1] if record.endswith(b"\r") else record
+                if(not record):
+                    continue
+            yield os.fsdecode(record)
+
+def _split_records(response_file, separator: bytes) -> Iterator[bytes]:
+    import mmap
+
+    try:
+        size = os.fstat(response_file.fileno()).st_size
+        mapped_file = mmap.mmap(response_file.fileno(), 0, access=mmap.ACCESS_READ) if size > 0 else None
+    except (OSError, ValueError):
+        yield from _split_blocks(response_file, separator)
+        return
+
+    if(mapped_file is None):
+        # empty regular files cannot be mapped, but special files report a size of 0 as well
+        yield from _split_blocks(response_file, separator)
+        return
+
+    with mapped_file:
+        start = 0
+        while(start < size):
+            end = mapped_file.find(separator, start)
+            if(end == -1):
+                end = size
+            yield mapped_file[start:end]
+            start = end + 1
+
+def _split_blocks(response_file, separator: bytes) -> Iterator[bytes]:
+    remainder = b""
+    while(True):
+        block = response_file.read(_READ_BLOCK_SIZE)
+        if(not block):
+            break
+        records = (remainder + block).split(separator)
+        remainder = records.pop()
+        yield from records
+    if(remainder):
+        yield remainder
+
+def _split_shell_arguments(path: str, response_file) -> Iterator[str]:
+    import io
+    import shlex
+
+    lexer = shlex.shlex(io.TextIOWrapper(response_file, encoding=sys.getfilesystemencoding(), errors="surrogateescape"), posix=True)
+    lexer.whitespace_split = True
+    lexer.commenters = ""
+    try:
+        yield from lexer
+    except ValueError as error:
+        raise InvalidOptionException(f"@{path}: invalid response file ({error})")
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Callable, Union
+    from .option_parser import OptionParser
+
+import sys
+from _thread import RLock
+from .exceptions import InvalidConfigurationException
+
+# Makes sure that the factory of a subcommand selected by several threads at once is only called once.
+# Reentrant, since factories may create the parsers of nested subcommands.
+_creation_lock = RLock()
+
+class _Subcommand:
+    __slots__ = ("_name", "_factory", "_description", "_parser")
+
+    def __init__(self, name: str, factory: Union[Callable[[], OptionParser], str], description: str):
+        """Subcommand whose parser is created by `factory` on the first call to `get_parser()`. `factory` is either
+        a callable or a `"module:function"` string, in which case the module is imported only then."""
+        self._name = name
+        self._factory = factory
+        self._description = description
+        self._parser = None
+
+    def get_name(self) -> str:
+        return self._name
+
+    def get_description(self) -> str:
+        return self._description
+
+    def get_factory(self) -> Union[Callable[[], OptionParser], str]:
+        return self._factory
+
+    def get_parser(self) -> OptionParser:
+        parser = self._parser
+        if(parser is None):
+            with _creation_lock:
+                parser = self._parser
+                if(parser is None):
+                    from .option_parser import OptionParser
+
+                    parser = self.__resolve_factory()()
+                    if(not isinstance(parser, OptionParser)):
+                        raise InvalidConfigurationException(f"Factory of subcommand '{self._name}' did not return an OptionParser.")
+                    self._parser = parser
+        return parser
+
+    def __resolve_factory(self) -> Callable[[], OptionParser]:
+        if(not isinstance(self._factory, str)):
+            return self._factory
+
+        (module, _, qualified_name) = self._factory.partition(":")
+        try:
+            if(module not in sys.modules):
+                __import__(module)
+            factory = sys.modules[module]
+            for name in qualified_name.split("."):
+                factory = getattr(factory, name)
+        except (ImportError, AttributeError) as error:
+            raise InvalidConfigurationException(f"Cannot load factory of subcommand '{self._name}': {error}") from error
+        return factory
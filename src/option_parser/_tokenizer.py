@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Iterable, Iterator, Optional, Tuple
+
+    Token = Tuple[int, str, Optional[str]]
+
+SHORT_FLAG = 0
+LONG_FLAG = 1
+PLAIN_ARG_DELIMITER = 2
+PLAIN_ARGUMENT = 3
+
+_ASCII_LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+
+def _tokenize(args: Iterable[str]) -> Iterator[Token]:
+    """Classifies every received argument in a single pass, without regular expressions.
+
+    Yields `(kind, text, value)` tuples:
+    * `SHORT_FLAG` - `text` is the flag without its `-` prefix, multiflags (`-abc`) yield one token per letter
+    * `LONG_FLAG` - `text` is the flag without its `--` prefix, `value` is the raw string after the first `=`, or `None` if there is no `=`
+    * `PLAIN_ARG_DELIMITER` - the `--` token, every following argument is yielded as a plain argument
+    * `PLAIN_ARGUMENT` - `text` is the argument itself
+    """
+    iterator = iter(args)
+    for token in iterator:
+        if(token[:1] != "-"):
+            yield (PLAIN_ARGUMENT, token, None)
+            continue
+
+        second = token[1:2]
+        if(second == "-"):
+            if(len(token) == 2):
+                yield (PLAIN_ARG_DELIMITER, token, None)
+                for plain_argument in iterator:
+                    yield (PLAIN_ARGUMENT, plain_argument, None)
+                return
+            if(" " in token):
+                yield (PLAIN_ARGUMENT, token, None)
+                continue
+            (name, separator, value) = token[2:].partition("=")
+            yield (LONG_FLAG, name, value if separator else None)
+        elif(second and second in _ASCII_LETTERS):
+            name = token[1:]
+            if(len(name) > 1 and not name.strip(_ASCII_LETTERS)):
+                for letter in name:
+                    yield (SHORT_FLAG, letter, None)
+            else:
+                yield (SHORT_FLAG, name, None)
+        else:
+            yield (PLAIN_ARGUMENT, token, None)
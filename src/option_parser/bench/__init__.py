@@ -0,0 +1,13 @@
+"""
+Benchmark suite for the option_parser parsing pipeline. Run it with:
+
+```
+python -m option_parser.bench [--quick] [--output=results.json] [--group=parse]
+```
+
+The suite measures import time, `option_parser.OptionParser.add_options()`, parsing throughput, parameter conversion and help page rendering
+across a matrix of option counts, argument list lengths, flag styles and parameter types. The results are written as JSON, so they can be stored
+and compared between versions to track regressions.
+"""
+
+from .suite import BENCHMARK_GROUPS, run_benchmarks
@@ -0,0 +1,39 @@
+import json
+import sys
+
+from ..option import Option
+from ..option_parser import OptionParser
+from .suite import BENCHMARK_GROUPS, run_benchmarks
+
+def main():
+    parser = OptionParser("Runs the option_parser benchmark suite and prints the results as JSON.")
+
+    quick_option = Option("q", "quick")
+    quick_option.set_description("Use a reduced matrix of option counts and argument list lengths.")
+
+    output_option = Option("o", "output")
+    output_option.set_description("Write the results to FILE instead of standard output.")
+    output_option.set_parameter_settings(required=True, metavar="FILE")
+
+    def is_benchmark_group(group):
+        return group in BENCHMARK_GROUPS
+
+    group_option = Option("g", "group")
+    group_option.set_description(f"Run only the given benchmark group, one of: {', '.join(BENCHMARK_GROUPS)}.")
+    group_option.set_parameter_settings(required=True, metavar="GROUP", validator=is_benchmark_group)
+
+    parser.add_options(quick_option, output_option, group_option)
+    options = parser.parse()
+
+    groups = [options.get_option_parameter(group_option)] if options.is_set(group_option) else None
+    results = run_benchmarks(groups, quick=options.is_set(quick_option))
+
+    if(options.is_set(output_option)):
+        with open(options.get_option_parameter(output_option), "w") as output_file:
+            json.dump(results, output_file, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+import os
+import platform
+import subprocess
+import sys
+import time
+
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from ..option import Option
+from ..option_parser import OptionParser
+
+OPTION_COUNTS = (10, 100, 1000, 10000)
+ARGV_LENGTHS = (1, 100, 10000, 1000000)
+QUICK_OPTION_COUNTS = (10, 1000)
+QUICK_ARGV_LENGTHS = (1, 1000)
+FLAG_STYLES = ("short", "long", "multiflag")
+PARAMETER_KINDS = ("none", "str", "validated_int")
+
+_SHORT_KEYS = "abcdefgijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ" # without h, reserved by help option
+_MIN_MEASURED_TIME = 0.2
+_MAX_REPEAT = 1000
+
+def _is_non_negative(number: int) -> bool:
+    return number >= 0
+
+def create_options(option_count: int, parameter_kind: str) -> List[Option]:
+    """Creates `option_count` options, the first ones having both a short and a long key, the others a long key only."""
+    options = []
+    for index in range(option_count):
+        keys = (_SHORT_KEYS[index], f"option-{index}") if index < len(_SHORT_KEYS) else (f"option-{index}",)
+        option = Option(*keys)
+        option.set_description(f"Generated option number {index}")
+        if(parameter_kind == "str"):
+            option.set_parameter_settings(required=True, metavar="VALUE")
+        elif(parameter_kind == "validated_int"):
+            option.set_parameter_settings(parameter_type=int, required=True, metavar="NUMBER", validator=_is_non_negative)
+        options.append(option)
+    return options
+
+def create_parser(option_count: int, parameter_kind: str) -> OptionParser:
+    parser = OptionParser("Generated benchmark parser", throw_on_error=True)
+    parser.add_options(*create_options(option_count, parameter_kind))
+    return parser
+
+def create_argv(length: int, option_count: int, style: str, parameter_kind: str) -> List[str]:
+    """Creates an argument list of `length` tokens using options created by `create_options()`."""
+    argv = []
+    short_option_count = min(option_count, len(_SHORT_KEYS))
+    has_parameter = parameter_kind != "none"
+    index = 0
+    while(len(argv) < length):
+        if(style == "long"):
+            argv.append(f"--option-{index % option_count}=1" if has_parameter else f"--option-{index % option_count}")
+        elif(style == "short" or has_parameter):
+            argv.append(f"-{_SHORT_KEYS[index % short_option_count]}")
+            if(has_parameter):
+                argv.append("1")
+        else:
+            argv.append("-" + "".join(_SHORT_KEYS[(index + offset) % short_option_count] for offset in range(4)))
+        index += 1
+    return argv[:length] if not has_parameter else argv
+
+def measure(function: Callable[[], Any]) -> Dict[str, Any]:
+    """Calls `function` repeatedly for at least `_MIN_MEASURED_TIME` seconds and reports the fastest call."""
+    timings = []
+    total_time = 0.0
+    while(not timings or (total_time < _MIN_MEASURED_TIME and len(timings) < _MAX_REPEAT)):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+        total_time += timings[-1]
+    return {"best": min(timings), "mean": total_time / len(timings), "repeat": len(timings)}
+
+def benchmark_import() -> Iterator[Dict[str, Any]]:
+    package_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    environment = dict(os.environ, PYTHONPATH=package_root)
+    code = "import time; start = time.perf_counter(); import option_parser; from option_parser import OptionParser, Option; print(time.perf_counter() - start)"
+
+    timings = []
+    for _ in range(10):
+        output = subprocess.run([sys.executable, "-c", code], env=environment, capture_output=True, text=True, check=True).stdout
+        timings.append(float(output))
+    yield {"benchmark": "import", "parameters": {}, "best": min(timings), "mean": sum(timings) / len(timings), "repeat": len(timings)}
+
+def benchmark_add_options(option_counts: Iterable[int]) -> Iterator[Dict[str, Any]]:
+    for option_count in option_counts:
+        options = create_options(option_count, "none")
+
+        def add_options():
+            OptionParser().add_options(*options)
+
+        yield {"benchmark": "add_options", "parameters": {"option_count": option_count}, **measure(add_options)}
+
+def benchmark_parse(option_counts: Iterable[int], argv_lengths: Iterable[int]) -> Iterator[Dict[str, Any]]:
+    for parameter_kind in PARAMETER_KINDS:
+        for option_count in option_counts:
+            parser = create_parser(option_count, parameter_kind)
+            parser.compile()
+            compiled_parser = parser._compiled_parser
+            for style in FLAG_STYLES:
+                if(style == "multiflag" and parameter_kind != "none"):
+                    continue
+                for argv_length in argv_lengths:
+                    argv = create_argv(argv_length, option_count, style, parameter_kind)
+                    result = measure(lambda: compiled_parser.parse(argv))
+                    result["tokens_per_second"] = len(argv) / result["best"]
+                    yield {
+                        "benchmark": "parse",
+                        "parameters": {"option_count": option_count, "argv_length": len(argv), "style": style, "parameter_kind": parameter_kind},
+                        **result
+                    }
+
+def benchmark_parse_parameters() -> Iterator[Dict[str, Any]]:
+    for parameter_kind in PARAMETER_KINDS[1:]:
+        option = create_options(1, parameter_kind)[0]
+        parameters = ["1"]
+
+        def parse_parameters():
+            for _ in range(1000):
+                option._parse_parameters(parameters)
+
+        result = measure(parse_parameters)
+        result["calls_per_measurement"] = 1000
+        yield {"benchmark": "parse_parameters", "parameters": {"parameter_kind": parameter_kind}, **result}
+
+def benchmark_get_help(option_counts: Iterable[int]) -> Iterator[Dict[str, Any]]:
+    for option_count in option_counts:
+        parser = create_parser(option_count, "str")
+        parser.compile()
+
+        def render_help():
+            parser._compiled_parser._help_texts.clear()
+            parser._help_fragments.clear()
+            parser.get_help()
+
+        yield {"benchmark": "get_help", "parameters": {"option_count": option_count, "cached": False}, **measure(render_help)}
+        yield {"benchmark": "get_help", "parameters": {"option_count": option_count, "cached": True}, **measure(parser.get_help)}
+
+BENCHMARK_GROUPS = ("import", "add_options", "parse", "parse_parameters", "get_help")
+
+def run_benchmarks(groups: Optional[Iterable[str]] = None, quick: bool = False) -> Dict[str, Any]:
+    """Runs the selected benchmark groups (all by default) and returns the results as a JSON-serializable dictionary.
+
+    ## Parameters
+    * `groups` - names of benchmark groups to run, from `BENCHMARK_GROUPS`
+    * `quick` - if `True`, a reduced matrix of option counts and argument list lengths is used
+    """
+    groups = BENCHMARK_GROUPS if groups is None else tuple(groups)
+    option_counts = QUICK_OPTION_COUNTS if quick else OPTION_COUNTS
+    argv_lengths = QUICK_ARGV_LENGTHS if quick else ARGV_LENGTHS
+
+    benchmarks = {
+        "import": lambda: benchmark_import(),
+        "add_options": lambda: benchmark_add_options(option_counts),
+        "parse": lambda: benchmark_parse(option_counts, argv_lengths),
+        "parse_parameters": lambda: benchmark_parse_parameters(),
+        "get_help": lambda: benchmark_get_help(option_counts),
+    }
+
+    results = []
+    for group in groups:
+        results.extend(benchmarks[group]())
+
+    return {
+        "metadata": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "timestamp": time.time(),
+            "quick": quick,
+        },
+        "results": results,
+    }
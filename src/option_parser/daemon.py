@@ -0,0 +1,292 @@
+"""
+Daemon keeping parsers in memory, so that programs which only need parsed options, completions or help pages (e.g. shell wrapper scripts)
+do not have to start Python and create a large `option_parser.OptionParser` every time.
+
+Parsers are named by definitions of the form `"path/to/file.py:function"` or `"package.module:function"`, where the function creates
+and returns the parser. The daemon calls the function on the first request for a definition, and again whenever the file defining it changes.
+
+The daemon is started with:
+
+```
+python -m option_parser.daemon serve [socket path]
+```
+
+and requests are sent with `request()`, or from the command-line with:
+
+```
+python -m option_parser.daemon parse|complete|help DEFINITION [arguments...]
+```
+
+which prints the parse result as JSON, the completion candidates one per line, or the help page. If no daemon is running,
+requests are answered in the requesting process instead, so the client never fails just because the daemon is not running.
+
+Requests and responses are dictionaries serialized with `marshal`, one per connection. The client does not import anything
+which is not already loaded at interpreter startup (the output is rendered by the daemon), so its latency is close to that of starting Python.
+Wrapper scripts can cut that further with a client shim, a standalone script which runs Python without the `site` module and behaves like
+`python -m option_parser.daemon` (which it runs if no daemon is listening):
+
+```
+python -m option_parser.daemon shim > ~/bin/option-parser-client && chmod +x ~/bin/option-parser-client
+option-parser-client parse path/to/cli.py:create_parser --verbose file
+```
+
+The socket is only accessible to the user running the daemon, since the daemon runs the code of any definition it is sent,
+and clients only connect to sockets owned by the user running them, since the temporary directory is shared with other users.
+Its path defaults to the `OPTION_PARSER_SOCKET` environment variable if set, otherwise `option_parser.sock` in `$XDG_RUNTIME_DIR`
+or the temporary directory.
+"""
+
+from __future__ import annotations
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Dict, Iterable, List, Optional
+
+import marshal
+import os
+import sys
+
+_ACTIONS = ("parse", "complete", "help")
+
+_CLIENT_SHIM_SOURCE = '''#!{interpreter} -S
+# Client of the option_parser daemon, generated by `python -m option_parser.daemon shim`.
+# Only built-in modules are used, and the site module is skipped, so this starts faster than `python -m option_parser.daemon`,
+# which runs instead if no daemon is listening.
+import _socket
+import marshal
+import os
+import stat
+import sys
+
+def run_full_client():
+    os.execv({executable}, [{executable}, "-m", "option_parser.daemon", *sys.argv[1:]])
+
+def main():
+    arguments = sys.argv[1:]
+    if(len(arguments) < 2 or arguments[0] not in {actions}):
+        run_full_client()
+    (location, separator, function_name) = arguments[1].rpartition(":")
+    if(location.endswith(".py") or os.sep in location):
+        arguments[1] = os.path.abspath(location) + separator + function_name
+
+    socket_path = os.environ.get("OPTION_PARSER_SOCKET") or {socket_path}
+    try:
+        status = os.lstat(socket_path)
+    except OSError:
+        run_full_client()
+    # a socket created by another user could be answered with anything
+    if(not stat.S_ISSOCK(status.st_mode) or status.st_uid != os.getuid()):
+        run_full_client()
+    connection = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+    connection.settimeout(10)
+    try:
+        connection.connect(socket_path)
+    except (FileNotFoundError, ConnectionRefusedError):
+        run_full_client()
+    message = {"action": arguments[0], "definition": arguments[1], "arguments": arguments[2:], "width": None, "text": True}
+    connection.sendall(marshal.dumps(message))
+    connection.shutdown(_socket.SHUT_WR)
+    chunks = []
+    while(True):
+        chunk = connection.recv(1 << 16)
+        if(not chunk):
+            break
+        chunks.append(chunk)
+    response = marshal.loads(b"".join(chunks))
+    if("error" in response):
+        sys.stderr.write("Error: " + response["error"] + "\\n")
+        sys.exit(1)
+    sys.stdout.write(response["result"])
+
+main()
+'''
+
+def get_default_socket_path() -> str:
+    """Returns the socket path used when none is supplied.
+
+    ## Returns
+    The value of the `OPTION_PARSER_SOCKET` environment variable if set, otherwise `option_parser.sock` in `$XDG_RUNTIME_DIR`
+    (or in the temporary directory, with the user id in its name).
+    """
+    socket_path = os.environ.get("OPTION_PARSER_SOCKET")
+    if(socket_path):
+        return socket_path
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if(runtime_dir):
+        return os.path.join(runtime_dir, "option_parser.sock")
+    import tempfile
+
+    return os.path.join(tempfile.gettempdir(), f"option_parser-{os.getuid()}.sock")
+
+def request(action: str, definition: str, arguments: Iterable[str] = (), width: Optional[int] = None, socket_path: Optional[str] = None, timeout: Optional[float] = 10) -> Any:
+    """Sends a request to the daemon, or handles it in this process if no daemon is listening on the socket.
+
+    ## Parameters
+    * `action` - `"parse"`, `"complete"` or `"help"`.
+    * `definition` - `"path/to/file.py:function"` or `"package.module:function"`, naming a function which creates the parser.
+    * `arguments` - arguments to parse or complete, without the program name.
+    * `width` - width of the help page, as in `option_parser.OptionParser`'s `get_help()`.
+    * `socket_path` - path of the daemon's socket, defaults to `get_default_socket_path()`.
+    * `timeout` - seconds to wait for the daemon's response.
+
+    ## Raises
+    * `option_parser.exceptions.InvalidOptionException` - if the arguments contain an unrecognized option, or a required option is missing.
+    * `option_parser.exceptions.InvalidParameterException` - if an option received invalid parameters.
+    * `option_parser.exceptions.InvalidArgumentsException` - instead of the two above, if the parser was created with `collect_errors=True`.
+    * `option_parser.exceptions.InvalidConfigurationException` - if the definition cannot be loaded, or the request is invalid.
+
+    ## Returns
+    For `"parse"`, a dictionary with the parameters of the supplied options by their first flag in `"options"` (`None` for options which received no parameters,
+    the list of occurrences or their number for options with the `"append"` or `"count"` action),
+    the `"plain_arguments"`, and the selected `"subcommand"` (`None` or a dictionary with its `"name"`, `"options"` and `"plain_arguments"`).
+    Parameters which are not JSON values are converted to strings by the daemon.
+    For `"complete"`, the list of candidates. For `"help"`, the help page.
+    """
+    message = {"action": action, "definition": _get_absolute_definition(definition), "arguments": list(arguments), "width": width, "text": False}
+    return _unpack_response(_send(message, socket_path, timeout))
+
+def get_client_shim(socket_path: Optional[str] = None) -> str:
+    """Returns the source of a client shim, a standalone Python script which sends a request to the daemon like
+    `python -m option_parser.daemon parse|complete|help DEFINITION [arguments...]` does, but starts faster.
+    The shim runs `python -m option_parser.daemon` with the same arguments if no daemon is listening.
+
+    ## Parameters
+    * `socket_path` - path of the daemon's socket, used by the shim if the `OPTION_PARSER_SOCKET` environment variable is not set.
+      Defaults to `get_default_socket_path()`.
+
+    ## Returns
+    The source of the shim, which starts with a `#!` line running the current Python interpreter.
+    """
+    return (_CLIENT_SHIM_SOURCE
+        .replace("{interpreter}", sys.executable)
+        .replace("{executable}", repr(sys.executable))
+        .replace("{actions}", repr(_ACTIONS))
+        .replace("{socket_path}", repr(socket_path or get_default_socket_path())))
+
+def serve(socket_path: Optional[str] = None):
+    """Runs the daemon until the process is interrupted.
+
+    ## Parameters
+    * `socket_path` - path of the socket to listen on, defaults to `get_default_socket_path()`.
+
+    ## Raises
+    * `OSError` - if another daemon is already listening on the socket, the path exists and is not a socket owned by the current user,
+      or the socket cannot be created.
+    """
+    from ._daemon_server import ParserDaemon
+
+    with ParserDaemon(socket_path) as daemon:
+        try:
+            daemon.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+def main(argv: Optional[List[str]] = None):
+    """Command-line interface of the daemon and its client, see the module description."""
+    argv = sys.argv[1:] if argv is None else argv
+    if(len(argv) >= 1 and argv[0] == "serve" and len(argv) <= 2):
+        import signal
+
+        # exit normally on SIGTERM as well, so that the socket file is removed
+        signal.signal(signal.SIGTERM, lambda signal_number, frame: sys.exit(0))
+        try:
+            serve(argv[1] if len(argv) == 2 else None)
+        except OSError as error:
+            sys.stderr.write(f"Error: {error}\n")
+            sys.exit(1)
+        return
+    if(len(argv) >= 1 and argv[0] == "shim" and len(argv) <= 2):
+        sys.stdout.write(get_client_shim(argv[1] if len(argv) == 2 else None))
+        return
+    if(len(argv) < 2 or argv[0] not in _ACTIONS):
+        sys.stderr.write("usage: python -m option_parser.daemon serve [socket path]\n"
+                         "       python -m option_parser.daemon shim [socket path]\n"
+                         "       python -m option_parser.daemon parse|complete|help DEFINITION [arguments...]\n")
+        sys.exit(2)
+
+    # the daemon renders the output, so that the client does not have to import json
+    message = {"action": argv[0], "definition": _get_absolute_definition(argv[1]), "arguments": argv[2:], "width": None, "text": True}
+    response = _send(message, None, 10)
+    if("error" in response):
+        sys.stderr.write(f"Error: {response['error']}\n")
+        sys.exit(1)
+    sys.stdout.write(response["result"])
+
+def _get_absolute_definition(definition: str) -> str:
+    (location, separator, function_name) = definition.rpartition(":")
+    if(location.endswith(".py") or os.sep in location):
+        # the daemon may run in another directory
+        return f"{os.path.abspath(location)}{separator}{function_name}"
+    return definition
+
+def _send(message: Dict[str, Any], socket_path: Optional[str], timeout: Optional[float]) -> Dict[str, Any]:
+    # _socket is the built-in part of the socket module, which would import enum, selectors, etc.
+    try:
+        import _socket
+        connection = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+    except (ImportError, AttributeError, OSError):
+        # no Unix domain sockets on this platform
+        return _handle_in_process(message)
+
+    try:
+        socket_path = socket_path or get_default_socket_path()
+        if(not _is_own_socket(socket_path)):
+            return _handle_in_process(message)
+        connection.settimeout(timeout)
+        try:
+            connection.connect(socket_path)
+        except (FileNotFoundError, ConnectionRefusedError):
+            return _handle_in_process(message)
+        connection.sendall(marshal.dumps(message))
+        connection.shutdown(_socket.SHUT_WR)
+        chunks = []
+        while(True):
+            chunk = connection.recv(1 << 16)
+            if(not chunk):
+                break
+            chunks.append(chunk)
+        return marshal.loads(b"".join(chunks))
+    finally:
+        connection.close()
+
+def _is_own_socket(socket_path: str) -> bool:
+    # a socket created by another user (e.g. in the shared temporary directory) could be answered with anything
+    import stat
+
+    try:
+        status = os.lstat(socket_path)
+    except OSError:
+        return False
+    return stat.S_ISSOCK(status.st_mode) and status.st_uid == os.getuid()
+
+def _handle_in_process(message: Dict[str, Any]) -> Dict[str, Any]:
+    from ._daemon_server import _handle_request
+
+    return _handle_request(message)
+
+def _unpack_response(response: Dict[str, Any]) -> Any:
+    if("error" not in response):
+        return response["result"]
+    from . import exceptions
+
+    if("errors" in response):
+        raise exceptions.InvalidArgumentsException([(position, _get_exception_type(type_name)(error)) for (position, type_name, error) in response["errors"]])
+    raise _get_exception_type(response["type"])(response["error"])
+
+def _get_exception_type(type_name: str) -> type:
+    from . import exceptions
+
+    exception_type = getattr(exceptions, type_name, None)
+    if(not isinstance(exception_type, type) or not issubclass(exception_type, exceptions.OptionParserException) or exception_type is exceptions.InvalidArgumentsException):
+        exception_type = exceptions.OptionParserException
+    return exception_type
+
+def __getattr__(name):
+    # the server class is only imported by the daemon, not by clients
+    if(name == "ParserDaemon"):
+        from ._daemon_server import ParserDaemon
+        return ParserDaemon
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+if __name__ == "__main__":
+    main()
@@ -9,3 +9,29 @@ class InvalidParameterException(OptionParserException):
 
 class InvalidOptionException(OptionParserException):
     """Raised when a mandatory option is missing or an unknown option is encountered."""
+
+class InvalidArgumentsException(OptionParserException):
+    """Raised instead of the first error by parsers created with `collect_errors=True`, and contains every error found in the arguments.
+    The message lists all of them, prefixed by the (1-based) number of the argument which caused them, e.g. `argument 3: --colour: unrecognized`."""
+
+    def __init__(self, errors):
+        """## Parameters
+        * `errors` - `(position, exception)` pairs, see `get_errors()`.
+        """
+        super().__init__(list(errors))
+
+    def get_errors(self):
+        """Returns the collected errors, ordered by position.
+
+        ## Returns
+        A list of `(position, exception)` pairs, where `exception` is an `InvalidOptionException` or `InvalidParameterException`, and `position`
+        is the index of the argument which caused it in the parsed argument list (after response file expansion, without the program name),
+        or `None` for errors not caused by a single argument, i.e. missing mandatory options.
+        """
+        return self.args[0]
+
+    def __str__(self) -> str:
+        lines = [str(error) if position is None else f"argument {position + 1}: {error}" for (position, error) in self.get_errors()]
+        if(len(lines) == 1):
+            return lines[0]
+        return f"{len(lines)} errors:\n" + "\n".join(lines)
@@ -1,9 +1,19 @@
-import re
+from __future__ import annotations
 
-from typing import Callable, Iterable, Any, Union
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Callable, Iterable, Any, Optional, Tuple, Union
+    from .option_parser import OptionParser
+    from .parse_statistics import ParseStatistics
+
+from time import perf_counter
+from _weakref import ref
 from ._parameter_settings import _ParameterSettings
 from .exceptions import InvalidConfigurationException, InvalidParameterException
 
+_ASCII_LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+_ACTIONS = ("store", "append", "count")
+
 class Option:
     def __init__(self, option_key: str, *args: str):
         """Represents a single option supported by the parser. One option may have multiple keys by which it is accessed in the command-line.
@@ -27,10 +37,15 @@ class Option:
         self._description = ""
         self._required = False
         self._parameter = None
+        self._parameter_converter = None
         self._option_flags = []
+        self._revision = 0
+        self._action = "store"
+        # weak references to the parsers the option was added to, whose compiled parse plans are invalidated when it is reconfigured
+        self._parsers = []
 
         for flag in tuple([option_key]) + args:
-            if(re.search("^[A-Za-z]$", flag) == None and re.search("^[^ ][^ ]+$", flag) == None):
+            if(not (len(flag) == 1 and flag in _ASCII_LETTERS) and not (len(flag) > 1 and " " not in flag)):
                 raise InvalidConfigurationException(f"Invalid option key format: {flag}")
 
             self._option_flags.append(flag)
@@ -42,12 +57,14 @@ class Option:
         * `description` - option description to display
         """
         self._description = description
+        self.__mark_as_changed()
   
     def set_as_required(self):
         """Makes the option mandatory (is optional by default)."""
         self._required = True
+        self.__mark_as_changed()
 
-    def set_parameter_settings(self, parameter_type=str, required=False, metavar='', parameter_count=1, validator: Callable[[Any], bool] = None):
+    def set_parameter_settings(self, parameter_type=str, required=False, metavar='', parameter_count=1, validator: Callable[[Any], bool] = None, cache_size=0):
         """Changes option's parameter settings. Options do not accept parameters by default, meaning a call to this method will enable parameter support
         for the given option. Parameters are then configured with this method's arguments.
         Multiple calls to this method change the parameter settings, deleting the configuration set by the previous call.
@@ -57,13 +74,90 @@ class Option:
         * `required` - whether the parameter is required or not. False by default.
         * `metavar` - parameter placeholder to be displayed in the help page. Empty by default.
         * `parameter_count` - how many parameters are expected to follow the option key. If the option key is a short key, then such parameters are separated by space,
-        e.g. `program.py -o 1 2 3`. Long option keys are followed by an equals sign and multiple parameters are separated by commas, e.g. `program.py --option=1,2,3`
+        e.g. `program.py -o 1 2 3`. Long option keys are followed by an equals sign and multiple parameters are separated by commas, e.g. `program.py --option=1,2,3`.
+        Either an `int`, or a variable count: `"*"` (any number), `"+"` (at least one) or a `(minimum, maximum)` tuple, where `maximum` may be `None` for no limit.
+        An option with a variable count takes every argument which follows it up to the next option, `--` or `maximum`,
+        and its parameters are always returned as a list.
         * `validator` - callback function receiving each supplied parameter already parsed as `parameter_type`, and returning a `bool`
         representing whether the parameter has been validated successfully.
         If this callback returns `False`, then parsing stops and error handling is invoked.
+        * `cache_size` - how many distinct parameter values to remember the converted and validated result for. When a remembered value is received again,
+        neither `parameter_type` nor `validator` is called. Should only be enabled if both are pure functions of the received string. 0 (disabled) by default.
+
+        ## Raises
+        * `option_parser.exceptions.InvalidConfigurationException` - if `parameter_count` is not one of the above.
+        """
+        self._parameter = _ParameterSettings(parameter_type, required, metavar, parameter_count, validator, cache_size)
+        self.__create_parameter_converter()
+        self.__mark_as_changed()
+
+    def set_action(self, action: str):
+        """Sets what is kept when the option is supplied more than once, e.g. `-I a -I b` or `-v -v -v`.
+
+        * `"store"` (default) - the parameters of the last occurrence are kept.
+        * `"append"` - the parameters of every occurrence are kept, in order. `option_parser.processed_options.ProcessedOptions`'s
+        `get_option_parameter()` and `get_all()` return a list with one item per occurrence, each as `get_option_parameter()` would return it for a single occurrence.
+        * `"count"` - only the number of occurrences is kept, and returned by `get_option_parameter()` and `get_count()`. Parameters are still checked, but not kept.
+
+        ## Parameters
+        * `action` - `"store"`, `"append"` or `"count"`.
+
+        ## Raises
+        * `option_parser.exceptions.InvalidConfigurationException` - if `action` is not one of the above.
         """
-        self._parameter = _ParameterSettings(parameter_type, required, metavar, parameter_count, validator)
+        if(action not in _ACTIONS):
+            raise InvalidConfigurationException(f"Unknown option action: '{action}'.")
+        self._action = action
+        self.__mark_as_changed()
+
+    def get_parameter_cache_info(self) -> Optional[Any]:
+        """Returns statistics of the parameter cache enabled by `cache_size` in `set_parameter_settings()`.
+
+        ## Returns
+        A named tuple with `hits`, `misses`, `maxsize` and `currsize` fields, or `None` if the parameter cache is not enabled.
+        """
+        if(self._parameter is None or self._parameter.get_cache_size() <= 0):
+            return None
+        return self._parameter_converter.cache_info()
+
+    def __getstate__(self) -> dict:
+        # the parameter cache is not picklable, it is recreated empty when unpickled
+        state = self.__dict__.copy()
+        state["_parameter_converter"] = None
+        # neither are the references to the parsers, which are not sent along with the option
+        del state["_parsers"]
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._parsers = []
+        if(self._parameter is not None):
+            self.__create_parameter_converter()
+
+    def __mark_as_changed(self):
+        self._revision += 1
+        for parser_reference in self._parsers:
+            parser = parser_reference()
+            if(parser is not None):
+                parser._configuration_version += 1
+
+    def _add_parser(self, parser: OptionParser):
+        # references to parsers which no longer exist are dropped here, so that options shared by many short-lived parsers do not accumulate them
+        parsers = [parser_reference for parser_reference in self._parsers if parser_reference() not in (None, parser)]
+        parsers.append(ref(parser))
+        self._parsers = parsers
+
+    def __create_parameter_converter(self):
+        cache_size = self._parameter.get_cache_size()
+        if(cache_size > 0):
+            from functools import lru_cache
+            self._parameter_converter = lru_cache(maxsize=cache_size)(self.__convert_parameter)
+        else:
+            self._parameter_converter = self.__convert_parameter
     
+    def _get_action(self) -> str:
+        return self._action
+
     def _get_option_flags(self) -> Iterable[str]:
         return self._option_flags
 
@@ -71,34 +165,72 @@ class Option:
         return self._description
 
     def _parse_parameters(self, parameters: Iterable[str]) -> Any:
-        result = []
+        self._check_parameters(parameters)
+        return self._convert_parameters(parameters)
 
+    def _check_parameters(self, parameters: Iterable[str]):
         if(len(parameters) > 0):
-            expected_parameter_count = self._get_parameter_count()
-
-            if(expected_parameter_count != len(parameters)):
-                raise InvalidParameterException(f"Option {self._option_flags[0]} received {len(parameters)} parameters, expected {expected_parameter_count}.")
+            (minimum_count, maximum_count) = self._get_parameter_count_range()
 
-            for param in parameters:
-                try:
-                    typed_parameter = self._parameter.get_type()(param)
-                except ValueError:
-                    raise InvalidParameterException(f"{self._option_flags[0]}: parameter {param} has invalid type.")
+            if(len(parameters) < minimum_count or (maximum_count is not None and len(parameters) > maximum_count)):
+                raise InvalidParameterException(f"Option {self._option_flags[0]} received {len(parameters)} parameters, expected {self._describe_parameter_count()}.")
+        else:
+            if(self._parameter is not None and self._is_parameter_required() and (self._parameter.get_parameter_count_range()[0] > 0 or not self._parameter.is_variadic())):
+                raise InvalidParameterException(f"{self._option_flags[0]} expects {self._describe_parameter_count()} parameter(s), none received.")
 
-                validator = self._parameter.get_validator()
-                if(validator is not None and not validator(typed_parameter)):
-                    raise InvalidParameterException(f"{self._option_flags[0]}: parameter {param} is not valid.")
+    def _convert_parameters(self, parameters: Iterable[str]) -> Any:
+        return self._combine_parameters([self._parameter_converter(param) for param in parameters])
 
-                result.append(typed_parameter)
-        else:
-            if(self._parameter is not None and self._is_parameter_required()):
-                raise InvalidParameterException(f"{self._option_flags[0]} expects {self._get_parameter_count()} parameter(s), none received.")
-        
-        if(len(result) == 1):
+    def _combine_parameters(self, result: Iterable[Any]) -> Any:
+        # converted parameters as they are returned by ProcessedOptions
+        if(len(result) == 1 and not self._parameter.is_variadic()):
             return result[0]
         else:
             return result
 
+    def _convert_parameters_with_statistics(self, parameters: Iterable[str], statistics: ParseStatistics) -> Any:
+        return self._combine_parameters([self._convert_parameter_with_statistics(param, statistics) for param in parameters])
+
+    def _convert_parameter_with_statistics(self, param: str, statistics: ParseStatistics) -> Any:
+        start = perf_counter()
+        statistics._increment("conversions")
+        if(self._parameter.get_cache_size() > 0):
+            try:
+                return self._parameter_converter(param)
+            finally:
+                statistics._add_time("conversion", perf_counter() - start)
+
+        try:
+            typed_parameter = self.__convert_parameter_type(param)
+        finally:
+            validation_start = perf_counter()
+            statistics._add_time("conversion", validation_start - start)
+
+        if(self._parameter.get_validator() is not None):
+            statistics._increment("validator_calls")
+            try:
+                self.__validate_parameter(param, typed_parameter)
+            finally:
+                statistics._add_time("validation", perf_counter() - validation_start)
+
+        return typed_parameter
+
+    def __convert_parameter(self, param: str) -> Any:
+        typed_parameter = self.__convert_parameter_type(param)
+        self.__validate_parameter(param, typed_parameter)
+        return typed_parameter
+
+    def __convert_parameter_type(self, param: str) -> Any:
+        try:
+            return self._parameter.get_type()(param)
+        except ValueError:
+            raise InvalidParameterException(f"{self._option_flags[0]}: parameter {param} has invalid type.")
+
+    def __validate_parameter(self, param: str, typed_parameter: Any):
+        validator = self._parameter.get_validator()
+        if(validator is not None and not validator(typed_parameter)):
+            raise InvalidParameterException(f"{self._option_flags[0]}: parameter {param} is not valid.")
+
     def _get_metavar(self) -> Union[str, list]:
         return self._parameter.get_metavar()
 
@@ -108,5 +240,8 @@ class Option:
     def _is_parameter_required(self) -> bool:
         return self._parameter.is_required()
 
-    def _get_parameter_count(self) -> int:
-        return self._parameter.get_parameter_count() if self._accepts_parameter() else 0
+    def _get_parameter_count_range(self) -> Tuple[int, Optional[int]]:
+        return self._parameter.get_parameter_count_range() if self._accepts_parameter() else (0, 0)
+
+    def _describe_parameter_count(self) -> str:
+        return self._parameter.describe_parameter_count() if self._accepts_parameter() else "0"
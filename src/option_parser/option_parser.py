@@ -1,26 +1,113 @@
-import sys
+from __future__ import annotations
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+    from .parse_statistics import ParseStatistics
+    from ._parsed_option import _ParsedOption
+    from ._subcommand import _Subcommand
 
-from typing import Optional
+import os
+import sys
 
-from .exceptions import InvalidConfigurationException, InvalidParameterException, InvalidOptionException
+# _thread is built into the interpreter, unlike threading which would have to be imported
+from _thread import allocate_lock
+from .exceptions import OptionParserException, InvalidConfigurationException, InvalidParameterException, InvalidOptionException, InvalidArgumentsException
 from .option import Option
 from .processed_options import ProcessedOptions
 from ._parser import _Parser
 
+_DESCRIPTION_INDENT = "\t"
+
+# Serializes compilations, so that a parser used by several threads is compiled once, and never observed half compiled.
+# Parsers are not compiled often, so a single lock for all of them is enough.
+_compile_lock = allocate_lock()
+
 class OptionParser:
-    def __init__(self, program_description: Optional[str] = "", throw_on_error: Optional[bool] = False):
-        """Create a new `OptionParser` object. Parameters should be passed as keyword arguments. Both parameters are optional.
+    def __init__(self, program_description: Optional[str] = "", throw_on_error: Optional[bool] = False, lazy_parameters: Optional[bool] = False, allow_abbreviations: Optional[bool] = False, backend: Optional[str] = "generic", response_files: Optional[str] = None, stream_plain_args: Optional[bool] = False, collect_errors: Optional[bool] = False):
+        """Create a new `OptionParser` object. Parameters should be passed as keyword arguments. All parameters are optional.
 
         ## Parameters
         * `program_description` - short string to be displayed on the first line of the help page
         * `throw_on_error` - if set to False (default), the program will handle user errors automatically by showing error info, help page and then exiting.
             if set to True, the program will handle errors by raising exceptions to be handled manually.
+        * `lazy_parameters` - if set to True, parameters are converted to their `parameter_type` and validated only when they are first retrieved
+            from `option_parser.processed_options.ProcessedOptions`, instead of during parsing. Parameter counts are still checked during parsing.
+            False by default.
+        * `allow_abbreviations` - if set to True, long option keys can be abbreviated on the command-line to any prefix shared by the keys of a single option,
+            e.g. `--verb` for `--verbose`. An ambiguous prefix is reported as an unrecognized option. False by default.
+        * `backend` - parsing implementation, either `"generic"` (default) or `"codegen"`. The `"codegen"` backend generates and compiles
+            Python source of a parse function specialized for the registered options, which makes parsing faster at the cost of slower compilation.
+            The generated source can be inspected with `get_generated_source()`.
+        * `response_files` - if set, every `@path` argument (before `--`) is replaced by the arguments read from the file at `path`,
+            which allows passing argument lists longer than the operating system permits. Response files may include other response files.
+            The value is the format of the files: `"lines"` (one argument per line), `"null"` (arguments terminated by NUL characters, e.g. `find -print0` output)
+            or `"shell"` (whitespace separated arguments, with shell-style quoting and escaping). Disabled (`None`) by default.
+        * `stream_plain_args` - if set to True, `parse()` and `parse_many()` do not copy the plain arguments following the last option
+            and the ones following `--` out of the parsed argument list, `option_parser.processed_options.ProcessedOptions`'s `iter_plain_args()`
+            iterates over the argument list itself instead. The argument list must not be modified while the result is in use. False by default.
+        * `collect_errors` - if set to True, parsing does not stop at the first invalid argument. Every unrecognized option, invalid parameter
+            and missing mandatory option is reported at once, by an `option_parser.exceptions.InvalidArgumentsException` raised (or handled,
+            see `throw_on_error`) instead of the first error. The parameters of an option are not converted again after they failed once. False by default.
+
+        ## Raises
+        * `option_parser.exceptions.InvalidConfigurationException` - if `backend` or `response_files` is not one of the supported values.
         """
+        if(backend not in ("generic", "codegen")):
+            raise InvalidConfigurationException(f"Unknown parser backend: '{backend}'.")
+        if(response_files not in (None, "lines", "null", "shell")):
+            raise InvalidConfigurationException(f"Unknown response file format: '{response_files}'.")
+
         self._program_description = program_description
         self._throw_on_error = throw_on_error
+        self._lazy_parameters = lazy_parameters
+        self._allow_abbreviations = allow_abbreviations
+        self._backend = backend
+        self._response_files = response_files
+        self._stream_plain_args = stream_plain_args
+        self._collect_errors = collect_errors
         self._options = []
+        # every registered flag, so that duplicates are detected across add_options() calls
+        self._flag_index = {}
+        # registered with the first options, and always kept last
+        self._help_option = None
+        self._subcommands = {}
+        self._compiled_parser = None
+        # bumped by the options of this parser whenever they are reconfigured, so that the compiled parser can detect stale options
+        self._configuration_version = 0
+        self._compiled_configuration_version = None
+        self._help_fragments = {}
+        self._parse_hook = None
+
+    @classmethod
+    def from_cache(cls, factory: Callable[[], OptionParser], cache_dir: Optional[str] = None, key: Optional[str] = "") -> OptionParser:
+        """Returns the parser created by `factory`, loading it from an on-disk cache when possible, so that the options do not have to be
+        constructed and registered on every start of the program. On the first call (and whenever the cache entry is unusable), `factory`
+        is called and the parser it returns is stored, together with its pre-rendered help page.
+
+        A cache entry is used only if it was stored by the same version of this library and Python, for a factory with the same name and code.
+        Code called by `factory` is not part of that check, `key` has to be changed when it changes (e.g. set it to the program version).
+        Missing, corrupted and mismatching entries are silently rebuilt.
+
+        The parser can only be stored if all its parameter types and validators are module-level functions or classes (not lambdas or nested functions),
+        and it has no parse hook set. Otherwise `factory` is called every time.
+
+        The options of a loaded parser are not the `option_parser.option.Option` objects created by `factory` in this process,
+        they have to be retrieved with `get_option()`.
+
+        ## Parameters
+        * `factory` - function without arguments creating an `OptionParser` and adding all its options.
+        * `cache_dir` - directory of the cache files. Defaults to the `OPTION_PARSER_CACHE_DIR` environment variable if set,
+            otherwise `option_parser` in the user cache directory (`$XDG_CACHE_HOME` or `~/.cache`).
+        * `key` - additional string identifying the parser definition.
+
+        ## Returns
+        The loaded or newly created `OptionParser`.
+        """
+        from ._definition_cache import _load_or_build
+
+        return _load_or_build(factory, cache_dir, key)
 
-    
     def add_options(self, option: Option, *args: Optional[Option]):
         """Adds new options to support during parsing.
 
@@ -29,84 +116,403 @@ class OptionParser:
         * `*args` - additional `option_parser.option.Option`s
         
         ## Raises
-        * `option_parser.exceptions.InvalidConfigurationException` - if a duplicate flag is detected.
-        """
-        help_option = self.__create_help_option()
-        known_flags = []
-        for opt in tuple([option]) + args + tuple([help_option]):
-            self._options.append(opt)
-            for flag in opt._get_option_flags():
-                if(flag in known_flags):
+        * `option_parser.exceptions.InvalidConfigurationException` - if a duplicate flag is detected. In that case none of the options are added.
+        """
+        self.add_options_from((option,) + args)
+
+    def add_options_from(self, options: Iterable[Option]):
+        """Adds all the options produced by an iterable, e.g. a generator creating the options of a generated CLI.
+        Same as `add_options()`, which is the convenient form for a few options known in advance. The time taken is proportional
+        to the number of options added, regardless of how many options were added before.
+
+        ## Parameters
+        * `options` - iterable of `option_parser.option.Option` instances to support.
+
+        ## Raises
+        * `option_parser.exceptions.InvalidConfigurationException` - if a flag of an option is already used by another option. In that case none of the options are added.
+        """
+        new_options = list(options)
+        help_option = self._help_option
+        if(help_option is None):
+            help_option = self.__create_help_option()
+            new_options.append(help_option)
+
+        new_flags = {}
+        for option in new_options:
+            for flag in option._get_option_flags():
+                if(flag in self._flag_index or flag in new_flags):
                     raise InvalidConfigurationException(f"Duplicate option flag detected : '{flag}'.")
-                known_flags.append(flag)
-        
+                new_flags[flag] = option
+
+        self._flag_index.update(new_flags)
+        for option in new_options:
+            option._add_parser(self)
+        if(self._help_option is not None):
+            self._options.pop()
+            new_options.append(help_option)
+        self._options.extend(new_options)
+        self._help_option = help_option
+        self._compiled_parser = None
+
+    def add_subcommand(self, name: str, factory: Union[Callable[[], OptionParser], str], description: Optional[str] = ""):
+        """Adds a subcommand, e.g. `build` in `tool -v build --release`. The first plain argument which is not a parameter of an option
+        selects the subcommand, and all the arguments following it are parsed by the subcommand's own parser. If subcommands are added,
+        a first plain argument which is not the name of a subcommand is reported as an error, plain arguments of this parser can only follow `--`.
+
+        The subcommand's parser is created by calling `factory`, but only when the subcommand is selected (or `get_subcommand_parser()` is called),
+        so programs with many subcommands only construct the options of the one which is used. `factory` can also be given as
+        a `"module:function"` string, in which case the module is imported only then as well.
+
+        ## Parameters
+        * `name` - name of the subcommand on the command-line.
+        * `factory` - function without arguments creating the subcommand's `OptionParser` and adding its options, or a `"module:function"` string naming one.
+        * `description` - short description of the subcommand to be displayed in the help page.
+
+        ## Raises
+        * `option_parser.exceptions.InvalidConfigurationException` - if `name` is empty, starts with `-` or is already used by another subcommand.
+        """
+        from ._subcommand import _Subcommand
+
+        if(len(name) == 0 or name[0] == "-"):
+            raise InvalidConfigurationException(f"Invalid subcommand name: '{name}'.")
+        if(name in self._subcommands):
+            raise InvalidConfigurationException(f"Duplicate subcommand detected : '{name}'.")
 
-    def parse(self) -> ProcessedOptions:
+        self._subcommands[name] = _Subcommand(name, factory, description)
+        self._compiled_parser = None
+
+    def get_subcommand_parser(self, name: str) -> Optional[OptionParser]:
+        """Returns the parser of a subcommand, creating it if it has not been created yet, e.g. to retrieve its options with `get_option()`.
+
+        ## Parameters
+        * `name` - name of the subcommand.
+
+        ## Raises
+        * `option_parser.exceptions.InvalidConfigurationException` - if the subcommand's factory cannot be imported or does not return an `OptionParser`.
+
+        ## Returns
+        The subcommand's `OptionParser`, or `None` if there is no subcommand called `name`.
+        """
+        subcommand = self._subcommands.get(name)
+        return subcommand.get_parser() if subcommand is not None else None
+
+    def compile(self):
+        """Precomputes the parse plan (flag table, required options, parameter specifications and help page) for the currently
+        registered options. The plan is reused by every subsequent call to `parse()` until new options are added or an already added
+        option is reconfigured, at which point it is rebuilt automatically.
+
+        Calling this method is optional, `parse()` compiles the options on first use. It is useful for moving the compilation cost
+        out of the first parse, e.g. when the parser is set up during the startup of a long-running program.
+        """
+        with _compile_lock:
+            self.__compile()
+
+    def get_option(self, flag: str) -> Optional[Option]:
+        """Returns the registered option with the given key, e.g. to retrieve the options of a parser loaded by `from_cache()`.
+
+        ## Parameters
+        * `flag` - option key, without the `-` or `--` prefix
+
+        ## Returns
+        The `option_parser.option.Option` with the given key, or `None` if no registered option has it.
+        """
+        return self._flag_index.get(flag)
+
+    def get_generated_source(self) -> Optional[str]:
+        """Returns the Python source of the parse function generated for the registered options, for debugging purposes.
+
+        ## Returns
+        The generated source, or `None` if the parser does not use the `"codegen"` backend.
+        """
+        if(self._backend != "codegen"):
+            return None
+        return self.__get_compiled_parser().get_source()
+
+    def set_parse_hook(self, hook: Optional[Callable[[ParseStatistics], None]]):
+        """Registers a callback receiving timing and work statistics of every subsequent `parse()` and `parse_many()` parse,
+        including the failed ones. Only one hook can be registered, `None` unregisters it.
+
+        Parsing without a registered hook does not collect any statistics. With a hook registered, all arguments are classified
+        before the rest of the parse (instead of on the fly) so that the phases can be timed separately.
+
+        ## Parameters
+        * `hook` - callable receiving an `option_parser.parse_statistics.ParseStatistics` instance after each parse.
+        """
+        self._parse_hook = hook
+
+    def parse(self, argv: Optional[Iterable[str]] = None) -> ProcessedOptions:
         """Parse the supplied CLI arguments as options.
 
         If a runtime error occurs during parsing (required option missing, invalid parameter type, etc.), the program
         will handle it according to the `throw_on_error` flag set in constructor.
 
+        ## Parameters
+        * `argv` - arguments to parse, without the program name. `sys.argv[1:]` is parsed if not supplied.
+
         ## Raises
         * `option_parser.exceptions.InvalidOptionException` - if `throw_on_error` is `True` and a required option is missing, or an unrecognized option is supplied.
         * `option_parser.exceptions.InvalidParameterException` - if `throw_on_error` is `True` and an option received invalid parameters.
+        * `option_parser.exceptions.InvalidArgumentsException` - instead of the above, if `collect_errors` is `True`.
+
+        If `argv` is not supplied and the `OPTION_PARSER_COMPLETE` environment variable is set, the program is being run by
+        a shell completion script: the completion candidates (or the completion script) are printed instead, and the program exits.
 
         ## Returns
         a `option_parser.processed_options.ProcessedOptions` instance containing all the parsed options, their parameters and plain arguments.
         """
-        args = sys.argv[1:]
-        if(self.__help_option_present(args)):
-            print(self.get_help())
-            sys.exit(0)
+        if(argv is None and "OPTION_PARSER_COMPLETE" in os.environ):
+            self.__run_completion(os.environ["OPTION_PARSER_COMPLETE"])
+
+        # the program name is skipped instead of sliced off, so that sys.argv is not copied
+        (args, start) = (sys.argv, 1) if argv is None else (argv if isinstance(argv, (list, tuple)) else list(argv), 0)
+        return self.__parse_arguments(args, start)
+
+    def parse_isolated(self, argv: Iterable[str]) -> Union[ProcessedOptions, OptionParserException]:
+        """Parse the supplied CLI arguments without touching any process state: unlike `parse()`, this method never reads `sys.argv`,
+        prints anything or exits, so it can be called concurrently from several threads sharing this parser (see the thread safety section
+        of the package documentation). Behaves like `parse_many()` for a single argument list, the help option is parsed like any other option.
+
+        ## Parameters
+        * `argv` - arguments to parse, without the program name.
+
+        ## Raises
+        * `option_parser.exceptions.InvalidOptionException` - if `throw_on_error` is `True` and a required option is missing, or an unrecognized option is supplied.
+        * `option_parser.exceptions.InvalidParameterException` - if `throw_on_error` is `True` and an option received invalid parameters.
+        * `option_parser.exceptions.InvalidArgumentsException` - instead of the above, if `collect_errors` is `True`.
+
+        ## Returns
+        a `option_parser.processed_options.ProcessedOptions` instance, or the exception raised by parsing if `throw_on_error` is `False`.
+        """
+        try:
+            return self.__parse_arguments_without_exit(self.__get_compiled_parser(), argv)
+        except (InvalidOptionException, InvalidParameterException, InvalidArgumentsException) as error:
+            if(self._throw_on_error):
+                raise error
+            return error
+
+    def parse_many(self, argvs: Iterable[Iterable[str]]) -> Iterator[Union[ProcessedOptions, OptionParserException]]:
+        """Parse a sequence of argument lists, e.g. stored command lines, one by one. All of them are parsed with the same compiled
+        parse plan, and neither `sys.argv` nor the process state is touched.
+
+        Unlike `parse()`, this method never prints anything or exits: the help option is parsed like any other option,
+        and if `throw_on_error` is `False`, an argument list which fails to parse produces the raised exception in place of its result.
+
+        ## Parameters
+        * `argvs` - iterable of argument lists, each without the program name.
+
+        ## Raises
+        * `option_parser.exceptions.InvalidOptionException` - if `throw_on_error` is `True` and a required option is missing, or an unrecognized option is supplied.
+        * `option_parser.exceptions.InvalidParameterException` - if `throw_on_error` is `True` and an option received invalid parameters.
+        * `option_parser.exceptions.InvalidArgumentsException` - instead of the above, if `collect_errors` is `True`.
+
+        ## Returns
+        a generator yielding a `option_parser.processed_options.ProcessedOptions` instance (or an exception) for every argument list, in the order they were supplied.
+        """
+        parser = self.__get_compiled_parser()
+        for argv in argvs:
+            try:
+                yield self.__parse_arguments_without_exit(parser, argv)
+            except (InvalidOptionException, InvalidParameterException, InvalidArgumentsException) as error:
+                if(self._throw_on_error):
+                    raise error
+                yield error
+
+    def parse_bytes(self, buffer: Union[bytes, bytearray, memoryview], skip_program_name: Optional[bool] = False) -> Union[ProcessedOptions, OptionParserException]:
+        """Parse an argument list stored as NUL-terminated (or NUL-separated) bytes, such as the contents of `/proc/<pid>/cmdline` on Linux.
+        Behaves like `parse_many()` for a single argument list: it never prints anything or exits.
 
-        parser = _Parser(self._options)
+        Only flags and the parameters of options are decoded during parsing. The plain arguments following the last option are
+        decoded when they are retrieved from the result, and are read from `buffer` without being copied in the meantime, as with `stream_plain_args`.
+        Arguments are decoded like `os.fsdecode()` does, bytes which are not valid in the file system encoding are preserved as surrogate escapes
+        (`os.fsencode()` restores the original bytes).
+
+        ## Parameters
+        * `buffer` - the arguments, each terminated or separated by a NUL byte.
+        * `skip_program_name` - if True, the first argument is the program name and is not parsed, as in `/proc/<pid>/cmdline`. False by default.
+
+        ## Raises
+        * `option_parser.exceptions.InvalidOptionException` - if `throw_on_error` is `True` and a required option is missing, or an unrecognized option is supplied.
+        * `option_parser.exceptions.InvalidParameterException` - if `throw_on_error` is `True` and an option received invalid parameters.
+        * `option_parser.exceptions.InvalidArgumentsException` - instead of the above, if `collect_errors` is `True`.
+        * `option_parser.exceptions.InvalidConfigurationException` - if subcommands were added, they are not supported by this method.
+
+        ## Returns
+        a `option_parser.processed_options.ProcessedOptions` instance, or the exception raised by parsing if `throw_on_error` is `False`.
+        """
+        self.__check_no_subcommands("parse_bytes")
+        parser = self.__get_compiled_parser()
         try:
-            (parsed_options, plain_arguments) = parser.parse(args)
-            return ProcessedOptions(parsed_options, plain_arguments)
-        except (InvalidOptionException, InvalidParameterException) as error:
+            (parsed_options, plain_arguments) = self.__call_parser(parser.parse_bytes, buffer, 1 if skip_program_name else 0)
+            return ProcessedOptions(parsed_options, plain_arguments, option_ids=parser._option_ids)
+        except (InvalidOptionException, InvalidParameterException, InvalidArgumentsException) as error:
             if(self._throw_on_error):
                 raise error
+            return error
+
+    def parse_parallel(self, argvs: Iterable[Iterable[str]], max_workers: Optional[int] = None, chunk_size: Optional[int] = 1000) -> Iterator[Union[ProcessedOptions, OptionParserException]]:
+        """Parse a large sequence of argument lists using a pool of worker processes. Behaves like `parse_many()`,
+        results are yielded in the order the argument lists were supplied.
+
+        The registered options are sent to every worker process once, when it starts. The argument lists are then sent in chunks of
+        `chunk_size` lists, and only a bounded number of chunks is processed at a time, so `argvs` may be an arbitrarily long iterator.
+        Parameter types, validators and parsed parameter values must therefore be picklable (e.g. module-level functions, not lambdas).
+
+        ## Parameters
+        * `argvs` - iterable of argument lists, each without the program name.
+        * `max_workers` - number of worker processes, defaults to the number of CPUs.
+        * `chunk_size` - number of argument lists sent to a worker at once.
+
+        ## Raises
+        * `option_parser.exceptions.InvalidOptionException` - if `throw_on_error` is `True` and a required option is missing, or an unrecognized option is supplied.
+        * `option_parser.exceptions.InvalidParameterException` - if `throw_on_error` is `True` and an option received invalid parameters.
+        * `option_parser.exceptions.InvalidArgumentsException` - instead of the above, if `collect_errors` is `True`.
+        * `option_parser.exceptions.InvalidConfigurationException` - if subcommands were added, they are not supported by this method.
+
+        ## Returns
+        a generator yielding a `option_parser.processed_options.ProcessedOptions` instance (or an exception) for every argument list, in the order they were supplied.
+        """
+        from ._batch import _parse_in_processes
+
+        self.__check_no_subcommands("parse_parallel")
+        parser = self.__get_compiled_parser()
+        for (success, result) in _parse_in_processes(parser, argvs, max_workers, chunk_size):
+            if(success):
+                (parsed_options, plain_arguments) = result
+                yield ProcessedOptions(parsed_options, plain_arguments, option_ids=parser._option_ids)
+            elif(self._throw_on_error):
+                raise result
             else:
-                print(f"Error: {error}\n")
-                print(self.get_help())
-                sys.exit(1)
+                yield result
 
     
-    def get_help(self) -> str:
+    def get_completions(self, words: Iterable[str]) -> List[str]:
+        """Returns the shell completion candidates for the last of `words`: flags if it starts with a dash, the values of the option
+        parameter being completed if the option's `parameter_type` is an enumeration of strings (e.g. an `enum.Enum` subclass),
+        or subcommand names. Arguments following a subcommand are completed by the subcommand's parser.
+
+        The candidates are looked up in an index of sorted flags and values, which is built once per compiled parse plan.
+
+        ## Parameters
+        * `words` - the arguments typed so far, without the program name. The last one is the (possibly empty) argument being completed.
+
+        ## Returns
+        A list of the candidates starting with the last of `words`, empty if there is none.
+        """
+        words = list(words) or [""]
+        (previous, current) = (words[:-1], words[-1])
+        parser = self.__get_compiled_parser()
+
+        if(self._subcommands):
+            subcommand_index = parser.find_first_plain_argument(previous, 0, self._subcommands)
+            if(subcommand_index is not None):
+                subcommand = self._subcommands.get(previous[subcommand_index])
+                return subcommand.get_parser().get_completions(words[subcommand_index + 1:]) if subcommand is not None else []
+
+        from ._completion import _complete
+
+        return _complete(parser, parser.get_completion_index(), previous, current, self._subcommands)
+
+    def get_completion_script(self, shell: str, program_name: Optional[str] = None) -> str:
+        """Returns a completion script for `shell`, to be sourced by the shell (e.g. from `~/.bashrc`). The script contains the flags
+        of this parser and the names of its subcommands, and completes flags by itself, so that the program does not have to be started.
+        Everything else is completed by running the program with the `OPTION_PARSER_COMPLETE` environment variable set, so the program
+        has to call `parse()` without arguments.
+
+        The script can also be printed by running the program with `OPTION_PARSER_COMPLETE` set to `bash_source`, `zsh_source` or `fish_source`.
+
+        ## Parameters
+        * `shell` - `"bash"`, `"zsh"` or `"fish"`.
+        * `program_name` - name of the program to complete, defaults to the file name of `sys.argv[0]`.
+
+        ## Raises
+        * `option_parser.exceptions.InvalidConfigurationException` - if `shell` is not supported.
+
+        ## Returns
+        The completion script in a single string.
+        """
+        from ._completion import SHELLS, _generate_script
+
+        if(shell not in SHELLS):
+            raise InvalidConfigurationException(f"Unsupported shell: '{shell}'.")
+        if(program_name is None):
+            program_name = os.path.basename(sys.argv[0])
+
+        flags = self.__get_compiled_parser().get_completion_index().get_flags()
+        return _generate_script(shell, program_name, flags, self._subcommands)
+
+    def get_help(self, width: Optional[int] = None) -> str:
         """Returns the program usage help page. The help page contains the program description
         and a list of all supported options (including help option) with their parameters and descriptions.
+
+        The help page is rendered once per `width` and cached until options are added or reconfigured. In that case only the help text
+        of the affected options is rendered again.
+
+        ## Parameters
+        * `width` - if supplied, descriptions are wrapped to fit this many columns, e.g. `shutil.get_terminal_size().columns`. Descriptions are not wrapped by default.
         
         ## Returns
         Program usage help page in a single string.
         
         """
+        parser = self.__get_compiled_parser()
+        help_text = parser.get_help_text(width)
+        if(help_text is None):
+            help_text = self.__generate_help_text(width)
+            parser.set_help_text(width, help_text)
+
+        return help_text
+
+    def __generate_help_text(self, width: Optional[int]) -> str:
+        help_parts = []
+
         if(len(self._program_description) > 0):
-            help_text = f"{self._program_description}\n\n"
-        else:
-            help_text = ""
+            help_parts.append(f"{self.__wrap_text(self._program_description, width, '')}\n\n")
 
         if(len(self._options) > 0):
-            help_text += "Options:\n"
+            help_parts.append("Options:\n")
             for option in self._options:
-                help_text += self.__generate_option_help_text(option)
+                help_parts.append(self.__get_option_help_text(option, width))
             
-        help_text += "--\n\tTerminate option list."
+        help_parts.append(f"--\n{self.__wrap_text('Terminate option list.', width, _DESCRIPTION_INDENT)}")
 
-        return help_text
+        if(len(self._subcommands) > 0):
+            help_parts.append("\n\nSubcommands:")
+            for subcommand in self._subcommands.values():
+                help_parts.append(f"\n{subcommand.get_name()}")
+                if(len(subcommand.get_description()) > 0):
+                    help_parts.append(f"\n{self.__wrap_text(subcommand.get_description(), width, _DESCRIPTION_INDENT)}")
+
+        return "".join(help_parts)
+
+    def __get_option_help_text(self, option: Option, width: Optional[int]) -> str:
+        # fragments are kept across recompilations, and re-rendered only when their option has changed
+        cached_fragment = self._help_fragments.get((option, width))
+        if(cached_fragment is not None and cached_fragment[0] == option._revision):
+            return cached_fragment[1]
 
-    def __generate_option_help_text(self, option: Option) -> str:
-        option_text = ""
+        option_text = self.__generate_option_help_text(option, width)
+        self._help_fragments[(option, width)] = (option._revision, option_text)
+        return option_text
 
-        for flag in option._get_option_flags():
-            option_text += self.__generate_option_help_flag_text(option, flag) + ", "
-        option_text = option_text[:-2] # removes last comma
+    def __generate_option_help_text(self, option: Option, width: Optional[int]) -> str:
+        option_text = ", ".join(self.__generate_option_help_flag_text(option, flag) for flag in option._get_option_flags()) + "\n"
 
         option_description = option._get_description()
         if(len(option_description) > 0):
-            option_text += f"\n\t{option_description}\n"
+            option_text += f"{self.__wrap_text(option_description, width, _DESCRIPTION_INDENT)}\n"
 
         return option_text
 
+    def __wrap_text(self, text: str, width: Optional[int], indent: str) -> str:
+        if(width is None):
+            return indent + text
+
+        import textwrap
+
+        indent_width = len(indent.expandtabs())
+        lines = textwrap.wrap(text, max(width - indent_width, 1)) or [""]
+        return "".join(f"{indent}{line}\n" for line in lines)[:-1]
+
     def __generate_option_help_flag_text(self, option: Option, flag: str) -> str:
         is_short = len(flag) == 1
         accepts_parameters = option._accepts_parameter()
@@ -117,17 +523,157 @@ class OptionParser:
         metavar = ""
 
         if(accepts_parameters):
+            (minimum_count, maximum_count) = option._get_parameter_count_range()
             if(type(original_metavar) == list):
-                if(len(original_metavar) != option._get_parameter_count()):
-                    raise InvalidConfigurationException(f"Invalid metavar length set for option {option._get_option_flags[0]}")
+                if(len(original_metavar) < minimum_count or (maximum_count is not None and len(original_metavar) > maximum_count)):
+                    raise InvalidConfigurationException(f"Invalid metavar length set for option {option._get_option_flags()[0]}")
                 metavar = parameter_prefix + parameter_delimiter.join(original_metavar)
+                displayed_count = len(original_metavar)
             else:
                 metavar = parameter_prefix + original_metavar
+                displayed_count = 1
+            # a variable count is shown by an ellipsis after the placeholders which may be repeated
+            if(len(metavar) > 1 and option._parameter.is_variadic() and (maximum_count is None or maximum_count > displayed_count)):
+                metavar += "..."
 
         return f"{prefix}{flag}{metavar}"
 
-    def __help_option_present(self, args) -> bool:
-        return "-h" in args or "--help" in args
+    def __run_completion(self, mode: str):
+        from ._completion import SHELLS
+
+        if(mode in SHELLS):
+            completions = self.get_completions(sys.argv[1:])
+            if(completions):
+                print("\n".join(completions))
+        elif(mode.endswith("_source") and mode[:-len("_source")] in SHELLS):
+            print(self.get_completion_script(mode[:-len("_source")]), end="")
+        else:
+            return
+        sys.exit(0)
+
+    def __parse_arguments(self, args: Sequence[str], start: int) -> ProcessedOptions:
+        # arguments following a subcommand are parsed by the subcommand's parser, which also handles its own help option and errors
+        subcommand_index = self.__find_subcommand_index(args, start)
+        options_end = len(args) if subcommand_index is None else subcommand_index
+        if(self.__help_option_present(args, start, options_end)):
+            print(self.get_help())
+            sys.exit(0)
+
+        parser = self.__get_compiled_parser()
+        try:
+            subcommand = self.__get_subcommand(args, subcommand_index)
+            (parsed_options, plain_arguments) = self.__run_parser(parser, args if subcommand is None else args[:options_end], start)
+            processed_options = ProcessedOptions(parsed_options, plain_arguments, self.__handle_parse_error, parser._option_ids)
+        except (InvalidOptionException, InvalidParameterException, InvalidArgumentsException) as error:
+            self.__handle_parse_error(error)
+            return None
+
+        if(subcommand is not None):
+            subcommand_parser = subcommand.get_parser()
+            processed_options._subcommand = (subcommand.get_name(), subcommand_parser.__parse_arguments(args, subcommand_index + 1))
+        return processed_options
+
+    def __parse_arguments_without_exit(self, parser: _Parser, args: Iterable[str]) -> ProcessedOptions:
+        if(not self._subcommands):
+            (parsed_options, plain_arguments) = self.__run_parser(parser, args)
+            return ProcessedOptions(parsed_options, plain_arguments, option_ids=parser._option_ids)
+
+        args = args if isinstance(args, (list, tuple)) else list(args)
+        subcommand_index = self.__find_subcommand_index(args, 0)
+        subcommand = self.__get_subcommand(args, subcommand_index)
+        (parsed_options, plain_arguments) = self.__run_parser(parser, args if subcommand is None else args[:subcommand_index])
+        processed_options = ProcessedOptions(parsed_options, plain_arguments, option_ids=parser._option_ids)
+        if(subcommand is not None):
+            subcommand_parser = subcommand.get_parser()
+            processed_options._subcommand = (subcommand.get_name(), subcommand_parser.__parse_arguments_without_exit(subcommand_parser.__get_compiled_parser(), args[subcommand_index + 1:]))
+        return processed_options
+
+    def __find_subcommand_index(self, args: Sequence[str], start: int) -> Optional[int]:
+        if(not self._subcommands):
+            return None
+        return self.__get_compiled_parser().find_first_plain_argument(args, start, self._subcommands)
+
+    def __get_subcommand(self, args: Sequence[str], subcommand_index: Optional[int]) -> Optional[_Subcommand]:
+        if(subcommand_index is None):
+            return None
+        subcommand = self._subcommands.get(args[subcommand_index])
+        if(subcommand is None):
+            raise InvalidOptionException(f"{args[subcommand_index]}: unknown subcommand")
+        return subcommand
+
+    def __check_no_subcommands(self, method_name: str):
+        if(self._subcommands):
+            raise InvalidConfigurationException(f"{method_name}() does not support subcommands.")
+
+    def __run_parser(self, parser: _Parser, args: Iterable[str], start: int = 0) -> Tuple[Iterable[_ParsedOption], Iterable[str]]:
+        if(self._stream_plain_args):
+            return self.__call_parser(parser.parse_streaming, args if isinstance(args, (list, tuple)) else list(args), start)
+        return self.__call_parser(parser.parse, args[start:] if start > 0 else args)
+
+    def __call_parser(self, parse_function: Callable[..., Tuple[Iterable[_ParsedOption], Iterable[str]]], *args: Any) -> Tuple[Iterable[_ParsedOption], Iterable[str]]:
+        # parse_function takes the statistics to collect as its last argument
+        if(self._parse_hook is None):
+            return parse_function(*args)
+
+        from .parse_statistics import ParseStatistics
+
+        statistics = ParseStatistics()
+        try:
+            return parse_function(*args, statistics)
+        finally:
+            self._parse_hook(statistics)
+
+    def __handle_parse_error(self, error: OptionParserException):
+        if(self._throw_on_error):
+            raise error
+        else:
+            print(f"Error: {error}\n")
+            print(self.get_help())
+            sys.exit(1)
+
+    def __compile(self):
+        # the new plan is only published once it is complete, parses running on other threads keep using the one they started with
+        configuration_version = self._configuration_version
+        if(self._backend == "codegen"):
+            from ._codegen import _GeneratedParser
+            compiled_parser = _GeneratedParser(self._options, self._lazy_parameters, self._allow_abbreviations, self._response_files, self._collect_errors)
+        else:
+            compiled_parser = _Parser(self._options, self._lazy_parameters, self._allow_abbreviations, self._response_files, self._collect_errors)
+        (self._compiled_parser, self._compiled_configuration_version) = (compiled_parser, configuration_version)
+
+    def __get_compiled_parser(self) -> _Parser:
+        compiled_parser = self._compiled_parser
+        if(compiled_parser is None or self._compiled_configuration_version != self._configuration_version):
+            with _compile_lock:
+                # another thread may have compiled the parser in the meantime
+                if(self._compiled_parser is None or self._compiled_configuration_version != self._configuration_version):
+                    self.__compile()
+                compiled_parser = self._compiled_parser
+        return compiled_parser
+
+    def __help_option_present(self, args: Sequence[str], start: int, end: int) -> bool:
+        for help_flag in ("-h", "--help"):
+            try:
+                args.index(help_flag, start, end)
+                return True
+            except ValueError:
+                pass
+        if(self._allow_abbreviations):
+            return self.__abbreviated_help_option_present(args, start, end)
+        return False
+
+    def __abbreviated_help_option_present(self, args: Sequence[str], start: int, end: int) -> bool:
+        long_flag_trie = self.__get_compiled_parser()._long_flag_trie
+        for index in range(start, end):
+            argument = args[index]
+            if(argument.startswith("--") and len(argument) > 2 and "=" not in argument):
+                try:
+                    if(long_flag_trie.find(argument[2:]) is self._help_option):
+                        return True
+                except InvalidOptionException:
+                    # ambiguous abbreviation, reported by the parser
+                    pass
+        return False
 
     def __create_help_option(self) -> Option:
         help_option = Option("h", "help")
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Dict
+
+PHASES = ("tokenize", "grouping", "lookup", "conversion", "validation", "required_check")
+COUNTERS = ("tokens", "options_matched", "conversions", "validator_calls")
+
+class ParseStatistics:
+    def __init__(self):
+        """
+        Wall time spent in the individual phases of a single parse and the amount of work done in them. Instances are created by the parser
+        and passed to the hook registered with `option_parser.OptionParser`'s `set_parse_hook()`.
+
+        Phases:
+        * `tokenize` - classification of the received arguments, including multiflag expansion
+        * `grouping` - assignment of parameters and plain arguments to the detected flags
+        * `lookup` - resolution of flags to options
+        * `conversion` - conversion of parameters to their `parameter_type` (including parameter cache lookups, if enabled)
+        * `validation` - parameter validator calls
+        * `required_check` - verification that all mandatory options were supplied
+
+        Counters:
+        * `tokens` - classified tokens, every flag of a multiflag counts separately
+        * `options_matched` - flags resolved to an option
+        * `conversions` - converted parameters
+        * `validator_calls` - validator invocations
+        """
+        self._phase_times = dict.fromkeys(PHASES, 0.0)
+        self._counters = dict.fromkeys(COUNTERS, 0)
+
+    def get_phase_time(self, phase: str) -> float:
+        """
+        ## Returns
+        Seconds spent in the given phase.
+        """
+        return self._phase_times[phase]
+
+    def get_phase_times(self) -> Dict[str, float]:
+        """
+        ## Returns
+        A dictionary mapping each phase name to the seconds spent in it.
+        """
+        return dict(self._phase_times)
+
+    def get_total_time(self) -> float:
+        """
+        ## Returns
+        Seconds spent in all the phases together.
+        """
+        return sum(self._phase_times.values())
+
+    def get_counter(self, counter: str) -> int:
+        """
+        ## Returns
+        Value of the given counter.
+        """
+        return self._counters[counter]
+
+    def get_counters(self) -> Dict[str, int]:
+        """
+        ## Returns
+        A dictionary mapping each counter name to its value.
+        """
+        return dict(self._counters)
+
+    def _add_time(self, phase: str, seconds: float):
+        self._phase_times[phase] += seconds
+
+    def _increment(self, counter: str, amount: int = 1):
+        self._counters[counter] += amount
@@ -1,18 +1,82 @@
+from __future__ import annotations
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, List, Iterable, Iterator, Mapping, Optional
+
+from _thread import allocate_lock
 from .option import Option
 from ._parsed_option import _ParsedOption
-from typing import Any, List, Iterable
+from .exceptions import InvalidParameterException
+
+# Lazy parameter conversions replace the stored parameters. The conversion itself runs without the lock, which is only held to publish
+# its result, so that a result shared between threads never has converted parameters converted again.
+# Results do not have a lock of their own, as they are kept in large numbers.
+_publication_lock = allocate_lock()
 
 class ProcessedOptions:
-    def __init__(self, parsed_options: Iterable[_ParsedOption], plain_arguments: Iterable[str]):
+    # Results are kept in large numbers by some programs, so they only hold a bitset of the supplied options
+    # (indexed by the option ids assigned when the parser is compiled) and the parameters of those options, ordered by id.
+    __slots__ = ("_option_ids", "_supplied", "_unconverted", "_parameters", "_error_handler", "_plain_arguments", "_count", "_subcommand", "_discarded")
+
+    def __init__(self, parsed_options: Iterable[_ParsedOption], plain_arguments: Iterable[str], error_handler: Optional[Callable[[InvalidParameterException], None]] = None, option_ids: Optional[Mapping[Option, int]] = None):
        """ 
        Represents all the parsed options and all plain arguments supplied by the user.
        """
-       self._original_to_parsed_option_map = {}
-       self._plain_arguments = plain_arguments
-       self._count = len(parsed_options)
+       if(option_ids is None):
+           option_ids = {}
+           for parsed_option in parsed_options:
+               option_ids.setdefault(parsed_option._option, len(option_ids))
 
+       # an option supplied more than once keeps the parameters of its last occurrence, the parameters of all its occurrences
+       # (in a list extended in place) or the number of its occurrences, depending on its action
+       parameters_by_id = {}
+       unconverted = 0
+       # (option, parameters) of the unconverted occurrences which are not kept, only checked by validate_all()
+       discarded = None
        for parsed_option in parsed_options:
-           self._original_to_parsed_option_map[parsed_option.get_original_option()] = parsed_option
+           option = parsed_option._option
+           option_id = option_ids[option]
+           action = option._action
+           if(action == "store"):
+               if((unconverted >> option_id) & 1):
+                   if(discarded is None):
+                       discarded = []
+                   discarded.append((option, parameters_by_id[option_id]))
+               parameters_by_id[option_id] = parsed_option._parameters
+           elif(action == "append"):
+               occurrences = parameters_by_id.get(option_id)
+               if(occurrences is None):
+                   parameters_by_id[option_id] = [parsed_option._parameters]
+               else:
+                   occurrences.append(parsed_option._parameters)
+           else:
+               parameters_by_id[option_id] = parameters_by_id.get(option_id, 0) + 1
+               if(not parsed_option._converted and parsed_option._parameters):
+                   if(discarded is None):
+                       discarded = []
+                   discarded.append((option, parsed_option._parameters))
+               continue
+
+           if(parsed_option._converted):
+               unconverted &= ~(1 << option_id)
+           else:
+               unconverted |= 1 << option_id
+
+       supplied = 0
+       for option_id in parameters_by_id:
+           supplied |= 1 << option_id
+
+       self._option_ids = option_ids
+       self._supplied = supplied
+       self._unconverted = unconverted
+       self._parameters = [parameters_by_id[option_id] for option_id in sorted(parameters_by_id)]
+       self._error_handler = error_handler
+       self._plain_arguments = plain_arguments
+       self._count = len(parsed_options)
+       # (name, ProcessedOptions) of the selected subcommand
+       self._subcommand = None
+       self._discarded = discarded
 
     def count(self) -> int:
         """
@@ -34,7 +98,8 @@ class ProcessedOptions:
         ## Returns 
         `True` if the given option was supplied, `False` otherwise. 
         """
-        return option in self._original_to_parsed_option_map
+        option_id = self._option_ids.get(option)
+        return option_id is not None and (self._supplied >> option_id) & 1 == 1
 
     def has_parameter(self, option: Option) -> bool:
         """
@@ -46,11 +111,17 @@ class ProcessedOptions:
         ## Returns
         `True` if the given option received parameters, `False` otherwise.
 
+        ## Raises
+        * `option_parser.exceptions.InvalidParameterException` - if the parser was created with `lazy_parameters=True` and `throw_on_error=True`,
+        and the parameters could not be converted or validated.
         """
         if(not self.is_set(option)):
             return False
 
-        return bool(self._original_to_parsed_option_map[option].get_parameters())
+        action = option._action
+        if(action == "append"):
+            return any(parameters != [] for parameters in self.__get_parameters(option))
+        return action == "store" and bool(self.__get_parameters(option))
 
     def get_option_parameter(self, option: Option) -> Any:
         """
@@ -63,18 +134,161 @@ class ProcessedOptions:
         The given option's parameter(s) if they were supplied. Return type is the type specified in `option_parser.option.Option`'s `set_parameter_settings()` if `parameter_count` is 1,
         a list of such types otherwise.
         If no parameters were supplied to the option, or the option itself was not supplied, this method returns `None`.
+        Options with the `"append"` action return a list of such values, one per occurrence, and options with the `"count"` action
+        return the number of occurrences (see `option_parser.option.Option`'s `set_action()`).
+
+        ## Raises
+        * `option_parser.exceptions.InvalidParameterException` - if the parser was created with `lazy_parameters=True` and `throw_on_error=True`,
+        and the parameters could not be converted or validated.
         """
         if(not self.is_set(option)):
             return None
 
-        return self._original_to_parsed_option_map[option].get_parameters()
+        return self.__get_parameters(option)
+
+    def get_all(self, option: Option) -> List[Any]:
+        """
+        Retrieves the parameters of every occurrence of the given option, in order. All of them are only kept for options with the `"append"` action,
+        see `option_parser.option.Option`'s `set_action()`.
+
+        ## Parameters
+        * `option` - `option_parser.option.Option` object added to `option_parser.option_parser.OptionParser`
+
+        ## Returns
+        A list with the parameters of each occurrence, as returned by `get_option_parameter()` for a single occurrence. For options with the `"store"` action,
+        the list only contains the parameters of the last occurrence, options with the `"count"` action keep no parameters. Empty if the option was not supplied.
+
+        ## Raises
+        * `option_parser.exceptions.InvalidParameterException` - if the parser was created with `lazy_parameters=True` and `throw_on_error=True`,
+        and the parameters could not be converted or validated.
+        """
+        if(not self.is_set(option)):
+            return []
+
+        action = option._action
+        if(action == "append"):
+            return self.__get_parameters(option)
+        return [self.__get_parameters(option)] if action == "store" else []
+
+    def get_count(self, option: Option) -> int:
+        """
+        Counts how many times the given option was supplied. Occurrences are only counted for options with the `"append"` or `"count"` action,
+        see `option_parser.option.Option`'s `set_action()`.
+
+        ## Parameters
+        * `option` - `option_parser.option.Option` object added to `option_parser.option_parser.OptionParser`
+
+        ## Returns
+        The number of occurrences of the option. For options with the `"store"` action, 1 if the option was supplied, 0 otherwise.
+        """
+        if(not self.is_set(option)):
+            return 0
+
+        action = option._action
+        if(action == "count"):
+            return self.__get_parameters(option)
+        return len(self.__get_parameters(option)) if action == "append" else 1
+
+    def validate_all(self):
+        """
+        Converts and validates the parameters of all parsed options. Parameters are already validated during parsing unless the parser
+        was created with `lazy_parameters=True`, in which case this method can be called to detect all invalid parameters at once, instead of on first access.
+        This includes the parameters of occurrences which are not kept (e.g. all but the last occurrence of an option with the `"store"` action),
+        so that the same arguments are rejected as without `lazy_parameters`.
+
+        ## Raises
+        * `option_parser.exceptions.InvalidParameterException` - if the parser was created with `throw_on_error=True` and any parameter could not be converted or validated.
+        """
+        if(self._unconverted):
+            for (option, option_id) in self._option_ids.items():
+                if((self._unconverted >> option_id) & 1):
+                    self.__get_parameters(option)
+
+        discarded = self._discarded
+        if(discarded is not None):
+            for (option, parameters) in discarded:
+                try:
+                    option._convert_parameters(parameters)
+                except InvalidParameterException as error:
+                    if(self._error_handler is None):
+                        raise error
+                    self._error_handler(error)
+                    return
+            self._discarded = None
 
     def get_plain_args(self) -> List[str]:
         """
         Retrieves all plain arguments supplied by the user.
 
+        If the parser was created with `stream_plain_args=True`, the list is created on every call, `iter_plain_args()` avoids that.
+
         ## Returns
         A list of all plain arguments.
 
         """
-        return self._plain_arguments
+        if(isinstance(self._plain_arguments, list)):
+            return self._plain_arguments
+        return self._plain_arguments.to_list()
+
+    def iter_plain_args(self) -> Iterator[str]:
+        """
+        Iterates over all plain arguments supplied by the user, in order. If the parser was created with `stream_plain_args=True`,
+        the arguments following the last option and `--` are read directly from the parsed argument list.
+
+        ## Returns
+        An iterator over all plain arguments.
+
+        """
+        return iter(self._plain_arguments)
+
+    def get_subcommand(self) -> Optional[str]:
+        """
+        Retrieves the name of the subcommand selected by the user.
+
+        ## Returns
+        The name of the selected subcommand, or `None` if no subcommand was selected.
+
+        """
+        return self._subcommand[0] if self._subcommand is not None else None
+
+    def get_subcommand_options(self) -> Optional[ProcessedOptions]:
+        """
+        Retrieves the options and plain arguments following the selected subcommand, parsed by the subcommand's parser.
+
+        ## Returns
+        A `option_parser.processed_options.ProcessedOptions` instance, or `None` if no subcommand was selected.
+
+        """
+        return self._subcommand[1] if self._subcommand is not None else None
+
+    def __get_parameters(self, option: Option) -> Any:
+        option_id = self._option_ids[option]
+        # parameters are stored for supplied options only, so their position is the number of supplied options with a lower id
+        position = bin(self._supplied & ((1 << option_id) - 1)).count("1")
+        if(not (self._unconverted >> option_id) & 1):
+            return self._parameters[position]
+
+        with _publication_lock:
+            if(not (self._unconverted >> option_id) & 1):
+                # converted by another thread in the meantime
+                return self._parameters[position]
+            raw_parameters = self._parameters[position]
+
+        # several threads may convert the same parameters at once, only the first result is kept
+        try:
+            if(option._action == "append"):
+                parameters = [option._convert_parameters(occurrence) for occurrence in raw_parameters]
+            else:
+                parameters = option._convert_parameters(raw_parameters)
+        except InvalidParameterException as error:
+            if(self._error_handler is None):
+                raise error
+            self._error_handler(error)
+            return None
+
+        with _publication_lock:
+            if(not (self._unconverted >> option_id) & 1):
+                return self._parameters[position]
+            self._parameters[position] = parameters
+            self._unconverted &= ~(1 << option_id)
+        return parameters
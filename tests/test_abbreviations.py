@@ -0,0 +1,76 @@
+import pytest
+
+from src.option_parser import OptionParser, Option
+from src.option_parser.exceptions import InvalidOptionException
+
+def create_parser(allow_abbreviations=True):
+    parser = OptionParser(throw_on_error=True, allow_abbreviations=allow_abbreviations)
+    verbose_option = Option("v", "verbose", "verbosity")
+    version_option = Option("version")
+    version_option.set_parameter_settings()
+    output_option = Option("out")
+    output_extended_option = Option("output")
+    parser.add_options(verbose_option, version_option, output_option, output_extended_option)
+    return (parser, verbose_option, version_option, output_option, output_extended_option)
+
+def test_unambiguous_prefix_selects_option():
+    (parser, verbose_option, version_option, _, _) = create_parser()
+
+    processed_options = parser.parse(["--verb", "--versi=1"])
+
+    assert processed_options.is_set(verbose_option)
+    assert processed_options.get_option_parameter(version_option) == "1"
+
+def test_prefix_shared_by_keys_of_one_option_is_unambiguous():
+    (parser, verbose_option, _, _, _) = create_parser()
+
+    processed_options = parser.parse(["--verbos"])
+
+    assert processed_options.is_set(verbose_option)
+
+def test_exact_flag_wins_over_longer_flags():
+    (parser, _, _, output_option, output_extended_option) = create_parser()
+
+    processed_options = parser.parse(["--out"])
+
+    assert processed_options.is_set(output_option)
+    assert not processed_options.is_set(output_extended_option)
+
+def test_ambiguous_prefix_lists_candidates():
+    (parser, _, _, _, _) = create_parser()
+
+    with pytest.raises(InvalidOptionException, match="--verbose, --verbosity, --version"):
+        parser.parse(["--ver"])
+
+def test_abbreviations_are_disabled_by_default():
+    (parser, _, _, _, _) = create_parser(allow_abbreviations=False)
+
+    with pytest.raises(InvalidOptionException):
+        parser.parse(["--verb"])
+
+def test_abbreviations_with_many_generated_options():
+    parser = OptionParser(throw_on_error=True, allow_abbreviations=True)
+    options = [Option(f"generated-option-{index:04}-name") for index in range(3000)]
+    parser.add_options(*options)
+
+    processed_options = parser.parse(["--generated-option-1234", "--generated-option-2999-n"])
+
+    assert processed_options.is_set(options[1234])
+    assert processed_options.is_set(options[2999])
+    assert processed_options.count() == 2
+
+@pytest.mark.parametrize("flag", ["--hel", "--he"])
+def test_abbreviated_help_flag_prints_help(capsys, flag):
+    (parser, _, _, _, _) = create_parser()
+
+    with pytest.raises(SystemExit) as exit_info:
+        parser.parse(["--verb", flag])
+    assert exit_info.value.code == 0
+    assert "--help" in capsys.readouterr().out
+
+def test_abbreviated_help_flag_is_ambiguous_with_other_options():
+    (parser, _, _, _, _) = create_parser()
+    parser.add_options(Option("helper"))
+
+    with pytest.raises(InvalidOptionException, match="--help, --helper"):
+        parser.parse(["--hel"])
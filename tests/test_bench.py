@@ -0,0 +1,24 @@
+import json
+import pytest
+
+from src.option_parser.bench import suite
+
+@pytest.fixture(autouse=True)
+def single_measurement(monkeypatch):
+    monkeypatch.setattr(suite, "_MIN_MEASURED_TIME", 0)
+
+@pytest.mark.parametrize("style, parameter_kind", [("short", "none"), ("long", "str"), ("multiflag", "none"), ("short", "validated_int")])
+def test_generated_argv_parses(style, parameter_kind):
+    parser = suite.create_parser(100, parameter_kind)
+    argv = suite.create_argv(50, 100, style, parameter_kind)
+
+    processed_options = parser.parse(argv)
+
+    assert processed_options.count() > 0
+    assert processed_options.get_plain_args() == []
+
+def test_results_are_json_serializable():
+    results = suite.run_benchmarks(["add_options", "parse", "parse_parameters", "get_help"], quick=True)
+
+    assert {result["benchmark"] for result in results["results"]} == {"add_options", "parse", "parse_parameters", "get_help"}
+    json.dumps(results)
@@ -0,0 +1,56 @@
+import pytest
+import time
+
+from src.option_parser import Option, OptionParser
+from src.option_parser.exceptions import InvalidConfigurationException
+
+
+def test_add_options_from_generator():
+    parser = OptionParser(throw_on_error=True)
+    parser.add_options_from(Option(f"option-{index}") for index in range(10))
+    processed_options = parser.parse(["--option-3", "--option-7"])
+    assert processed_options.is_set(parser.get_option("option-3"))
+    assert processed_options.is_set(parser.get_option("option-7"))
+    assert not processed_options.is_set(parser.get_option("option-0"))
+
+
+def test_help_option_registered_once_and_last():
+    parser = OptionParser(throw_on_error=True)
+    parser.add_options(Option("a", "alpha"))
+    parser.add_options(Option("b", "beta"))
+    parser.add_options_from([Option("c", "gamma")])
+    help_page = parser.get_help()
+    assert help_page.count("--help") == 1
+    assert help_page.index("--alpha") < help_page.index("--beta") < help_page.index("--gamma") < help_page.index("--help")
+
+
+def test_duplicate_across_calls():
+    parser = OptionParser(throw_on_error=True)
+    parser.add_options(Option("a", "alpha"))
+    with pytest.raises(InvalidConfigurationException, match="'alpha'"):
+        parser.add_options(Option("alpha"))
+
+
+def test_duplicate_of_help_flag():
+    parser = OptionParser(throw_on_error=True)
+    parser.add_options(Option("a"))
+    with pytest.raises(InvalidConfigurationException, match="'h'"):
+        parser.add_options_from([Option("h", "host")])
+
+
+def test_failed_registration_adds_nothing():
+    parser = OptionParser(throw_on_error=True)
+    parser.add_options(Option("a"))
+    with pytest.raises(InvalidConfigurationException):
+        parser.add_options_from([Option("b"), Option("c"), Option("b", "bravo")])
+    assert parser.get_option("b") is None
+    parser.add_options(Option("b"))
+    assert parser.parse(["-b"]).is_set(parser.get_option("b"))
+
+
+def test_many_options():
+    parser = OptionParser(throw_on_error=True)
+    start = time.perf_counter()
+    parser.add_options_from(Option(f"option-{index}") for index in range(50000))
+    assert time.perf_counter() - start < 5
+    assert parser.parse(["--option-49999"]).is_set(parser.get_option("option-49999"))
@@ -0,0 +1,123 @@
+import pytest
+
+from src.option_parser import OptionParser, Option
+from src.option_parser.exceptions import InvalidConfigurationException, InvalidOptionException, InvalidParameterException
+
+def is_positive(number):
+    return number > 0
+
+def create_parser(backend, allow_abbreviations=False, required=False):
+    parser = OptionParser(throw_on_error=True, backend=backend, allow_abbreviations=allow_abbreviations)
+    verbose = Option("v", "verbose")
+    number = Option("n", "number")
+    number.set_parameter_settings(parameter_type=int, validator=is_positive)
+    pair = Option("p", "pair")
+    pair.set_parameter_settings(parameter_type=int, parameter_count=2)
+    name = Option("a1", "name")
+    name.set_parameter_settings(required=True)
+    cached = Option("c", "cached")
+    cached.set_parameter_settings(parameter_type=float, cache_size=8)
+    many = Option("m")
+    many.set_parameter_settings(parameter_count=10)
+    if(required):
+        name.set_as_required()
+    parser.add_options(verbose, number, pair, name, cached, many)
+    return parser
+
+def run(parser, argv):
+    try:
+        processed_options = parser.parse(argv)
+    except (InvalidOptionException, InvalidParameterException) as exception:
+        return (type(exception), str(exception))
+    parsed = [(flag, processed_options.get_option_parameter(flag)) for flag in ("v", "n", "p", "a1", "c", "m") if processed_options.is_set(flag)]
+    return (parsed, processed_options.get_plain_args())
+
+ARGVS = [
+    [],
+    ["file"],
+    ["-v"],
+    ["-v", "file"],
+    ["--verbose", "file"],
+    ["-n", "3", "file"],
+    ["-n", "3", "-v"],
+    ["-n", "3", "4"],
+    ["-n", "x"],
+    ["-n", "0"],
+    ["-n", "-1"],
+    ["-vn", "3", "file"],
+    ["-nv", "3"],
+    ["-n", "-v"],
+    ["--number=3", "file"],
+    ["--number=3,4"],
+    ["--number", "file"],
+    ["-p", "1", "2", "3"],
+    ["-p", "1"],
+    ["-p", "1", "-v"],
+    ["--pair=1,2"],
+    ["--pair=1"],
+    ["-a1", "x", "y"],
+    ["-a1"],
+    ["-a1", "-v"],
+    ["--name=x"],
+    ["-c", "1.5", "-c", "2.5", "file"],
+    ["-c", "nan?"],
+    ["-m", *map(str, range(10)), "tail"],
+    ["-m", "1", "-v"],
+    ["-v", "--", "-n", "3"],
+    ["-n", "3", "--", "-v"],
+    ["--", "--"],
+    ["-x"],
+    ["--unknown"],
+    ["--verb"],
+    ["-", "file"],
+    ["-1", "file"],
+    ["--with space", "file"],
+]
+
+@pytest.mark.parametrize("argv", ARGVS)
+def test_generated_parser_matches_generic_parser(argv):
+    assert run(create_parser("codegen"), argv) == run(create_parser("generic"), argv)
+
+@pytest.mark.parametrize("argv", [["--verb"], ["--num=3"], ["--na=x"], ["--n"], ["--c=1"]])
+def test_generated_parser_matches_generic_parser_with_abbreviations(argv):
+    assert run(create_parser("codegen", True), argv) == run(create_parser("generic", True), argv)
+
+@pytest.mark.parametrize("argv", [[], ["-v"], ["-a1", "x"], ["--name=x", "file"]])
+def test_generated_parser_matches_generic_parser_with_required_options(argv):
+    assert run(create_parser("codegen", required=True), argv) == run(create_parser("generic", required=True), argv)
+
+def test_generated_source_is_available_for_codegen_backend_only():
+    assert create_parser("generic").get_generated_source() is None
+
+    source = create_parser("codegen").get_generated_source()
+    assert "def parse(received_args):" in source
+    assert "# 'n, number'" in source
+
+@pytest.mark.parametrize("flag", ["x\nimport\tos", "x\n\traise\tSystemExit", "x\r\ny"])
+def test_flags_cannot_inject_code(flag):
+    results = []
+    sources = []
+    for backend in ("codegen", "generic"):
+        parser = OptionParser(throw_on_error=True, backend=backend)
+        option = Option("v", flag)
+        option.set_parameter_settings(required=True)
+        parser.add_options(option)
+        processed_options = parser.parse(["-v", "value", "file"])
+        results.append((processed_options.get_option_parameter(option), processed_options.get_plain_args()))
+        sources.append(parser.get_generated_source())
+
+    assert results == [("value", ["file"])] * 2
+    assert f"# {'v, ' + flag!r}\n" in sources[0]
+
+def test_generated_parser_is_regenerated_after_reconfiguration():
+    parser = OptionParser(throw_on_error=True, backend="codegen")
+    option = Option("a")
+    parser.add_options(option)
+    assert parser.parse(["-a", "file"]).get_plain_args() == ["file"]
+
+    option.set_parameter_settings(required=True)
+    assert parser.parse(["-a", "file"]).get_option_parameter(option) == "file"
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(InvalidConfigurationException):
+        OptionParser(backend="jit")
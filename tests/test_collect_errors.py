@@ -0,0 +1,177 @@
+import pickle
+import pytest
+
+from src.option_parser import OptionParser, Option
+from src.option_parser.exceptions import InvalidArgumentsException, InvalidOptionException, InvalidParameterException
+
+BACKENDS = ["generic", "codegen"]
+
+def create_parser(backend="generic", throw_on_error=True, collect_errors=True, **kwargs):
+    parser = OptionParser(throw_on_error=throw_on_error, backend=backend, collect_errors=collect_errors, **kwargs)
+    count = Option("c", "count")
+    count.set_parameter_settings(parameter_type=int)
+    count.set_action("append")
+    size = Option("s", "size")
+    size.set_parameter_settings(parameter_type=int, parameter_count=2, validator=lambda value: value > 0)
+    output = Option("o", "output")
+    output.set_parameter_settings(required=True)
+    output.set_as_required()
+    parser.add_options(count, size, output, Option("v", "verbose"))
+    return (parser, count, size, output)
+
+def get_errors(parser, argv):
+    with pytest.raises(InvalidArgumentsException) as error_info:
+        parser.parse(argv)
+    return [(position, type(error), str(error)) for (position, error) in error_info.value.get_errors()]
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_valid_arguments(backend):
+    (parser, count, size, output) = create_parser(backend)
+    processed_options = parser.parse(["-c", "1", "-s", "2", "3", "-o", "out", "file"])
+
+    assert processed_options.get_option_parameter(size) == [2, 3]
+    assert processed_options.get_option_parameter(output) == "out"
+    assert processed_options.get_plain_args() == ["file"]
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_every_error_is_reported_with_its_position(backend):
+    (parser, count, size, output) = create_parser(backend)
+    errors = get_errors(parser, ["--colour", "-s", "1", "x", "-vq", "--size=1", "--count=a", "file"])
+
+    assert errors == [
+        (0, InvalidOptionException, "--colour: unrecognized"),
+        (3, InvalidParameterException, "s: parameter x has invalid type."),
+        (4, InvalidOptionException, "-q: unrecognized"),
+        (5, InvalidParameterException, "Option s received 1 parameters, expected 2."),
+        (6, InvalidParameterException, "c: parameter a has invalid type."),
+        (None, InvalidOptionException, "Mandatory option o not supplied."),
+    ]
+
+def test_message_lists_every_error():
+    (parser, count, size, output) = create_parser()
+
+    with pytest.raises(InvalidArgumentsException) as error_info:
+        parser.parse(["-o", "out", "--colour", "-s", "0", "1"])
+    assert str(error_info.value) == "2 errors:\nargument 3: --colour: unrecognized\nargument 5: s: parameter 0 is not valid."
+
+def test_single_error_message():
+    (parser, count, size, output) = create_parser()
+
+    with pytest.raises(InvalidArgumentsException, match="^Mandatory option o not supplied.$"):
+        parser.parse([])
+
+def test_conversion_is_skipped_after_a_failure():
+    conversions = []
+    def convert(parameter):
+        conversions.append(parameter)
+        return int(parameter)
+
+    parser = OptionParser(throw_on_error=True, collect_errors=True)
+    count = Option("c")
+    count.set_parameter_settings(parameter_type=convert)
+    count.set_action("append")
+    parser.add_options(count)
+    errors = get_errors(parser, ["-c", "1", "-c", "x", "-c", "y", "-c", "z", "-c", "2"])
+
+    assert errors == [(3, InvalidParameterException, "c: parameter x has invalid type.")]
+    assert conversions == ["1", "x"]
+
+def test_arguments_of_unrecognized_flags_are_ignored():
+    (parser, count, size, output) = create_parser()
+    errors = get_errors(parser, ["-o", "out", "-x", "1", "2", "-s", "1", "-v"])
+
+    assert errors == [
+        (2, InvalidOptionException, "-x: unrecognized"),
+        (5, InvalidParameterException, "Option s received 1 parameters, expected 2."),
+    ]
+
+def test_supplied_option_with_invalid_parameters_is_not_missing():
+    (parser, count, size, output) = create_parser()
+
+    assert get_errors(parser, ["-o"]) == [(0, InvalidParameterException, "o expects 1 parameter(s), none received.")]
+
+def test_positions_after_delimiter_and_streamed_plain_arguments():
+    (parser, count, size, output) = create_parser(stream_plain_args=True)
+    processed_options = parser.parse(["-o", "out", "a", "--", "-b"])
+    assert processed_options.get_plain_args() == ["a", "-b"]
+
+    assert get_errors(parser, ["-o", "out", "-c", "x", "--", "-b"]) == [(3, InvalidParameterException, "c: parameter x has invalid type.")]
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("argv, plain_arguments", [
+    (["-o", "out", "-v", "file.txt", "--", "other"], ["file.txt", "other"]),
+    (["a", "-o", "out", "-s", "1", "2", "3", "--", "-b"], ["a", "3", "-b"]),
+    (["-v", "-o", "out", "x", "--"], ["x"]),
+])
+def test_unused_parameters_of_last_option_before_delimiter(backend, argv, plain_arguments):
+    (parser, count, size, output) = create_parser(backend)
+    (default_parser, _, _, _) = create_parser(backend, collect_errors=False)
+
+    assert parser.parse(argv).get_plain_args() == plain_arguments
+    assert default_parser.parse(argv).get_plain_args() == plain_arguments
+
+def test_unused_parameters_before_delimiter_with_streamed_plain_arguments():
+    (parser, count, size, output) = create_parser(stream_plain_args=True)
+
+    assert parser.parse(["-o", "out", "-v", "file.txt", "--", "other"]).get_plain_args() == ["file.txt", "other"]
+
+@pytest.mark.parametrize("argv, error", [
+    (["-o", "out", "-v", "1", "--zeta"], (2, InvalidParameterException, "Option v received 1 parameters, expected 0.")),
+    (["-o", "out", "-v", "1", "-q"], (2, InvalidParameterException, "Option v received 1 parameters, expected 0.")),
+    (["-o", "out", "-s", "1", "2", "3", "--zeta", "--", "x"], (2, InvalidParameterException, "Option s received 3 parameters, expected 2.")),
+])
+def test_unrecognized_flag_ends_the_last_option(argv, error):
+    (parser, count, size, output) = create_parser()
+    (default_parser, _, _, _) = create_parser(collect_errors=False)
+
+    errors = get_errors(parser, argv)
+    assert error in errors
+    with pytest.raises(error[1], match=error[2]):
+        default_parser.parse(argv)
+
+def test_ambiguous_abbreviation_is_collected():
+    parser = OptionParser(throw_on_error=True, collect_errors=True, allow_abbreviations=True)
+    parser.add_options(Option("verbose"), Option("version"))
+    errors = get_errors(parser, ["--zzz", "--ver", "-q"])
+
+    assert [(position, error_type) for (position, error_type, _) in errors] == [
+        (0, InvalidOptionException),
+        (1, InvalidOptionException),
+        (2, InvalidOptionException),
+    ]
+    assert errors[0][2] == "--zzz: unrecognized"
+    assert errors[1][2] == "--ver: ambiguous, could be --verbose, --version"
+    assert errors[2][2] == "-q: unrecognized"
+
+def test_lazy_parameters_only_collect_count_errors():
+    (parser, count, size, output) = create_parser(lazy_parameters=True)
+    processed_options = parser.parse(["-o", "out", "-c", "x"])
+
+    with pytest.raises(InvalidParameterException):
+        processed_options.get_option_parameter(count)
+    assert get_errors(parser, ["-o", "out", "-s", "1", "-v"]) == [(2, InvalidParameterException, "Option s received 1 parameters, expected 2.")]
+
+def test_parse_many_yields_the_aggregated_error():
+    (parser, count, size, output) = create_parser(throw_on_error=False)
+    results = list(parser.parse_many([["-o", "out"], ["-x", "-y"]]))
+
+    assert not isinstance(results[0], Exception)
+    assert isinstance(results[1], InvalidArgumentsException)
+    assert len(results[1].get_errors()) == 3
+
+def test_parse_exits_with_every_error(capsys):
+    (parser, count, size, output) = create_parser(throw_on_error=False)
+
+    with pytest.raises(SystemExit):
+        parser.parse(["-x", "-y"])
+    output_text = capsys.readouterr().out
+    assert output_text.startswith("Error: 3 errors:\nargument 1: -x: unrecognized\nargument 2: -y: unrecognized\nMandatory option o not supplied.\n")
+
+def test_exception_can_be_pickled():
+    (parser, count, size, output) = create_parser()
+
+    with pytest.raises(InvalidArgumentsException) as error_info:
+        parser.parse(["-x"])
+    error = pickle.loads(pickle.dumps(error_info.value))
+    assert str(error) == str(error_info.value)
+    assert [position for (position, _) in error.get_errors()] == [0, None]
@@ -0,0 +1,65 @@
+import pytest
+
+from src.option_parser import OptionParser, Option
+from src.option_parser.processed_options import ProcessedOptions
+from src.option_parser._parsed_option import _ParsedOption
+from src.option_parser._plain_arguments import _PlainArguments
+from src.option_parser.exceptions import InvalidParameterException
+
+def create_parser(option_count, lazy_parameters=False):
+    parser = OptionParser(throw_on_error=True, lazy_parameters=lazy_parameters)
+    options = []
+    for index in range(option_count):
+        option = Option(f"option-{index}")
+        option.set_parameter_settings(parameter_type=int)
+        options.append(option)
+    parser.add_options(*options)
+    return (parser, options)
+
+def test_per_parse_objects_have_no_instance_dictionary():
+    (parser, options) = create_parser(3)
+    processed_options = parser.parse(["--option-1=1"])
+
+    for result_object in (processed_options, _ParsedOption(options[0], 1), _PlainArguments([], ())):
+        assert not hasattr(result_object, "__dict__")
+
+def test_parameters_are_retrieved_by_option_id():
+    (parser, options) = create_parser(100)
+    processed_options = parser.parse(["--option-70=70", "--option-3=3", "--option-99=99"])
+
+    assert [index for (index, option) in enumerate(options) if processed_options.is_set(option)] == [3, 70, 99]
+    assert [processed_options.get_option_parameter(option) for option in options[:4]] == [None, None, None, 3]
+    assert processed_options.get_option_parameter(options[70]) == 70
+    assert processed_options.get_option_parameter(options[99]) == 99
+    assert processed_options.count() == 3
+
+def test_repeated_option_keeps_last_parameters():
+    (parser, options) = create_parser(2)
+    processed_options = parser.parse(["--option-1=1", "--option-1=2"])
+
+    assert processed_options.get_option_parameter(options[1]) == 2
+    assert processed_options.count() == 2
+
+def test_unknown_option_is_not_set():
+    (parser, _) = create_parser(2)
+    processed_options = parser.parse(["--option-1=1"])
+
+    assert not processed_options.is_set(Option("other"))
+    assert processed_options.get_option_parameter(Option("other")) is None
+
+def test_lazy_parameters_are_converted_once():
+    (parser, options) = create_parser(3, lazy_parameters=True)
+    processed_options = parser.parse(["--option-2=2", "--option-0=x"])
+
+    assert processed_options.get_option_parameter(options[2]) == 2
+    assert processed_options.get_option_parameter(options[2]) == 2
+    with pytest.raises(InvalidParameterException):
+        processed_options.validate_all()
+
+def test_processed_options_without_option_ids():
+    option = Option("a")
+    processed_options = ProcessedOptions([_ParsedOption(option, "value")], ["plain"])
+
+    assert processed_options.is_set(option)
+    assert processed_options.get_option_parameter(option) == "value"
+    assert processed_options.get_plain_args() == ["plain"]
@@ -0,0 +1,87 @@
+import pytest
+import mock
+
+from src.option_parser import OptionParser, Option
+from src.option_parser.exceptions import InvalidOptionException
+
+@mock.patch('sys.argv', ["program.py", "-a"])
+def test_compiled_plan_is_reused_between_parses():
+    parser = OptionParser(throw_on_error=True)
+    parser.add_options(Option("a"))
+    parser.compile()
+    compiled_parser = parser._compiled_parser
+
+    parser.parse()
+    parser.parse()
+    parser.get_help()
+
+    assert parser._compiled_parser is compiled_parser
+
+@mock.patch('sys.argv', ["program.py", "-b"])
+def test_adding_options_invalidates_compiled_plan():
+    parser = OptionParser(throw_on_error=True)
+    parser.add_options(Option("a"))
+    parser.compile()
+
+    option = Option("b")
+    parser.add_options(option)
+    processed_options = parser.parse()
+
+    assert processed_options.is_set(option)
+    assert "-b" in parser.get_help()
+
+@mock.patch('sys.argv', ["program.py"])
+def test_reconfiguring_option_invalidates_compiled_plan():
+    parser = OptionParser(throw_on_error=True)
+    option = Option("a")
+    parser.add_options(option)
+    parser.parse()
+
+    option.set_as_required()
+
+    with pytest.raises(InvalidOptionException):
+        parser.parse()
+
+def test_compiled_flag_table_is_immutable():
+    parser = OptionParser()
+    parser.add_options(Option("a"))
+    parser.compile()
+
+    with pytest.raises(TypeError):
+        parser._compiled_parser._flag_to_option_map["b"] = Option("b")
+
+def test_reconfiguring_option_of_another_parser_keeps_compiled_plan():
+    parser = OptionParser(throw_on_error=True)
+    parser.add_options(Option("a"))
+    parser.compile()
+    compiled_parser = parser._compiled_parser
+
+    Option("y").set_description("Unrelated option.")
+    other_parser = OptionParser()
+    other_option = Option("b")
+    other_parser.add_options(other_option)
+    other_option.set_as_required()
+    parser.parse(["-a"])
+
+    assert parser._compiled_parser is compiled_parser
+
+def test_reconfiguring_shared_option_invalidates_every_parser():
+    option = Option("a")
+    parsers = [OptionParser(throw_on_error=True) for _ in range(2)]
+    for parser in parsers:
+        parser.add_options(option)
+        parser.parse([])
+
+    option.set_as_required()
+
+    for parser in parsers:
+        with pytest.raises(InvalidOptionException):
+            parser.parse([])
+
+def test_option_does_not_keep_its_parsers_alive():
+    option = Option("a")
+    for _ in range(100):
+        OptionParser().add_options(option)
+
+    assert len(option._parsers) == 1
+    option.set_description("Still works after the parsers are gone.")
@@ -0,0 +1,96 @@
+import enum
+import mock
+import pytest
+import shutil
+import subprocess
+
+from src.option_parser import OptionParser, Option
+from src.option_parser.exceptions import InvalidConfigurationException
+
+class Color(enum.Enum):
+    RED = "red"
+    GREEN = "green"
+    GREY = "grey"
+
+def create_build_parser():
+    parser = OptionParser()
+    parser.add_options(Option("r", "release"), Option("target"))
+    return parser
+
+def create_parser():
+    parser = OptionParser()
+    color = Option("c", "color")
+    color.set_parameter_settings(parameter_type=Color)
+    pair = Option("p", "pair")
+    pair.set_parameter_settings(parameter_type=Color, parameter_count=2)
+    name = Option("n", "name")
+    name.set_parameter_settings(metavar="NAME")
+    parser.add_options(Option("v", "verbose"), Option("version"), color, pair, name)
+    parser.add_subcommand("build", create_build_parser)
+    parser.add_subcommand("bench", create_build_parser)
+    return parser
+
+@pytest.mark.parametrize(("words", "completions"), [
+    (["--ver"], ["--verbose", "--version"]),
+    (["-"], ["--color", "--help", "--name", "--pair", "--verbose", "--version", "-c", "-h", "-n", "-p", "-v"]),
+    (["--x"], []),
+    (["-c", "gr"], ["green", "grey"]),
+    (["-c", ""], ["green", "grey", "red"]),
+    (["-p", "red", "r"], ["red"]),
+    (["-p", "red", "red", "b"], ["bench", "build"]),
+    (["--color=gree"], ["--color=green"]),
+    (["--pair=red,g"], ["--pair=red,green", "--pair=red,grey"]),
+    (["-n", ""], []),
+    (["-v", "b"], ["bench", "build"]),
+    (["build", "--r"], ["--release"]),
+    (["-v", "build", "-"], ["--help", "--release", "--target", "-h", "-r"]),
+    (["--", "-"], []),
+    (["unknown", "-"], []),
+    ([], ["bench", "build"]),
+])
+def test_completions(words, completions):
+    assert create_parser().get_completions(words) == completions
+
+@pytest.mark.parametrize("shell", ["bash", "zsh", "fish"])
+def test_completion_script_embeds_flags_and_subcommands(shell):
+    script = create_parser().get_completion_script(shell, "my-tool")
+    assert "--verbose" in script
+    assert "build" in script and "bench" in script
+    assert "_option_parser_complete_my_tool" in script
+    assert "OPTION_PARSER_COMPLETE=" in script
+
+@pytest.mark.skipif(shutil.which("bash") is None, reason="bash is not installed")
+def test_bash_script_completes_flags():
+    parser = create_parser()
+    parser.add_options(Option("it's"), Option("a$b"))
+    script = parser.get_completion_script("bash", "my-tool")
+    # only expansions which bash 3.2 (the default shell of macOS) supports
+    assert "@Q}" not in script
+
+    commands = script + 'COMP_LINE="my-tool --"; COMP_POINT=${#COMP_LINE}; _option_parser_complete_my_tool; printf "%s\\n" "${COMPREPLY[@]}"'
+    completed = subprocess.run(["bash", "-c", commands], capture_output=True, text=True, check=True)
+    assert sorted(completed.stdout.splitlines()) == ["--a$b", "--color", "--help", "--it's", "--name", "--pair", "--verbose", "--version"]
+
+def test_unsupported_shell():
+    with pytest.raises(InvalidConfigurationException):
+        create_parser().get_completion_script("tcsh")
+
+@mock.patch("sys.argv", ["tool", "-c", "r"])
+@mock.patch.dict("os.environ", {"OPTION_PARSER_COMPLETE": "bash"})
+def test_completion_mode(capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        create_parser().parse()
+    assert exit_info.value.code == 0
+    assert capsys.readouterr().out == "red\n"
+
+@mock.patch("sys.argv", ["tool"])
+@mock.patch.dict("os.environ", {"OPTION_PARSER_COMPLETE": "zsh_source"})
+def test_completion_script_mode(capsys):
+    with pytest.raises(SystemExit):
+        create_parser().parse()
+    assert capsys.readouterr().out.startswith("#compdef tool")
+
+@mock.patch.dict("os.environ", {"OPTION_PARSER_COMPLETE": "bash"})
+def test_explicit_argv_is_parsed_in_completion_mode():
+    parser = create_parser()
+    assert parser.parse(["-v"]).is_set(parser.get_option("v"))
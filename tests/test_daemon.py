@@ -0,0 +1,170 @@
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+
+import pytest
+
+from src.option_parser import daemon
+from src.option_parser.exceptions import InvalidArgumentsException, InvalidConfigurationException, InvalidOptionException, InvalidParameterException
+
+DEFINITION_SOURCE = '''
+from src.option_parser import Option, OptionParser
+
+def create_parser(collect_errors=False):
+    parser = OptionParser("{description}", collect_errors=collect_errors)
+    number = Option("n", "number")
+    number.set_parameter_settings(parameter_type=int)
+    parser.add_options(Option("v", "verbose"), number)
+    parser.add_subcommand("build", create_build_parser)
+    return parser
+
+def create_build_parser():
+    parser = OptionParser()
+    parser.add_options(Option("r", "release"))
+    return parser
+
+def create_collecting_parser():
+    return create_parser(collect_errors=True)
+
+def create_nothing():
+    return None
+'''
+
+@pytest.fixture
+def definition_file(tmp_path):
+    path = tmp_path / "definition.py"
+    path.write_text(DEFINITION_SOURCE.replace("{description}", "First version"))
+    return path
+
+@pytest.fixture
+def socket_path():
+    # Unix socket paths are limited to about 100 characters
+    with tempfile.TemporaryDirectory() as directory:
+        yield os.path.join(directory, "daemon.sock")
+
+@pytest.fixture
+def running_daemon(socket_path):
+    server = daemon.ParserDaemon(socket_path)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01})
+    thread.start()
+    yield server
+    server.shutdown()
+    thread.join()
+    server.server_close()
+
+def test_parse(running_daemon, definition_file):
+    result = daemon.request("parse", f"{definition_file}:create_parser", ["-v", "--number=3", "build", "-r", "x"], socket_path=running_daemon.get_socket_path())
+    assert result == {
+        "options": {"v": None, "n": 3},
+        "plain_arguments": [],
+        "subcommand": {"name": "build", "options": {"r": None}, "plain_arguments": ["x"], "subcommand": None},
+    }
+
+def test_complete_and_help(running_daemon, definition_file):
+    definition = f"{definition_file}:create_parser"
+    assert daemon.request("complete", definition, ["--ver"], socket_path=running_daemon.get_socket_path()) == ["--verbose"]
+    assert daemon.request("help", definition, socket_path=running_daemon.get_socket_path()).startswith("First version")
+
+def test_errors_are_raised_by_client(running_daemon, definition_file):
+    socket_path = running_daemon.get_socket_path()
+    with pytest.raises(InvalidOptionException, match="-x: unrecognized"):
+        daemon.request("parse", f"{definition_file}:create_parser", ["-x"], socket_path=socket_path)
+    with pytest.raises(InvalidParameterException):
+        daemon.request("parse", f"{definition_file}:create_parser", ["-n", "a"], socket_path=socket_path)
+    with pytest.raises(InvalidConfigurationException, match="did not return an OptionParser"):
+        daemon.request("parse", f"{definition_file}:create_nothing", socket_path=socket_path)
+    with pytest.raises(InvalidConfigurationException):
+        daemon.request("parse", f"{definition_file}:missing_function", socket_path=socket_path)
+    with pytest.raises(InvalidConfigurationException):
+        daemon.request("dance", f"{definition_file}:create_parser", socket_path=socket_path)
+
+def test_collected_errors_are_raised_by_client(running_daemon, definition_file):
+    with pytest.raises(InvalidArgumentsException) as error_info:
+        daemon.request("parse", f"{definition_file}:create_collecting_parser", ["-x", "-n", "a"], socket_path=running_daemon.get_socket_path())
+
+    errors = error_info.value.get_errors()
+    assert [(position, type(error), str(error)) for (position, error) in errors] == [
+        (0, InvalidOptionException, "-x: unrecognized"),
+        (2, InvalidParameterException, "n: parameter a has invalid type."),
+    ]
+
+def test_changed_definition_is_reloaded(running_daemon, definition_file):
+    definition = f"{definition_file}:create_parser"
+    socket_path = running_daemon.get_socket_path()
+    assert daemon.request("help", definition, socket_path=socket_path).startswith("First version")
+    assert daemon.request("help", definition, socket_path=socket_path).startswith("First version")
+
+    definition_file.write_text(DEFINITION_SOURCE.replace("{description}", "Second version"))
+    assert daemon.request("help", definition, socket_path=socket_path).startswith("Second version")
+
+def test_request_without_daemon_is_handled_in_process(socket_path, definition_file):
+    assert daemon.request("complete", f"{definition_file}:create_parser", ["b"], socket_path=socket_path) == ["build"]
+
+def test_socket_of_another_user_is_not_used(running_daemon, definition_file, monkeypatch):
+    handled_in_process = []
+    handle_in_process = daemon._handle_in_process
+    monkeypatch.setattr(daemon, "_handle_in_process", lambda message: handled_in_process.append(message) or handle_in_process(message))
+    socket_path = running_daemon.get_socket_path()
+
+    assert daemon.request("complete", f"{definition_file}:create_parser", ["b"], socket_path=socket_path) == ["build"]
+    assert handled_in_process == []
+    monkeypatch.setattr(os, "getuid", lambda: os.stat(socket_path).st_uid + 1)
+    assert daemon.request("complete", f"{definition_file}:create_parser", ["b"], socket_path=socket_path) == ["build"]
+    assert len(handled_in_process) == 1
+
+def test_file_which_is_not_a_socket_is_not_used(socket_path, definition_file):
+    with open(socket_path, "w"):
+        pass
+
+    assert daemon.request("complete", f"{definition_file}:create_parser", ["b"], socket_path=socket_path) == ["build"]
+
+def test_second_daemon_is_refused(running_daemon):
+    with pytest.raises(OSError):
+        daemon.ParserDaemon(running_daemon.get_socket_path())
+
+def test_stale_socket_is_replaced(socket_path):
+    daemon.ParserDaemon(socket_path).socket.close()
+    assert os.path.exists(socket_path)
+
+    server = daemon.ParserDaemon(socket_path)
+    server.server_close()
+    assert not os.path.exists(socket_path)
+
+def test_file_which_is_not_a_socket_is_not_replaced(socket_path):
+    with open(socket_path, "w") as file:
+        file.write("data")
+
+    with pytest.raises(OSError, match="not a socket"):
+        daemon.ParserDaemon(socket_path)
+    with open(socket_path) as file:
+        assert file.read() == "data"
+
+def test_socket_of_another_user_is_not_replaced(socket_path, monkeypatch):
+    daemon.ParserDaemon(socket_path).socket.close()
+    monkeypatch.setattr(os, "getuid", lambda: os.stat(socket_path).st_uid + 1)
+
+    with pytest.raises(OSError, match="not a socket owned by this user"):
+        daemon.ParserDaemon(socket_path)
+    assert os.path.exists(socket_path)
+
+def test_command_line_client(capsys, socket_path, definition_file, monkeypatch):
+    monkeypatch.setenv("OPTION_PARSER_SOCKET", socket_path)
+    daemon.main(["complete", f"{definition_file}:create_parser", "-"])
+    assert capsys.readouterr().out.splitlines() == ["--help", "--number", "--verbose", "-h", "-n", "-v"]
+    with pytest.raises(SystemExit) as exit_info:
+        daemon.main(["parse", f"{definition_file}:create_parser", "-q"])
+    assert exit_info.value.code == 1
+    assert capsys.readouterr().err == "Error: -q: unrecognized\n"
+
+def test_client_shim(running_daemon, definition_file, tmp_path):
+    shim_path = tmp_path / "client"
+    shim_path.write_text(daemon.get_client_shim(running_daemon.get_socket_path()))
+    environment = {key: value for (key, value) in os.environ.items() if key != "OPTION_PARSER_SOCKET"}
+
+    completed = subprocess.run([sys.executable, str(shim_path), "complete", f"{definition_file}:create_parser", "--n"], env=environment, capture_output=True, text=True)
+    assert completed.stdout == "--number\n"
+    completed = subprocess.run([sys.executable, str(shim_path), "parse", f"{definition_file}:create_parser", "-x"], env=environment, capture_output=True, text=True)
+    assert completed.returncode == 1
+    assert completed.stderr == "Error: -x: unrecognized\n"
@@ -0,0 +1,95 @@
+import os
+
+from src.option_parser import OptionParser, Option
+
+factory_calls = []
+
+def is_positive(number):
+    return number > 0
+
+def create_parser():
+    factory_calls.append("create_parser")
+    parser = OptionParser("Cached program", throw_on_error=True)
+    number = Option("n", "number")
+    number.set_description("A positive number")
+    number.set_parameter_settings(parameter_type=int, metavar="N", validator=is_positive, cache_size=4)
+    name = Option("name")
+    name.set_parameter_settings(required=True, parameter_count=2, metavar=["FIRST", "LAST"])
+    name.set_as_required()
+    parser.add_options(number, name, Option("v", "verbose"))
+    return parser
+
+def create_uncacheable_parser():
+    factory_calls.append("create_uncacheable_parser")
+    parser = OptionParser(throw_on_error=True)
+    option = Option("n")
+    option.set_parameter_settings(parameter_type=int, validator=lambda number: number > 0)
+    parser.add_options(option)
+    return parser
+
+def test_parser_is_loaded_from_cache(tmp_path):
+    factory_calls.clear()
+    created_parser = OptionParser.from_cache(create_parser, str(tmp_path))
+    loaded_parser = OptionParser.from_cache(create_parser, str(tmp_path))
+
+    assert factory_calls == ["create_parser"]
+    assert len(os.listdir(tmp_path)) == 1
+    assert loaded_parser.get_help() == created_parser.get_help()
+
+    processed_options = loaded_parser.parse(["-n", "3", "--name=John,Doe", "-v", "file"])
+    assert processed_options.get_option_parameter(loaded_parser.get_option("n")) == 3
+    assert processed_options.get_option_parameter(loaded_parser.get_option("name")) == ["John", "Doe"]
+    assert processed_options.is_set(loaded_parser.get_option("verbose"))
+    assert processed_options.get_plain_args() == ["file"]
+
+def test_loaded_parser_keeps_validation(tmp_path):
+    OptionParser.from_cache(create_parser, str(tmp_path))
+    loaded_parser = OptionParser.from_cache(create_parser, str(tmp_path))
+
+    try:
+        loaded_parser.parse(["-n", "0", "--name=John,Doe"])
+        assert False
+    except Exception as exception:
+        assert str(exception) == "n: parameter 0 is not valid."
+
+def test_corrupted_cache_entry_is_rebuilt(tmp_path):
+    factory_calls.clear()
+    OptionParser.from_cache(create_parser, str(tmp_path))
+    cache_file = tmp_path / os.listdir(tmp_path)[0]
+    cache_file.write_bytes(cache_file.read_bytes()[:100])
+
+    parser = OptionParser.from_cache(create_parser, str(tmp_path))
+    assert factory_calls == ["create_parser", "create_parser"]
+    assert parser.parse(["--name=John,Doe"]).get_option_parameter(parser.get_option("name")) == ["John", "Doe"]
+
+    OptionParser.from_cache(create_parser, str(tmp_path))
+    assert factory_calls == ["create_parser", "create_parser"]
+
+def test_key_change_invalidates_cache(tmp_path):
+    factory_calls.clear()
+    OptionParser.from_cache(create_parser, str(tmp_path), key="1.0")
+    OptionParser.from_cache(create_parser, str(tmp_path), key="1.1")
+
+    assert factory_calls == ["create_parser", "create_parser"]
+
+def test_parser_with_lambda_validator_is_not_cached(tmp_path):
+    factory_calls.clear()
+    OptionParser.from_cache(create_uncacheable_parser, str(tmp_path))
+    parser = OptionParser.from_cache(create_uncacheable_parser, str(tmp_path))
+
+    assert factory_calls == ["create_uncacheable_parser", "create_uncacheable_parser"]
+    assert os.listdir(tmp_path) == []
+    assert parser.parse(["-n", "1"]).get_option_parameter(parser.get_option("n")) == 1
+
+def test_get_option_returns_option_by_key():
+    parser = create_parser()
+
+    assert parser.get_option("n") is parser.get_option("number")
+    assert parser.get_option("help") is not None
+    assert parser.get_option("unknown") is None
+
+def test_cache_dir_defaults_to_environment_variable(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPTION_PARSER_CACHE_DIR", str(tmp_path / "cache"))
+    OptionParser.from_cache(create_parser)
+
+    assert len(os.listdir(tmp_path / "cache")) == 1
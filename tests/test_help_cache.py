@@ -0,0 +1,49 @@
+from src.option_parser import OptionParser, Option
+
+def create_parser():
+    parser = OptionParser("Test description")
+    first_option = Option("f", "first")
+    first_option.set_description("First option")
+    second_option = Option("s", "second")
+    second_option.set_description("Second option")
+    parser.add_options(first_option, second_option)
+    return (parser, first_option, second_option)
+
+def test_help_page_is_cached():
+    (parser, _, _) = create_parser()
+
+    assert parser.get_help() is parser.get_help()
+
+def test_help_page_is_cached_per_width():
+    (parser, _, _) = create_parser()
+
+    wrapped_help_page = parser.get_help(width=14)
+
+    assert "\tFirst\n\toption" in wrapped_help_page
+    assert "\tFirst option" in parser.get_help()
+    assert parser.get_help(width=14) is wrapped_help_page
+
+def test_only_changed_option_is_rendered_again():
+    (parser, first_option, second_option) = create_parser()
+    parser.get_help()
+    second_option_fragment = parser._help_fragments[(second_option, None)]
+
+    first_option.set_description("Changed description")
+    help_page = parser.get_help()
+
+    assert "Changed description" in help_page
+    assert parser._help_fragments[(second_option, None)] is second_option_fragment
+
+def test_added_options_appear_in_cached_help_page():
+    (parser, _, _) = create_parser()
+    parser.get_help()
+
+    parser.add_options(Option("added"))
+
+    assert "--added" in parser.get_help()
+
+def test_option_without_description_is_on_its_own_line():
+    parser = OptionParser()
+    parser.add_options(Option("a"), Option("b"))
+
+    assert "-a\n-b\n" in parser.get_help()
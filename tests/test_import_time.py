@@ -0,0 +1,47 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+SOURCE_ROOT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+IMPORT_TIME_LIMIT_US = 10000
+
+def run_python(code, *flags):
+    environment = dict(os.environ, PYTHONPATH=SOURCE_ROOT)
+    environment.pop("PYTHONDONTWRITEBYTECODE", None)
+    return subprocess.run([sys.executable, *flags, "-c", code], env=environment, capture_output=True, text=True, check=True)
+
+def cumulative_import_time(importtime_output, package):
+    # -X importtime lines look like "import time:  self [us] | cumulative | module", with nested imports indented below the module importing them.
+    # Submodules loaded on attribute access (PEP 562) are top-level entries of their own, so every top-level entry of the package is added up.
+    total_time = 0
+    for line in importtime_output.splitlines():
+        fields = line.split("|")
+        if(len(fields) == 3 and fields[2].startswith(" ") and not fields[2].startswith("  ")):
+            module = fields[2].strip()
+            if(module == package or module.startswith(package + ".")):
+                total_time += int(fields[1].strip())
+    if(total_time == 0):
+        raise AssertionError(f"{package} not found in -X importtime output")
+    return total_time
+
+def test_importing_package_does_not_import_submodules():
+    output = run_python("import sys, option_parser; print(sorted(name for name in sys.modules if name.startswith('option_parser')))").stdout
+
+    assert output.strip() == "['option_parser']"
+
+@pytest.mark.parametrize("module", ["re", "typing", "functools", "types"])
+def test_parser_import_path_avoids_heavy_modules(module):
+    # only modules which are not already loaded by the interpreter startup count
+    code = f"import sys; preloaded = {module!r} in sys.modules; from option_parser import OptionParser, Option; OptionParser().parse([]); print(not preloaded and {module!r} in sys.modules)"
+
+    assert run_python(code).stdout.strip() == "False"
+
+def test_import_time_is_capped():
+    code = "from option_parser import OptionParser, Option"
+    run_python(code) # writes the bytecode cache
+
+    import_times = [cumulative_import_time(run_python(code, "-X", "importtime").stderr, "option_parser") for _ in range(3)]
+
+    assert min(import_times) < IMPORT_TIME_LIMIT_US
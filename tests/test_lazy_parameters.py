@@ -0,0 +1,81 @@
+import pytest
+
+from src.option_parser import OptionParser, Option
+from src.option_parser.exceptions import InvalidParameterException
+
+class CountingConverter:
+    calls = 0
+
+    def __init__(self, value):
+        CountingConverter.calls += 1
+        self.value = int(value)
+
+def create_parser(throw_on_error=True):
+    CountingConverter.calls = 0
+    parser = OptionParser(throw_on_error=throw_on_error, lazy_parameters=True)
+    option = Option("n", "number")
+    option.set_parameter_settings(parameter_type=CountingConverter)
+    other_option = Option("o", "other")
+    other_option.set_parameter_settings(parameter_type=CountingConverter)
+    parser.add_options(option, other_option)
+    return (parser, option, other_option)
+
+def test_parameters_are_converted_on_first_access_only():
+    (parser, option, other_option) = create_parser()
+
+    processed_options = parser.parse(["-n", "1", "--other=2"])
+    assert CountingConverter.calls == 0
+
+    assert processed_options.get_option_parameter(option).value == 1
+    assert processed_options.get_option_parameter(option).value == 1
+    assert CountingConverter.calls == 1
+
+def test_invalid_parameter_raises_on_access():
+    (parser, option, other_option) = create_parser()
+
+    processed_options = parser.parse(["-n", "1", "--other=string"])
+
+    assert processed_options.get_option_parameter(option).value == 1
+    with pytest.raises(InvalidParameterException):
+        processed_options.has_parameter(other_option)
+
+def test_validate_all_raises_on_invalid_parameter():
+    (parser, option, other_option) = create_parser()
+
+    processed_options = parser.parse(["-n", "1", "--other=string"])
+
+    with pytest.raises(InvalidParameterException):
+        processed_options.validate_all()
+
+def test_validate_all_checks_overwritten_occurrences():
+    (parser, option, other_option) = create_parser()
+
+    processed_options = parser.parse(["-n", "oops", "-n", "1"])
+
+    assert processed_options.get_option_parameter(option).value == 1
+    with pytest.raises(InvalidParameterException):
+        processed_options.validate_all()
+
+def test_validate_all_checks_counted_occurrences():
+    (parser, option, other_option) = create_parser()
+    option.set_action("count")
+
+    processed_options = parser.parse(["-n", "1", "-n", "oops"])
+
+    assert processed_options.get_option_parameter(option) == 2
+    with pytest.raises(InvalidParameterException):
+        processed_options.validate_all()
+
+def test_invalid_parameter_count_raises_during_parsing():
+    (parser, option, other_option) = create_parser()
+
+    with pytest.raises(InvalidParameterException):
+        parser.parse(["--number=1,2"])
+
+def test_invalid_parameter_exits_on_access_when_throw_on_error_is_false():
+    (parser, option, other_option) = create_parser(throw_on_error=False)
+
+    processed_options = parser.parse(["-n", "string"])
+
+    with pytest.raises(SystemExit):
+        processed_options.get_option_parameter(option)
@@ -0,0 +1,58 @@
+import pickle
+import pytest
+
+from src.option_parser import OptionParser, Option
+from src.option_parser.exceptions import InvalidParameterException
+
+validated_values = []
+
+def is_short(value):
+    validated_values.append(value)
+    return len(value) < 5
+
+def create_parser(cache_size):
+    validated_values.clear()
+    parser = OptionParser(throw_on_error=True)
+    option = Option("p", "path")
+    option.set_parameter_settings(validator=is_short, cache_size=cache_size)
+    parser.add_options(option)
+    return (parser, option)
+
+def test_cached_values_are_not_validated_again():
+    (parser, option) = create_parser(cache_size=16)
+
+    results = list(parser.parse_many([["-p", "a"], ["--path=b"], ["-p", "a"], ["--path=a"]]))
+
+    assert [result.get_option_parameter(option) for result in results] == ["a", "b", "a", "a"]
+    assert validated_values == ["a", "b"]
+    cache_info = option.get_parameter_cache_info()
+    assert (cache_info.hits, cache_info.misses, cache_info.maxsize) == (2, 2, 16)
+
+def test_cache_is_bounded():
+    (parser, option) = create_parser(cache_size=1)
+
+    list(parser.parse_many([["-p", "a"], ["-p", "b"], ["-p", "a"]]))
+
+    assert validated_values == ["a", "b", "a"]
+    assert option.get_parameter_cache_info().currsize == 1
+
+def test_invalid_values_are_rejected_every_time():
+    (parser, option) = create_parser(cache_size=16)
+
+    for _ in range(2):
+        with pytest.raises(InvalidParameterException):
+            parser.parse(["-p", "too long"])
+
+def test_cache_info_is_none_when_cache_is_disabled():
+    (parser, option) = create_parser(cache_size=0)
+
+    assert option.get_parameter_cache_info() is None
+
+def test_option_with_cache_can_be_pickled():
+    (parser, option) = create_parser(cache_size=16)
+    parser.parse(["-p", "a"])
+
+    unpickled_option = pickle.loads(pickle.dumps(option))
+
+    assert unpickled_option._parse_parameters(["a"]) == "a"
+    assert unpickled_option.get_parameter_cache_info().misses == 1
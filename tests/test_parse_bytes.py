@@ -0,0 +1,81 @@
+import os
+import pytest
+
+from src.option_parser import OptionParser, Option
+from src.option_parser.exceptions import InvalidOptionException, InvalidParameterException
+
+def create_parser(throw_on_error=True, lazy_parameters=False, backend="generic"):
+    parser = OptionParser(throw_on_error=throw_on_error, lazy_parameters=lazy_parameters, backend=backend)
+    verbose = Option("v", "verbose")
+    number = Option("n", "number")
+    number.set_parameter_settings(parameter_type=int)
+    name = Option("name")
+    name.set_parameter_settings(parameter_count=2)
+    parser.add_options(verbose, number, name)
+    return (parser, verbose, number, name)
+
+def run(parse):
+    try:
+        processed_options = parse()
+    except (InvalidOptionException, InvalidParameterException) as exception:
+        return str(exception)
+    return (processed_options.count(), processed_options.get_plain_args())
+
+@pytest.mark.parametrize("backend", ["generic", "codegen"])
+@pytest.mark.parametrize("argv", [
+    [],
+    [""],
+    ["file"],
+    ["-v", "a", "b"],
+    ["-vn", "3", "a"],
+    ["--number=3", "a", "--", "-v"],
+    ["-n"],
+    ["-n", "x"],
+    ["--name=a,b", "c"],
+    ["a", "-v", "b", "--", "c"],
+    ["-x"],
+    ["a", "", "b"],
+])
+def test_parse_bytes_matches_parse(argv, backend):
+    (parser, _, _, _) = create_parser(backend=backend)
+    buffer = b"".join(os.fsencode(arg) + b"\0" for arg in argv)
+
+    assert run(lambda: parser.parse_bytes(buffer)) == run(lambda: parser.parse(argv))
+
+def test_program_name_is_skipped():
+    (parser, verbose, number, _) = create_parser()
+
+    processed_options = parser.parse_bytes(b"/usr/bin/tool\0-v\0-n\x004\0file\0", skip_program_name=True)
+
+    assert processed_options.is_set(verbose)
+    assert processed_options.get_option_parameter(number) == 4
+    assert processed_options.get_plain_args() == ["file"]
+
+def test_buffer_without_trailing_nul_and_memoryview():
+    (parser, _, number, _) = create_parser()
+
+    processed_options = parser.parse_bytes(memoryview(bytearray(b"-n\x005\0a\0b")))
+
+    assert processed_options.get_option_parameter(number) == 5
+    assert list(processed_options.iter_plain_args()) == ["a", "b"]
+
+def test_invalid_utf8_is_preserved_with_surrogateescape():
+    (parser, _, _, name) = create_parser()
+
+    processed_options = parser.parse_bytes(b"--name=caf\xe9,x\0na\xefve\0")
+
+    assert [os.fsencode(parameter) for parameter in processed_options.get_option_parameter(name)] == [b"caf\xe9", b"x"]
+    assert [os.fsencode(arg) for arg in processed_options.iter_plain_args()] == [b"na\xefve"]
+
+def test_errors_are_returned_without_throw_on_error():
+    (parser, _, _, _) = create_parser(throw_on_error=False)
+
+    assert isinstance(parser.parse_bytes(b"-n\0x\0"), InvalidParameterException)
+    assert isinstance(parser.parse_bytes(b"--help\0-h\0--unknown\0"), InvalidOptionException)
+
+def test_help_option_does_not_exit():
+    (parser, _, _, _) = create_parser()
+
+    processed_options = parser.parse_bytes(b"-h\0")
+
+    assert processed_options.count() == 1
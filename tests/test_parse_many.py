@@ -0,0 +1,55 @@
+import pytest
+import mock
+
+from src.option_parser import OptionParser, Option
+from src.option_parser.exceptions import InvalidOptionException, InvalidParameterException
+
+@mock.patch('sys.argv', ["program.py", "-a"])
+def test_parse_uses_supplied_argv_instead_of_sys_argv():
+    parser = OptionParser(throw_on_error=True)
+    option_a = Option("a")
+    option_b = Option("b")
+    parser.add_options(option_a, option_b)
+
+    processed_options = parser.parse(["-b", "plain"])
+
+    assert not processed_options.is_set(option_a)
+    assert processed_options.is_set(option_b)
+    assert processed_options.get_plain_args() == ["plain"]
+
+def test_parse_many_yields_result_for_each_argv():
+    parser = OptionParser(throw_on_error=True)
+    option = Option("n", "number")
+    option.set_parameter_settings(parameter_type=int)
+    parser.add_options(option)
+
+    results = list(parser.parse_many([["-n", "1"], ["--number=2"], []]))
+
+    assert [result.get_option_parameter(option) for result in results] == [1, 2, None]
+
+def test_parse_many_raises_when_throw_on_error_is_true():
+    parser = OptionParser(throw_on_error=True)
+    parser.add_options(Option("a"))
+
+    with pytest.raises(InvalidOptionException):
+        list(parser.parse_many([["-a"], ["-x"]]))
+
+def test_parse_many_yields_errors_when_throw_on_error_is_false():
+    parser = OptionParser(throw_on_error=False)
+    option = Option("n")
+    option.set_parameter_settings(parameter_type=int)
+    parser.add_options(option)
+
+    results = list(parser.parse_many([["-x"], ["-n", "string"], ["-n", "3"]]))
+
+    assert isinstance(results[0], InvalidOptionException)
+    assert isinstance(results[1], InvalidParameterException)
+    assert results[2].get_option_parameter(option) == 3
+
+def test_parse_many_does_not_exit_on_help_option():
+    parser = OptionParser(throw_on_error=False)
+    parser.add_options(Option("a"))
+
+    results = list(parser.parse_many([["-h"]]))
+
+    assert results[0].count() == 1
@@ -0,0 +1,49 @@
+import pytest
+
+from src.option_parser import OptionParser, Option
+from src.option_parser.exceptions import InvalidOptionException, InvalidParameterException
+
+def is_positive(number):
+    return number > 0
+
+def create_parser(throw_on_error, lazy_parameters=False):
+    parser = OptionParser(throw_on_error=throw_on_error, lazy_parameters=lazy_parameters)
+    number_option = Option("n", "number")
+    number_option.set_parameter_settings(parameter_type=int, validator=is_positive)
+    flag_option = Option("f")
+    parser.add_options(number_option, flag_option)
+    return (parser, number_option, flag_option)
+
+def test_parse_parallel_yields_results_in_input_order():
+    (parser, number_option, flag_option) = create_parser(throw_on_error=True)
+    argvs = [["-n", str(i), "plain"] if i % 2 else [f"--number={i}", "-f"] for i in range(1, 50)]
+
+    results = list(parser.parse_parallel(argvs, max_workers=2, chunk_size=7))
+
+    assert [result.get_option_parameter(number_option) for result in results] == list(range(1, 50))
+    assert [result.is_set(flag_option) for result in results] == [i % 2 == 0 for i in range(1, 50)]
+    assert results[0].get_plain_args() == ["plain"]
+
+def test_parse_parallel_yields_errors_when_throw_on_error_is_false():
+    (parser, number_option, _) = create_parser(throw_on_error=False)
+
+    results = list(parser.parse_parallel([["-x"], ["-n", "0"], ["-n", "5"]], max_workers=2, chunk_size=1))
+
+    assert isinstance(results[0], InvalidOptionException)
+    assert isinstance(results[1], InvalidParameterException)
+    assert results[2].get_option_parameter(number_option) == 5
+
+def test_parse_parallel_raises_when_throw_on_error_is_true():
+    (parser, _, _) = create_parser(throw_on_error=True)
+
+    with pytest.raises(InvalidOptionException):
+        list(parser.parse_parallel([["-n", "1"], ["-x"]], max_workers=1))
+
+def test_parse_parallel_with_lazy_parameters_behaves_like_parse_many():
+    (parser, number_option, _) = create_parser(throw_on_error=True, lazy_parameters=True)
+    argvs = [["-n", "x"], ["-n", "3"]]
+
+    for results in (list(parser.parse_many(argvs)), list(parser.parse_parallel(argvs, max_workers=1))):
+        with pytest.raises(InvalidParameterException):
+            results[0].get_option_parameter(number_option)
+        assert results[1].get_option_parameter(number_option) == 3
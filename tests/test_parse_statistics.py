@@ -0,0 +1,68 @@
+import pytest
+
+from src.option_parser import OptionParser, Option
+from src.option_parser.parse_statistics import PHASES
+from src.option_parser.exceptions import InvalidParameterException
+
+def is_positive(number):
+    return number > 0
+
+def create_parser(collect_errors=False):
+    parser = OptionParser(throw_on_error=True, collect_errors=collect_errors)
+    number_option = Option("n", "number")
+    number_option.set_parameter_settings(parameter_type=int, parameter_count=2, validator=is_positive)
+    parser.add_options(number_option, Option("a"), Option("b"))
+    collected_statistics = []
+    parser.set_parse_hook(collected_statistics.append)
+    return (parser, number_option, collected_statistics)
+
+@pytest.mark.parametrize("collect_errors", [False, True])
+def test_hook_receives_counts(collect_errors):
+    (parser, number_option, collected_statistics) = create_parser(collect_errors)
+
+    processed_options = parser.parse(["-ab", "--number=1,2", "plain"])
+
+    assert processed_options.get_option_parameter(number_option) == [1, 2]
+    assert len(collected_statistics) == 1
+    assert collected_statistics[0].get_counters() == {"tokens": 4, "options_matched": 3, "conversions": 2, "validator_calls": 2}
+
+@pytest.mark.parametrize("collect_errors", [False, True])
+def test_hook_receives_phase_times(collect_errors):
+    (parser, _, collected_statistics) = create_parser(collect_errors)
+
+    parser.parse(["-n", "1", "2"])
+
+    statistics = collected_statistics[0]
+    assert set(statistics.get_phase_times()) == set(PHASES)
+    for phase in ("tokenize", "grouping", "lookup", "conversion", "validation"):
+        assert statistics.get_phase_time(phase) > 0
+    assert statistics.get_total_time() == pytest.approx(sum(statistics.get_phase_times().values()))
+
+def test_hook_is_called_for_every_parse_including_failed_ones():
+    (parser, _, collected_statistics) = create_parser()
+
+    results = list(parser.parse_many([["-a"], ["-b"]]))
+    with pytest.raises(InvalidParameterException):
+        parser.parse(["-n", "1", "0"])
+
+    assert len(results) == 2
+    assert len(collected_statistics) == 3
+    assert collected_statistics[2].get_counter("validator_calls") == 2
+
+def test_unregistered_hook_is_not_called():
+    (parser, _, collected_statistics) = create_parser()
+    parser.set_parse_hook(None)
+
+    parser.parse(["-a"])
+
+    assert collected_statistics == []
+
+def test_tokens_after_delimiter_are_counted_when_collecting_errors():
+    collected_counters = []
+    for collect_errors in (False, True):
+        (parser, _, collected_statistics) = create_parser(collect_errors)
+        parser.parse(["-a", "x", "--", "-b", "y"])
+        collected_counters.append(collected_statistics[0].get_counters())
+
+    assert collected_counters[0] == collected_counters[1]
+    assert collected_counters[0]["tokens"] == 5
@@ -0,0 +1,97 @@
+import pytest
+
+from src.option_parser import OptionParser, Option
+from src.option_parser.exceptions import InvalidConfigurationException, InvalidParameterException
+
+def create_parser(backend="generic", lazy_parameters=False):
+    parser = OptionParser(throw_on_error=True, backend=backend, lazy_parameters=lazy_parameters)
+    include = Option("I", "include")
+    include.set_parameter_settings(metavar="DIR")
+    include.set_action("append")
+    define = Option("D")
+    define.set_parameter_settings(parameter_count=2)
+    define.set_action("append")
+    level = Option("O")
+    level.set_parameter_settings(parameter_type=int)
+    verbose = Option("v", "verbose")
+    verbose.set_action("count")
+    parser.add_options(include, define, level, verbose, Option("g"))
+    return (parser, include, define, level, verbose)
+
+@pytest.mark.parametrize("backend", ["generic", "codegen"])
+def test_append_keeps_every_occurrence(backend):
+    (parser, include, define, level, verbose) = create_parser(backend)
+    processed_options = parser.parse(["-I", "a", "--include=b", "-D", "X", "1", "-I", "c", "-D", "Y", "2"])
+
+    assert processed_options.get_all(include) == ["a", "b", "c"]
+    assert processed_options.get_option_parameter(include) == ["a", "b", "c"]
+    assert processed_options.get_all(define) == [["X", "1"], ["Y", "2"]]
+    assert processed_options.get_count(include) == 3
+    assert processed_options.get_count(define) == 2
+    assert processed_options.has_parameter(include)
+
+@pytest.mark.parametrize("backend", ["generic", "codegen"])
+def test_count(backend):
+    (parser, include, define, level, verbose) = create_parser(backend)
+    processed_options = parser.parse(["-vvv", "--verbose", "file"])
+
+    assert processed_options.get_count(verbose) == 4
+    assert processed_options.get_option_parameter(verbose) == 4
+    assert processed_options.get_all(verbose) == []
+    assert not processed_options.has_parameter(verbose)
+    assert processed_options.get_plain_args() == ["file"]
+
+def test_store_keeps_last_occurrence():
+    (parser, include, define, level, verbose) = create_parser()
+    processed_options = parser.parse(["-O", "1", "-O", "3"])
+
+    assert processed_options.get_option_parameter(level) == 3
+    assert processed_options.get_all(level) == [3]
+    assert processed_options.get_count(level) == 1
+
+def test_options_not_supplied():
+    (parser, include, define, level, verbose) = create_parser()
+    processed_options = parser.parse([])
+
+    for option in (include, define, level, verbose):
+        assert processed_options.get_all(option) == []
+        assert processed_options.get_count(option) == 0
+        assert processed_options.get_option_parameter(option) is None
+
+def test_lazy_parameters_are_converted_per_occurrence():
+    parser = OptionParser(throw_on_error=True, lazy_parameters=True)
+    number = Option("n")
+    number.set_parameter_settings(parameter_type=int)
+    number.set_action("append")
+    parser.add_options(number)
+
+    assert parser.parse(["-n", "1", "-n", "2"]).get_all(number) == [1, 2]
+    with pytest.raises(InvalidParameterException):
+        parser.parse(["-n", "1", "-n", "x"]).get_all(number)
+
+def test_many_occurrences():
+    (parser, include, define, level, verbose) = create_parser()
+    argv = []
+    for index in range(10000):
+        argv.extend(["-I", f"/include/{index}"])
+    assert parser.parse(argv).get_all(include) == [f"/include/{index}" for index in range(10000)]
+
+def test_parse_parallel_keeps_occurrences():
+    (parser, include, define, level, verbose) = create_parser()
+    results = list(parser.parse_parallel([["-I", "a", "-I", "b", "-vv"]], max_workers=1))
+    assert results[0].get_all(include) == ["a", "b"]
+    assert results[0].get_count(verbose) == 2
+
+def test_invalid_action():
+    with pytest.raises(InvalidConfigurationException):
+        Option("x").set_action("extend")
+
+def create_cached_parser():
+    return create_parser()[0]
+
+def test_action_is_cached(tmp_path):
+    OptionParser.from_cache(create_cached_parser, str(tmp_path))
+    parser = OptionParser.from_cache(create_cached_parser, str(tmp_path))
+    processed_options = parser.parse(["-I", "a", "-I", "b", "-vv"])
+    assert processed_options.get_all(parser.get_option("I")) == ["a", "b"]
+    assert processed_options.get_count(parser.get_option("v")) == 2
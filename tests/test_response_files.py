@@ -0,0 +1,114 @@
+import os
+import pytest
+
+from src.option_parser import OptionParser, Option
+from src.option_parser.exceptions import InvalidConfigurationException, InvalidOptionException
+
+def create_parser(response_files, backend="generic"):
+    parser = OptionParser(throw_on_error=True, response_files=response_files, backend=backend)
+    verbose = Option("v", "verbose")
+    output = Option("o", "output")
+    output.set_parameter_settings(required=True)
+    parser.add_options(verbose, output)
+    return (parser, verbose, output)
+
+@pytest.mark.parametrize("backend", ["generic", "codegen"])
+def test_lines_response_file_is_expanded(tmp_path, backend):
+    response_file = tmp_path / "args.txt"
+    response_file.write_bytes(b"-v\r\n-o\nout dir\n\nfirst file\n")
+    (parser, verbose, output) = create_parser("lines", backend)
+
+    processed_options = parser.parse(["before", f"@{response_file}", "after"])
+
+    assert processed_options.is_set(verbose)
+    assert processed_options.get_option_parameter(output) == "out dir"
+    assert processed_options.get_plain_args() == ["before", "first file", "after"]
+
+def test_null_response_file_is_expanded(tmp_path):
+    response_file = tmp_path / "args.bin"
+    response_file.write_bytes(b"-o\0line\none\0\0last\0")
+    (parser, _, output) = create_parser("null")
+
+    processed_options = parser.parse([f"@{response_file}"])
+
+    assert processed_options.get_option_parameter(output) == "line\none"
+    assert processed_options.get_plain_args() == ["", "last"]
+
+def test_shell_response_file_is_expanded(tmp_path):
+    response_file = tmp_path / "args.txt"
+    response_file.write_text("-o 'out dir'\n\"a \\\"b\\\"\" c\\ d  e\n")
+    (parser, _, output) = create_parser("shell")
+
+    processed_options = parser.parse([f"@{response_file}"])
+
+    assert processed_options.get_option_parameter(output) == "out dir"
+    assert processed_options.get_plain_args() == ['a "b"', "c d", "e"]
+
+def test_unterminated_quote_in_shell_response_file_is_reported(tmp_path):
+    response_file = tmp_path / "args.txt"
+    response_file.write_text("'unterminated")
+    (parser, _, _) = create_parser("shell")
+
+    with pytest.raises(InvalidOptionException):
+        parser.parse([f"@{response_file}"])
+
+def test_nested_response_files_are_expanded(tmp_path):
+    (tmp_path / "inner.txt").write_text("-v\ninner\n")
+    (tmp_path / "outer.txt").write_text(f"outer\n@{tmp_path / 'inner.txt'}\nlast\n")
+    (parser, verbose, _) = create_parser("lines")
+
+    processed_options = parser.parse([f"@{tmp_path / 'outer.txt'}"])
+
+    assert processed_options.is_set(verbose)
+    assert processed_options.get_plain_args() == ["outer", "inner", "last"]
+
+def test_response_file_including_itself_is_reported(tmp_path):
+    (tmp_path / "a.txt").write_text(f"@{tmp_path / 'b.txt'}\n")
+    (tmp_path / "b.txt").write_text(f"@{tmp_path / 'a.txt'}\n")
+    (parser, _, _) = create_parser("lines")
+
+    with pytest.raises(InvalidOptionException, match="includes itself"):
+        parser.parse([f"@{tmp_path / 'a.txt'}"])
+
+def test_same_response_file_can_be_included_repeatedly(tmp_path):
+    (tmp_path / "args.txt").write_text("file\n")
+    (parser, _, _) = create_parser("lines")
+
+    processed_options = parser.parse([f"@{tmp_path / 'args.txt'}", f"@{tmp_path / 'args.txt'}"])
+
+    assert processed_options.get_plain_args() == ["file", "file"]
+
+def test_arguments_after_delimiter_are_not_expanded(tmp_path):
+    (tmp_path / "args.txt").write_text("--\n@not-a-file\n")
+    (parser, _, _) = create_parser("lines")
+
+    processed_options = parser.parse([f"@{tmp_path / 'args.txt'}", "@other"])
+
+    assert processed_options.get_plain_args() == ["@not-a-file", "@other"]
+
+def test_missing_response_file_is_reported(tmp_path):
+    (parser, _, _) = create_parser("lines")
+
+    with pytest.raises(InvalidOptionException, match="cannot read response file"):
+        parser.parse([f"@{tmp_path / 'missing.txt'}"])
+
+def test_empty_response_file_and_lone_at_sign(tmp_path):
+    (tmp_path / "empty.txt").write_bytes(b"")
+    (parser, _, _) = create_parser("lines")
+
+    assert parser.parse([f"@{tmp_path / 'empty.txt'}", "@"]).get_plain_args() == ["@"]
+
+def test_non_utf8_arguments_are_decoded_with_surrogateescape(tmp_path):
+    (tmp_path / "args.txt").write_bytes(b"caf\xe9\n")
+    (parser, _, _) = create_parser("lines")
+
+    assert parser.parse([f"@{tmp_path / 'args.txt'}"]).get_plain_args() == [os.fsdecode(b"caf\xe9")]
+
+def test_response_files_are_disabled_by_default():
+    parser = OptionParser(throw_on_error=True)
+
+    assert parser.parse(["@args.txt"]).get_plain_args() == ["@args.txt"]
+
+def test_unknown_response_file_format_is_rejected():
+    with pytest.raises(InvalidConfigurationException):
+        OptionParser(response_files="json")
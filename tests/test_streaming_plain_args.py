@@ -0,0 +1,92 @@
+import mock
+import pytest
+
+from src.option_parser import OptionParser, Option
+from src.option_parser.exceptions import InvalidOptionException, InvalidParameterException
+
+def create_parser(stream_plain_args, backend="generic"):
+    parser = OptionParser(throw_on_error=True, stream_plain_args=stream_plain_args, backend=backend)
+    verbose = Option("v", "verbose")
+    number = Option("n", "number")
+    number.set_parameter_settings(parameter_type=int)
+    pair = Option("p", "pair")
+    pair.set_parameter_settings(parameter_count=2)
+    required_pair = Option("r")
+    required_pair.set_parameter_settings(required=True, parameter_count=2)
+    parser.add_options(verbose, number, pair, required_pair)
+    return parser
+
+def run(parser, argv):
+    try:
+        processed_options = parser.parse(argv)
+    except (InvalidOptionException, InvalidParameterException) as exception:
+        return str(exception)
+    return (processed_options.count(), list(processed_options.iter_plain_args()), processed_options.get_plain_args())
+
+@pytest.mark.parametrize("backend", ["generic", "codegen"])
+@pytest.mark.parametrize("argv", [
+    [],
+    ["a", "b"],
+    ["-v", "a", "b"],
+    ["a", "-v", "b", "c"],
+    ["-n", "1", "a", "b"],
+    ["-n", "x"],
+    ["-p", "1"],
+    ["-p", "1", "2", "3", "4"],
+    ["-r", "1"],
+    ["-r", "1", "2", "3"],
+    ["-vp", "1", "2", "3"],
+    ["-pv", "1", "2", "3"],
+    ["--pair=1,2", "a"],
+    ["-p", "1", "--", "a"],
+    ["-v", "--", "-n", "x", "--"],
+    ["--", "a"],
+    ["a", "-", "-1", "--with space", "b"],
+    ["-x", "a"],
+    ["-v", "a", "-x"],
+])
+def test_streamed_plain_args_match_copied_plain_args(argv, backend):
+    assert run(create_parser(True, backend), argv) == run(create_parser(False, backend), argv)
+
+@pytest.mark.parametrize("stream_plain_args", [True, False])
+def test_unused_parameters_of_last_option_precede_delimited_args(stream_plain_args):
+    processed_options = create_parser(stream_plain_args).parse(["a", "-v", "b", "--", "c"])
+
+    assert processed_options.get_plain_args() == ["a", "b", "c"]
+
+def test_trailing_plain_args_are_not_copied():
+    argv = ["-n", "1", "first", "--", "second"]
+    processed_options = create_parser(True).parse(argv)
+
+    argv[2] = "changed"
+    argv[4] = "also changed"
+
+    assert list(processed_options.iter_plain_args()) == ["changed", "also changed"]
+
+def test_plain_args_can_be_iterated_repeatedly():
+    processed_options = create_parser(True).parse(("-v", "--", "a", "b"))
+
+    assert list(processed_options.iter_plain_args()) == ["a", "b"]
+    assert list(processed_options.iter_plain_args()) == ["a", "b"]
+
+@mock.patch('sys.argv', ["program.py", "-v", "--", "-v", "file"])
+def test_sys_argv_is_streamed_without_program_name():
+    parser = create_parser(True)
+
+    processed_options = parser.parse()
+
+    assert processed_options.get_plain_args() == ["-v", "file"]
+
+def test_parse_many_streams_plain_args():
+    parser = create_parser(True)
+
+    results = list(parser.parse_many([["-v", "a"], iter(["b", "--", "c"])]))
+
+    assert [result.get_plain_args() for result in results] == [["a"], ["b", "c"]]
+
+def test_streaming_with_response_files(tmp_path):
+    (tmp_path / "args.txt").write_text("-v\na\n")
+    parser = OptionParser(throw_on_error=True, stream_plain_args=True, response_files="lines")
+    parser.add_options(Option("v"))
+
+    assert list(parser.parse([f"@{tmp_path / 'args.txt'}", "b"]).iter_plain_args()) == ["a", "b"]
@@ -0,0 +1,138 @@
+import sys
+import mock
+import pytest
+
+from src.option_parser import OptionParser, Option
+from src.option_parser.exceptions import InvalidConfigurationException, InvalidOptionException
+
+factory_calls = []
+
+def create_build_parser():
+    factory_calls.append("build")
+    parser = OptionParser("Builds the project", throw_on_error=True)
+    jobs = Option("j", "jobs")
+    jobs.set_parameter_settings(parameter_type=int)
+    parser.add_options(Option("r", "release"), jobs)
+    return parser
+
+def create_test_parser():
+    factory_calls.append("test")
+    parser = OptionParser("Runs the tests", throw_on_error=True)
+    parser.add_options(Option("k"))
+    return parser
+
+def create_parser():
+    parser = OptionParser("Tool", throw_on_error=True)
+    directory = Option("C")
+    directory.set_parameter_settings(required=True, metavar="DIR")
+    parser.add_options(Option("v", "verbose"), directory)
+    parser.add_subcommand("build", create_build_parser, "Build the project")
+    parser.add_subcommand("test", create_test_parser, "Run the tests")
+    return parser
+
+def test_subcommand_is_parsed_by_its_parser():
+    factory_calls.clear()
+    parser = create_parser()
+    processed_options = parser.parse(["-v", "-C", "build", "build", "-j", "4", "target"])
+
+    assert processed_options.is_set(parser.get_option("verbose"))
+    assert processed_options.get_option_parameter(parser.get_option("C")) == "build"
+    assert processed_options.get_plain_args() == []
+    assert processed_options.get_subcommand() == "build"
+    build_options = processed_options.get_subcommand_options()
+    build_parser = parser.get_subcommand_parser("build")
+    assert build_options.get_option_parameter(build_parser.get_option("jobs")) == 4
+    assert not build_options.is_set(build_parser.get_option("release"))
+    assert build_options.get_plain_args() == ["target"]
+
+def test_only_selected_factory_is_called():
+    factory_calls.clear()
+    parser = create_parser()
+    parser.parse(["test", "-k"])
+    parser.parse(["test"])
+    assert factory_calls == ["test"]
+
+def test_no_subcommand_selected():
+    factory_calls.clear()
+    parser = create_parser()
+    processed_options = parser.parse(["-v", "--", "build"])
+    assert processed_options.get_subcommand() is None
+    assert processed_options.get_subcommand_options() is None
+    assert processed_options.get_plain_args() == ["build"]
+    assert factory_calls == []
+
+def test_unknown_subcommand():
+    parser = create_parser()
+    with pytest.raises(InvalidOptionException, match="deploy: unknown subcommand"):
+        parser.parse(["-v", "deploy"])
+
+def test_subcommand_errors_are_raised():
+    parser = create_parser()
+    with pytest.raises(InvalidOptionException):
+        parser.parse(["build", "-v"])
+
+def test_factory_imported_by_name(tmp_path, monkeypatch):
+    (tmp_path / "lazy_subcommand_module.py").write_text(
+        "from src.option_parser import OptionParser, Option\n"
+        "def create():\n"
+        "    parser = OptionParser(throw_on_error=True)\n"
+        "    parser.add_options(Option('x'))\n"
+        "    return parser\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    parser = OptionParser(throw_on_error=True)
+    parser.add_options(Option("v"))
+    parser.add_subcommand("lazy", "lazy_subcommand_module:create")
+
+    parser.parse(["-v"])
+    assert "lazy_subcommand_module" not in sys.modules
+
+    processed_options = parser.parse(["lazy", "-x"])
+    assert "lazy_subcommand_module" in sys.modules
+    assert processed_options.get_subcommand_options().is_set(parser.get_subcommand_parser("lazy").get_option("x"))
+    monkeypatch.delitem(sys.modules, "lazy_subcommand_module")
+
+def test_invalid_factory():
+    parser = OptionParser(throw_on_error=True)
+    parser.add_subcommand("missing", "no_such_module_here:create")
+    parser.add_subcommand("wrong", dict)
+    with pytest.raises(InvalidConfigurationException, match="Cannot load factory of subcommand 'missing'"):
+        parser.parse(["missing"])
+    with pytest.raises(InvalidConfigurationException, match="did not return an OptionParser"):
+        parser.parse(["wrong"])
+
+@pytest.mark.parametrize("name", ["", "-x", "build"])
+def test_invalid_subcommand_name(name):
+    parser = create_parser()
+    with pytest.raises(InvalidConfigurationException):
+        parser.add_subcommand(name, create_test_parser)
+
+def test_help_page_lists_subcommands():
+    factory_calls.clear()
+    help_page = create_parser().get_help()
+    assert help_page.endswith("Subcommands:\nbuild\n\tBuild the project\ntest\n\tRun the tests")
+    assert factory_calls == []
+
+@mock.patch("sys.argv", ["tool", "-v", "build", "-h"])
+def test_help_of_subcommand(capsys):
+    with pytest.raises(SystemExit):
+        create_parser().parse()
+    assert capsys.readouterr().out.startswith("Builds the project")
+
+def test_parse_many_with_subcommands():
+    parser = create_parser()
+    results = list(parser.parse_many([["build", "-r"], ["-v"], ["test", "-k"]]))
+    assert [result.get_subcommand() for result in results] == ["build", None, "test"]
+    assert results[0].get_subcommand_options().count() == 1
+
+def test_parse_bytes_rejects_subcommands():
+    with pytest.raises(InvalidConfigurationException):
+        create_parser().parse_bytes(b"build\0")
+
+def test_subcommands_are_cached(tmp_path):
+    factory_calls.clear()
+    OptionParser.from_cache(create_parser, str(tmp_path))
+    loaded_parser = OptionParser.from_cache(create_parser, str(tmp_path))
+    processed_options = loaded_parser.parse(["test", "-k"])
+    assert processed_options.get_subcommand() == "test"
+    assert factory_calls == ["test"]
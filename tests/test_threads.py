@@ -0,0 +1,128 @@
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.option_parser import OptionParser, Option
+from src.option_parser.exceptions import InvalidOptionException
+
+THREAD_COUNT = 8
+
+def create_parser(backend="generic", **kwargs):
+    parser = OptionParser(backend=backend, **kwargs)
+    number = Option("n", "number")
+    number.set_parameter_settings(parameter_type=int)
+    parser.add_options(number, Option("v", "verbose"))
+    return (parser, number)
+
+def run_concurrently(function, count=THREAD_COUNT):
+    # all the threads start at once, to make races as likely as possible
+    barrier = threading.Barrier(count)
+    def run(index):
+        barrier.wait()
+        return function(index)
+    with ThreadPoolExecutor(count) as executor:
+        return list(executor.map(run, range(count)))
+
+def test_parse_isolated_does_not_exit(monkeypatch):
+    (parser, number) = create_parser()
+    monkeypatch.setattr(sys, "argv", ["program", "--unknown"])
+
+    assert parser.parse_isolated(["-h"]).is_set(parser.get_option("h"))
+    assert parser.parse_isolated(["-n", "1"]).get_option_parameter(number) == 1
+    assert isinstance(parser.parse_isolated(["-x"]), InvalidOptionException)
+
+def test_parse_isolated_raises_if_throw_on_error():
+    (parser, number) = create_parser(throw_on_error=True)
+
+    with pytest.raises(InvalidOptionException):
+        parser.parse_isolated(["-x"])
+
+@pytest.mark.parametrize("backend", ["generic", "codegen"])
+def test_shared_parser(backend):
+    (parser, number) = create_parser(backend)
+    def parse(index):
+        return [parser.parse_isolated(["-v", "-n", str(index * 1000 + repeat), "file"]).get_option_parameter(number) for repeat in range(200)]
+
+    results = run_concurrently(parse)
+
+    assert results == [[index * 1000 + repeat for repeat in range(200)] for index in range(THREAD_COUNT)]
+
+def test_parser_is_compiled_once():
+    (parser, number) = create_parser()
+    compilations = []
+    original_compile = parser._OptionParser__compile
+    def compile_slowly():
+        compilations.append(threading.get_ident())
+        time.sleep(0.01)
+        original_compile()
+    parser._OptionParser__compile = compile_slowly
+
+    run_concurrently(lambda index: parser.parse_isolated(["-v"]))
+
+    assert len(compilations) == 1
+
+def test_subcommand_factory_is_called_once():
+    calls = []
+    def create_subcommand_parser():
+        calls.append(threading.get_ident())
+        return OptionParser()
+    (parser, number) = create_parser()
+    parser.add_subcommand("run", create_subcommand_parser)
+
+    results = run_concurrently(lambda index: parser.parse_isolated(["run"]).get_subcommand())
+
+    assert results == ["run"] * THREAD_COUNT
+    assert len(calls) == 1
+
+def test_shared_result_with_lazy_parameters():
+    conversions = []
+    def convert(parameter):
+        # fails if an already converted parameter is converted again
+        conversions.append(parameter)
+        return ("converted", parameter.upper())
+
+    parser = OptionParser(throw_on_error=True, lazy_parameters=True)
+    names = Option("n")
+    names.set_parameter_settings(parameter_type=convert)
+    names.set_action("append")
+    parser.add_options(names)
+    processed_options = parser.parse_isolated(["-n", "a", "-n", "b"])
+
+    results = run_concurrently(lambda index: processed_options.get_option_parameter(names))
+
+    assert results == [[("converted", "A"), ("converted", "B")]] * THREAD_COUNT
+    # threads reaching an unconverted option at once may each convert it, but never convert the result again
+    assert set(conversions) == {"a", "b"}
+
+def test_lazy_conversions_run_in_parallel():
+    # both conversions have to be running at the same time for the barrier to be passed
+    barrier = threading.Barrier(2, timeout=5)
+    def convert(parameter):
+        barrier.wait()
+        return parameter
+
+    parser = OptionParser(throw_on_error=True, lazy_parameters=True)
+    first = Option("a")
+    first.set_parameter_settings(parameter_type=convert)
+    second = Option("b")
+    second.set_parameter_settings(parameter_type=convert)
+    parser.add_options(first, second)
+    results = [parser.parse_isolated(["-a", "x"]), parser.parse_isolated(["-b", "y"])]
+
+    assert run_concurrently(lambda index: results[index].get_option_parameter((first, second)[index]), 2) == ["x", "y"]
+
+def test_converter_can_read_lazy_results():
+    parser = OptionParser(throw_on_error=True, lazy_parameters=True)
+    inner = Option("i")
+    inner.set_parameter_settings(parameter_type=int)
+    parser.add_options(inner)
+    inner_result = parser.parse_isolated(["-i", "2"])
+    outer = Option("o")
+    outer.set_parameter_settings(parameter_type=lambda parameter: int(parameter) * inner_result.get_option_parameter(inner))
+    outer_parser = OptionParser(throw_on_error=True, lazy_parameters=True)
+    outer_parser.add_options(outer)
+
+    assert outer_parser.parse_isolated(["-o", "3"]).get_option_parameter(outer) == 6
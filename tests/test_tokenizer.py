@@ -0,0 +1,29 @@
+import pytest
+
+from src.option_parser._tokenizer import _tokenize, SHORT_FLAG, LONG_FLAG, PLAIN_ARG_DELIMITER, PLAIN_ARGUMENT
+
+@pytest.mark.parametrize("token, expected", [
+    ("-a", [(SHORT_FLAG, "a", None)]),
+    ("-abc", [(SHORT_FLAG, "a", None), (SHORT_FLAG, "b", None), (SHORT_FLAG, "c", None)]),
+    ("--verbose", [(LONG_FLAG, "verbose", None)]),
+    ("--level=1,2", [(LONG_FLAG, "level", "1,2")]),
+    ("--level=", [(LONG_FLAG, "level", "")]),
+    ("-50", [(PLAIN_ARGUMENT, "-50", None)]),
+    ("-", [(PLAIN_ARGUMENT, "-", None)]),
+    ("plain--argument", [(PLAIN_ARGUMENT, "plain--argument", None)]),
+    ("--with space", [(PLAIN_ARGUMENT, "--with space", None)]),
+    ("", [(PLAIN_ARGUMENT, "", None)]),
+])
+def test_token_classification(token, expected):
+    assert list(_tokenize([token])) == expected
+
+def test_arguments_after_delimiter_are_plain():
+    tokens = list(_tokenize(["-a", "--", "-bc", "--long", "--"]))
+
+    assert tokens == [
+        (SHORT_FLAG, "a", None),
+        (PLAIN_ARG_DELIMITER, "--", None),
+        (PLAIN_ARGUMENT, "-bc", None),
+        (PLAIN_ARGUMENT, "--long", None),
+        (PLAIN_ARGUMENT, "--", None),
+    ]
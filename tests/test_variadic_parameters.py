@@ -0,0 +1,167 @@
+import enum
+import pytest
+
+from src.option_parser import OptionParser, Option
+from src.option_parser.exceptions import InvalidConfigurationException, InvalidParameterException
+
+BACKENDS = ["generic", "codegen"]
+
+class Mode(str, enum.Enum):
+    FAST = "fast"
+    SLOW = "slow"
+
+def create_parser(backend="generic", lazy_parameters=False):
+    parser = OptionParser(throw_on_error=True, backend=backend, lazy_parameters=lazy_parameters)
+    inputs = Option("i", "inputs")
+    inputs.set_parameter_settings(metavar="FILE", parameter_count="+", required=True)
+    numbers = Option("n", "numbers")
+    numbers.set_parameter_settings(parameter_type=int, parameter_count="*")
+    pair = Option("p", "pair")
+    pair.set_parameter_settings(metavar=["A", "B"], parameter_count=(2, 3))
+    parser.add_options(inputs, numbers, pair, Option("v"))
+    return (parser, inputs, numbers, pair)
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_variadic_option_takes_arguments_up_to_next_flag(backend):
+    (parser, inputs, numbers, pair) = create_parser(backend)
+    processed_options = parser.parse(["-i", "a", "b", "c", "-v", "plain"])
+
+    assert processed_options.get_option_parameter(inputs) == ["a", "b", "c"]
+    assert processed_options.get_plain_args() == ["plain"]
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_last_variadic_option_takes_every_argument(backend):
+    (parser, inputs, numbers, pair) = create_parser(backend)
+    processed_options = parser.parse(["-v", "-n", "1", "2", "3"])
+
+    assert processed_options.get_option_parameter(numbers) == [1, 2, 3]
+    assert processed_options.get_plain_args() == []
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_variadic_parameters_are_always_a_list(backend):
+    (parser, inputs, numbers, pair) = create_parser(backend)
+    processed_options = parser.parse(["-i", "a", "--numbers=7"])
+
+    assert processed_options.get_option_parameter(inputs) == ["a"]
+    assert processed_options.get_option_parameter(numbers) == [7]
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_star_accepts_no_parameters(backend):
+    (parser, inputs, numbers, pair) = create_parser(backend)
+    processed_options = parser.parse(["-n", "-v"])
+
+    assert processed_options.is_set(numbers)
+    assert processed_options.get_option_parameter(numbers) == []
+    assert not processed_options.has_parameter(numbers)
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_plus_requires_a_parameter(backend):
+    (parser, inputs, numbers, pair) = create_parser(backend)
+
+    with pytest.raises(InvalidParameterException, match="expects at least 1 parameter"):
+        parser.parse(["-i", "-v"])
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_range_limits_the_last_option(backend):
+    (parser, inputs, numbers, pair) = create_parser(backend)
+    processed_options = parser.parse(["-p", "a", "b", "c", "d", "e", "--", "f"])
+
+    assert processed_options.get_option_parameter(pair) == ["a", "b", "c"]
+    assert processed_options.get_plain_args() == ["d", "e", "f"]
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_optional_range_yields_too_few_parameters_to_plain_arguments(backend):
+    (parser, inputs, numbers, pair) = create_parser(backend)
+    processed_options = parser.parse(["-p", "a"])
+
+    assert processed_options.is_set(pair)
+    assert not processed_options.has_parameter(pair)
+    assert processed_options.get_plain_args() == ["a"]
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("argv, message", [
+    (["-p", "a", "-v"], "received 1 parameters, expected between 2 and 3"),
+    (["-p", "a", "b", "c", "d", "-v"], "received 4 parameters, expected between 2 and 3"),
+    (["--pair=a,b,c,d"], "received 4 parameters, expected between 2 and 3"),
+])
+def test_range_is_checked(backend, argv, message):
+    (parser, inputs, numbers, pair) = create_parser(backend)
+
+    with pytest.raises(InvalidParameterException, match=message):
+        parser.parse(argv)
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_unbounded_range(backend):
+    parser = OptionParser(throw_on_error=True, backend=backend)
+    files = Option("f")
+    files.set_parameter_settings(parameter_count=(2, None), required=True)
+    parser.add_options(files)
+
+    assert parser.parse(["-f", "a", "b", "c"]).get_option_parameter(files) == ["a", "b", "c"]
+    with pytest.raises(InvalidParameterException, match="received 1 parameters, expected at least 2"):
+        parser.parse(["-f", "a"])
+
+def test_lazy_parameters():
+    (parser, inputs, numbers, pair) = create_parser(lazy_parameters=True)
+    processed_options = parser.parse(["-n", "1", "x"])
+
+    with pytest.raises(InvalidParameterException, match="parameter x has invalid type"):
+        processed_options.get_option_parameter(numbers)
+
+def test_streamed_plain_arguments():
+    parser = OptionParser(throw_on_error=True, stream_plain_args=True)
+    numbers = Option("n")
+    numbers.set_parameter_settings(parameter_count="*")
+    parser.add_options(numbers)
+    processed_options = parser.parse(["-n", "1", "2", "--", "a"])
+
+    assert processed_options.get_option_parameter(numbers) == ["1", "2"]
+    assert processed_options.get_plain_args() == ["a"]
+
+def test_append_action():
+    parser = OptionParser(throw_on_error=True)
+    numbers = Option("n")
+    numbers.set_parameter_settings(parameter_count="+")
+    numbers.set_action("append")
+    parser.add_options(numbers)
+
+    assert parser.parse(["-n", "1", "-n", "2", "3"]).get_all(numbers) == [["1"], ["2", "3"]]
+
+def test_large_parameter_list():
+    for backend in BACKENDS:
+        (parser, inputs, numbers, pair) = create_parser(backend)
+        values = [str(index) for index in range(100_000)]
+        processed_options = parser.parse(["-i", *values])
+
+        assert processed_options.get_option_parameter(inputs) == values
+
+def test_help_page():
+    (parser, inputs, numbers, pair) = create_parser()
+    help_page = parser.get_help()
+
+    assert "-i FILE..., --inputs=FILE..." in help_page
+    assert "-p A B..., --pair=A,B..." in help_page
+
+@pytest.mark.parametrize("parameter_count", ["?", -1, (3, 2), (1, 2, 3), (0, 0), 1.5, True])
+def test_invalid_parameter_count(parameter_count):
+    with pytest.raises(InvalidConfigurationException, match="Invalid parameter count"):
+        Option("x").set_parameter_settings(parameter_count=parameter_count)
+
+def test_subcommand_after_variadic_option():
+    parser = OptionParser(throw_on_error=True)
+    numbers = Option("n")
+    numbers.set_parameter_settings(parameter_count="*")
+    parser.add_options(numbers)
+    parser.add_subcommand("run", OptionParser)
+    processed_options = parser.parse(["-n", "1", "2", "run"])
+
+    assert processed_options.get_option_parameter(numbers) == ["1", "2"]
+    assert processed_options.get_subcommand() == "run"
+
+def test_completion_of_variadic_parameters():
+    parser = OptionParser()
+    modes = Option("m")
+    modes.set_parameter_settings(parameter_type=Mode, parameter_count="+")
+    parser.add_options(modes)
+
+    assert parser.get_completions(["-m", "fast", "s"]) == ["slow"]